@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Yay ve daireleri kompakt NumPy dizilerinde tutan yapı
+Her yay bir satır: merkez x, merkez y, yarıçap, başlangıç açısı, tarama
+açısı (radyan; pozitif: saat yönünün tersi). Yaylar segmentlere
+bölünmez, PDF'e kübik Bézier eğrileri olarak yazılır. Kalem numaraları
+SegmentStore'daki gibi ayrı bir dizide tutulur.
+"""
+
+import numpy as np
+
+from segment_store import pen_array
+
+
+TWO_PI = 2 * np.pi
+
+# Bir Bézier parçasının en fazla kapsayacağı açı (90°; hata yarıçapın ~%0.03'ü)
+MAX_BEZIER_SWEEP = np.pi / 2
+
+
+def _sweep_offsets(arcs, angles):
+    """Açıların yayın başından itibaren tarama yönündeki uzaklığı (0..2π)"""
+    start = arcs[:, 3:4]
+    direction = np.where(arcs[:, 4:5] < 0, -1.0, 1.0)
+    return np.mod((angles - start) * direction, TWO_PI)
+
+
+def _points_at(arcs, angles):
+    return (arcs[:, 0:1] + arcs[:, 2:3] * np.cos(angles),
+            arcs[:, 1:2] + arcs[:, 2:3] * np.sin(angles))
+
+
+class ArcStore:
+    """(N, 5) float64 dizisi ve (N,) kalem dizisi üzerinde yay kümesi"""
+
+    def __init__(self, data=None, pens=None):
+        if data is None:
+            data = np.empty((0, 5), dtype=np.float64)
+        self.data = np.asarray(data, dtype=np.float64).reshape(-1, 5)
+        self.pens = pen_array(pens, len(self.data))
+        self._boxes = None  # boxes() sonucu; sayfa başına tekrar hesaplanmaz
+
+    @classmethod
+    def concatenate(cls, stores):
+        """Yay kümelerini sırayla tek kümede birleştir"""
+        stores = list(stores)
+        if not stores:
+            return cls()
+        return cls(np.concatenate([store.data for store in stores]),
+                   pens=np.concatenate([store.pens for store in stores]))
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def end_angles(self):
+        return self.data[:, 3] + self.data[:, 4]
+
+    def boxes(self):
+        """Her yayın sınır kutusu: (N, 4) min x, min y, max x, max y
+
+        Uç noktalar ve yayın üzerinden geçtiği eksen uçları (0°, 90°, 180°,
+        270°) kullanılır, kutu tam sınırdır.
+        """
+        if self._boxes is not None:
+            return self._boxes
+        data = self.data
+        axis_angles = np.array([[0, np.pi / 2, np.pi, 3 * np.pi / 2]])
+        crossed = _sweep_offsets(data, axis_angles) <= np.abs(data[:, 4:5])
+        crossed |= np.abs(data[:, 4:5]) >= TWO_PI
+        angles = np.concatenate((data[:, 3:4], self.end_angles()[:, None],
+                                 np.broadcast_to(axis_angles, (len(data), 4))), axis=1)
+        xs, ys = _points_at(data, angles)
+        # Yayın geçmediği eksen uçları yerine başlangıç noktası kullanılır
+        xs[:, 2:] = np.where(crossed, xs[:, 2:], xs[:, :1])
+        ys[:, 2:] = np.where(crossed, ys[:, 2:], ys[:, :1])
+        self._boxes = np.stack((xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1)), axis=1)
+        return self._boxes
+
+    def bounds(self):
+        """Tüm yayların sınırları: (min_x, min_y, max_x, max_y)"""
+        boxes = self.boxes()
+        return (float(boxes[:, 0].min()), float(boxes[:, 1].min()),
+                float(boxes[:, 2].max()), float(boxes[:, 3].max()))
+
+    def normalized(self, min_x, min_y, scale):
+        """Merkezleri (min_x, min_y) başlangıcına taşı, merkez ve yarıçapı scale ile çarp"""
+        data = self.data.copy()
+        data[:, 0] = (data[:, 0] - min_x) * scale
+        data[:, 1] = (data[:, 1] - min_y) * scale
+        data[:, 2] *= scale
+        return ArcStore(data, self.pens)
+
+    def intersecting(self, start_x, start_y, end_x, end_y):
+        """Sınır kutusu verilen dikdörtgenle kesişen yayları seç"""
+        if not len(self):
+            return self
+        boxes = self.boxes()
+        mask = ((boxes[:, 0] < end_x) & (boxes[:, 2] > start_x) &
+                (boxes[:, 1] < end_y) & (boxes[:, 3] > start_y))
+        return self.select(mask)
+
+    def clipped(self, min_x, min_y, max_x, max_y):
+        """Yayları dikdörtgene kırp, dışarıda kalan kısımları at
+
+        Tamamen içerideki yaylar aynen korunur. Kenarları kesen yaylar,
+        çemberin dört kenar doğrusuyla kesişim açılarından parçalara
+        bölünür; orta noktası dikdörtgen içinde kalan parçalar tutulur.
+        """
+        if not len(self):
+            return self
+        boxes = self.boxes()
+        inside = ((boxes[:, 0] >= min_x) & (boxes[:, 2] <= max_x) &
+                  (boxes[:, 1] >= min_y) & (boxes[:, 3] <= max_y))
+        outside = ((boxes[:, 0] > max_x) | (boxes[:, 2] < min_x) |
+                   (boxes[:, 1] > max_y) | (boxes[:, 3] < min_y))
+        partial = self.data[~inside & ~outside]
+        if not len(partial):
+            return self.select(inside)
+
+        cx, cy, r = partial[:, 0:1], partial[:, 1:2], partial[:, 2:3]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cos_values = (np.array([[min_x, max_x]]) - cx) / r
+            sin_values = (np.array([[min_y, max_y]]) - cy) / r
+            x_angles = np.arccos(cos_values)
+            y_angles = np.arcsin(sin_values)
+        crossings = np.concatenate((x_angles, -x_angles, y_angles, np.pi - y_angles), axis=1)
+
+        # Kesişimlerin yay üzerindeki konumları, yay uçlarıyla birlikte sıralı
+        sweep = np.abs(partial[:, 4:5])
+        offsets = _sweep_offsets(partial, crossings)
+        offsets[~((offsets > 0) & (offsets < sweep))] = np.inf
+        cuts = np.sort(np.concatenate((np.zeros_like(sweep), offsets, sweep), axis=1), axis=1)
+        cuts = np.minimum(cuts, sweep)
+        piece_start, piece_end = cuts[:, :-1], cuts[:, 1:]
+
+        direction = np.where(partial[:, 4:5] < 0, -1.0, 1.0)
+        middle = partial[:, 3:4] + direction * (piece_start + piece_end) / 2
+        mid_x, mid_y = _points_at(partial, middle)
+        keep = ((piece_end > piece_start) & (mid_x >= min_x) & (mid_x <= max_x) &
+                (mid_y >= min_y) & (mid_y <= max_y))
+
+        rows, pieces = np.nonzero(keep)
+        partial_pens = self.pens[~inside & ~outside]
+        clipped = partial[rows]
+        clipped[:, 3] = partial[rows, 3] + direction[rows, 0] * piece_start[rows, pieces]
+        clipped[:, 4] = direction[rows, 0] * (piece_end[rows, pieces] - piece_start[rows, pieces])
+        return ArcStore(np.concatenate((self.data[inside], clipped)),
+                        np.concatenate((self.pens[inside], partial_pens[rows])))
+
+    def select(self, selector):
+        """Maske veya indeks dizisiyle alt küme al"""
+        return ArcStore(self.data[selector], self.pens[selector])
+
+    def unique_pens(self):
+        """Kullanılan kalem numaraları (sıralı)"""
+        return np.unique(self.pens)
+
+    def bezier_curves(self):
+        """Yayları kübik Bézier parçalarına çevir
+
+        (yay başına parça sayısı, başlangıç noktaları (N, 2), parçaların
+        kontrol noktaları (P, 6): x1 y1 x2 y2 x3 y3) döner.
+        """
+        data = self.data
+        piece_counts = np.maximum(np.ceil(np.abs(data[:, 4]) / MAX_BEZIER_SWEEP - 1e-9), 1).astype(np.int64)
+        arc_of_piece = np.repeat(np.arange(len(data)), piece_counts)
+        first_piece = np.cumsum(piece_counts) - piece_counts
+        piece_index = np.arange(len(arc_of_piece)) - first_piece[arc_of_piece]
+
+        arcs = data[arc_of_piece]
+        step = arcs[:, 4] / piece_counts[arc_of_piece]
+        angle0 = arcs[:, 3] + piece_index * step
+        angle1 = angle0 + step
+        # Kontrol noktası uzaklığı: 4/3 * tan(açı/4) * yarıçap (açının işaretiyle)
+        handle = 4 / 3 * np.tan(step / 4) * arcs[:, 2]
+        cos0, sin0, cos1, sin1 = np.cos(angle0), np.sin(angle0), np.cos(angle1), np.sin(angle1)
+        x0 = arcs[:, 0] + arcs[:, 2] * cos0
+        y0 = arcs[:, 1] + arcs[:, 2] * sin0
+        x3 = arcs[:, 0] + arcs[:, 2] * cos1
+        y3 = arcs[:, 1] + arcs[:, 2] * sin1
+        controls = np.stack((x0 - handle * sin0, y0 + handle * cos0,
+                             x3 + handle * sin1, y3 - handle * cos1, x3, y3), axis=1)
+
+        starts = np.stack((data[:, 0] + data[:, 2] * np.cos(data[:, 3]),
+                           data[:, 1] + data[:, 2] * np.sin(data[:, 3])), axis=1)
+        return piece_counts, starts, controls
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Toplu dönüştürme yardımcıları
+input_plt klasöründeki dosyaları sırayla veya süreç havuzunda paralel dönüştürür
+"""
+
+import os
+import io
+import json
+import signal
+import time
+import argparse
+import contextlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from manifest import BuildManifest
+from pipeline import iter_loaded_drawings
+from segment_cleanup import DEFAULT_GRID_MM
+from simplify import DEFAULT_TOLERANCE_MM
+from profiling import PROFILE_HOOKS, deep_profile, format_stats
+
+
+# Bir dosyanın dönüştürme sonucu (işçi süreçten ana sürece döner)
+# stats: dönüştürücünün aşama süreleri ve sayaçları (ConversionStats.to_dict())
+ConversionResult = namedtuple('ConversionResult', 'success error output elapsed stats', defaults=(None,))
+
+# Çıktı PDF'ini değiştirmeyen seçenekler (manifest ayarlarına girmez)
+RUNTIME_OPTIONS = {'use_cache', 'tile_jobs'}
+
+
+def build_parser(description, tiled=False, streamable=False):
+    """Ortak komut satırı seçenekleri (tiled: A4'e bölen programlar,
+    streamable: iki geçişli akış modunu destekleyen programlar)"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Aynı anda dönüştürülecek dosya sayısı (0 = işlemci sayısı)")
+    parser.add_argument('--force', action='store_true',
+                        help="Değişmemiş dosyaları da yeniden dönüştür")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Geometri önbelleğini kullanma, her dosyayı yeniden ayrıştır")
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="Başlamadan önce geometri önbelleğini temizle")
+    parser.add_argument('--watch', action='store_true',
+                        help="input_plt klasörünü izle, yeni/değişen dosyaları sürekli dönüştür")
+    parser.add_argument('--profile', metavar='JSON',
+                        help="Her dosyanın aşama sürelerini ve sayaçlarını bu JSON dosyasına yaz")
+    parser.add_argument('--profile-hook', choices=PROFILE_HOOKS,
+                        help="Ayrıntılı profil: cprofile (PDF yanına .prof) veya tracemalloc (bellek)")
+    parser.add_argument('--simplify', type=float, nargs='?', const=DEFAULT_TOLERANCE_MM, metavar='MM',
+                        help=f"Çok küçük çizgi adımlarını bu toleransla (mm) sadeleştir (varsayılan {DEFAULT_TOLERANCE_MM})")
+    parser.add_argument('--cleanup', type=float, nargs='?', const=DEFAULT_GRID_MM, metavar='MM',
+                        help=f"Koordinatları bu ızgaraya (mm) yuvarla; sıfır uzunluklu, tekrar eden ve "
+                             f"aynı doğrudaki segmentleri temizle (varsayılan {DEFAULT_GRID_MM})")
+    parser.add_argument('--fast-pdf', action='store_true',
+                        help="PDF'i reportlab yerine hızlı yazıcıyla (pdf_writer.py) oluştur")
+    parser.add_argument('--split-pens', action='store_true',
+                        help="Her kalemi (SP) ayrıca <çıktı>_pen<N>.pdf dosyasına yaz (kesim/işaretleme ayrımı)")
+    parser.add_argument('--no-pipeline', action='store_true',
+                        help="Sıralı modda sonraki dosyaları PDF yazılırken arka planda önden yükleme")
+    if tiled:
+        parser.add_argument('--form', action='store_true',
+                            help="Çizimi PDF'e bir kez form olarak yaz, her sayfada tekrar kullan")
+        parser.add_argument('--tile-jobs', type=int, default=1, metavar='N',
+                            help="Bir dosyanın sayfalarını N paralel süreçte çiz (0 = işlemci sayısı / --jobs, "
+                                 "--fast-pdf gerekir, --form ile kullanılamaz)")
+    if streamable:
+        parser.add_argument('--stream', action='store_true',
+                            help="Segmentleri bellekte tutmadan dosyayı iki kez okuyarak çiz "
+                                 "(çok büyük dosyalar için, --fast-pdf gerekir)")
+    return parser
+
+
+def check_args(parser, args):
+    """Seçenekler arası uyumu denetle, 0 süreç sayılarını işlemci sayısına çevir"""
+    if getattr(args, 'tile_jobs', 1) != 1:
+        if not args.fast_pdf:
+            parser.error("--tile-jobs sadece --fast-pdf ile kullanılabilir")
+        if args.form:
+            parser.error("--tile-jobs, --form ile kullanılamaz (form modunda sayfalar tek süreçte yazılır)")
+        if args.tile_jobs <= 0:
+            # İşlemciler aynı anda dönüştürülen dosyalar arasında paylaştırılır
+            file_jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+            args.tile_jobs = max(1, (os.cpu_count() or 1) // file_jobs)
+        elif args.jobs != 1:
+            parser.error("--tile-jobs N, --jobs ile birlikte kullanılamaz (her dosya süreci N süreç daha açar); "
+                         "--tile-jobs 0 işlemcileri dosyalar arasında paylaştırır")
+    if getattr(args, 'stream', False) and not args.fast_pdf:
+        parser.error("--stream sadece --fast-pdf ile kullanılabilir (çizim gruplar halinde dosyaya yazılır)")
+    if args.split_pens and getattr(args, 'stream', False):
+        parser.error("--split-pens, --stream ile kullanılamaz (kalemler tek ayrıştırılmış çizimden yazılır)")
+    return args
+
+
+def parse_args(description, tiled=False, streamable=False):
+    """Komut satırı seçeneklerini oku"""
+    parser = build_parser(description, tiled, streamable)
+    return check_args(parser, parser.parse_args())
+
+
+def init_worker():
+    """İşçi süreçler Ctrl+C'yi yok sayar; durdurmayı ana süreç yönetir"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def convert_file(converter_class, plt_file, pdf_file, options=None, capture_output=True, profile_hook=None,
+                 drawing=None, load_stats=None):
+    """Tek dosyayı dönüştür, çıktıyı, süreyi ve ölçümleri ConversionResult olarak döndür
+
+    drawing verilirse dosya tekrar okunmaz, önceden ayrıştırılmış çizim
+    dönüştürücünün render() metoduyla yazılır; load_stats (çizimin
+    yükleme ölçümleri) verilirse dönüştürücünün ölçümlerine eklenir.
+    """
+    output = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    converter = None
+    report = {}
+
+    with contextlib.redirect_stdout(output) if capture_output else contextlib.nullcontext():
+        try:
+            converter = converter_class(plt_file, pdf_file, **(options or {}))
+            if load_stats is not None:
+                converter.stats.merge(load_stats)
+            with deep_profile(profile_hook, pdf_file) as report:
+                if drawing is None:
+                    success = bool(converter.convert())
+                else:
+                    success = bool(converter.render(drawing))
+        except Exception as e:
+            success = False
+            error = str(e)
+
+    stats = None
+    if converter is not None:
+        stats = converter.stats.to_dict()
+        stats.update(report)
+    return ConversionResult(success, error, output.getvalue(), time.perf_counter() - start, stats)
+
+
+def convert_loaded(converter_class, item, pdf_file, options=None, profile_hook=None, manifest=None):
+    """Boru hattında önden yüklenmiş dosyayı (pipeline.LoadedDrawing) dönüştür
+
+    Yükleme çıktısı önce yazılır; süre ve ölçümlere yükleme de dahildir.
+    Özet manifeste verilir, kayıt sırasında dosya tekrar okunmaz.
+    """
+    if manifest is not None and item.digest is not None:
+        manifest.remember_digest(item.plt_file, item.digest)
+    print(item.output, end='')
+    if item.drawing is None:
+        return ConversionResult(False, item.error, '', item.elapsed, item.stats.to_dict())
+
+    result = convert_file(converter_class, item.plt_file, pdf_file, options, capture_output=False,
+                          profile_hook=profile_hook, drawing=item.drawing, load_stats=item.stats)
+    return result._replace(elapsed=result.elapsed + item.elapsed)
+
+
+def output_settings(options):
+    """Seçeneklerden çıktı PDF'ini etkileyenler (manifest ayarları)
+
+    Kapalı (False/None) seçenekler yazılmaz; yeni bir seçenek eklemek
+    mevcut kayıtları geçersiz kılmaz.
+    """
+    return {key: value for key, value in sorted((options or {}).items())
+            if key not in RUNTIME_OPTIONS and value}
+
+
+def pdf_name(plt_file, pdf_suffix):
+    """PLT dosyasına karşılık gelen PDF adı"""
+    return os.path.splitext(os.path.basename(plt_file))[0] + pdf_suffix
+
+
+def report_result(result, filename, pdf_filename, manifest, plt_file):
+    """Sonuç satırını yaz, manifesti güncelle; başarılıysa True döner"""
+    if result.success:
+        print(f"✓ Başarılı: {pdf_filename} ({result.elapsed:.1f} sn)")
+        manifest.record(plt_file, pdf_filename)
+        return True
+
+    if result.error is not None:
+        print(f"✗ Hata: {filename} - {result.error}")
+    else:
+        print(f"✗ Başarısız: {filename}")
+    manifest.forget(pdf_filename)
+    return False
+
+
+def write_profile(profile_file, profiles):
+    """Dosya başına ölçümleri JSON olarak kaydet"""
+    with open(profile_file, 'w', encoding='utf-8') as f:
+        json.dump({'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'files': profiles},
+                  f, ensure_ascii=False, indent=1)
+    print(f"Profil kaydedildi: {profile_file}")
+
+
+def run_batch(converter_class, plt_files, output_dir, pdf_suffix, jobs=1, options=None, force=False,
+              profile_file=None, profile_hook=None, pipeline=True):
+    """Dosyaları dönüştür, ilerlemeyi dosya sırasıyla yaz
+
+    jobs > 1 ise dönüştürmeler süreç havuzunda yapılır; her dosyanın
+    çıktısı yakalanır ve kendisinden önceki dosyalar bittikten sonra
+    sırayla yazılır. Sıralı modda pipeline açıksa sonraki dosyalar, PDF
+    yazılırken arka planda okunup yüklenir (pipeline.py; akış modunda
+    kullanılmaz). options, dönüştürücü sınıfına anahtar kelime
+    argümanları olarak verilir. output_dir'deki manifeste göre değişmemiş
+    dosyalar atlanır (force ile hepsi dönüştürülür), kaynağı silinmiş
+    çıktılar kaldırılır. profile_file verilirse her dosyanın aşama
+    ölçümleri bu JSON dosyasına yazılır. (başarılı, başarısız, atlanan)
+    sayılarını döndürür.
+    """
+    manifest = BuildManifest(output_dir, pdf_suffix, output_settings(options))
+
+    for pdf_filename in manifest.remove_orphans(plt_files):
+        print(f"Kaynağı silinmiş çıktı kaldırıldı: {pdf_filename}")
+
+    jobs_list = []
+    for plt_file in plt_files:
+        filename = os.path.basename(plt_file)
+        pdf_filename = pdf_name(plt_file, pdf_suffix)
+        if not force and manifest.is_current(plt_file, pdf_filename):
+            continue
+        jobs_list.append((plt_file, filename, pdf_filename, os.path.join(output_dir, pdf_filename)))
+
+    skipped_count = len(plt_files) - len(jobs_list)
+    if skipped_count:
+        print(f"{skipped_count} dosya değişmemiş, atlanıyor")
+
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(jobs_list))
+
+    success_count = 0
+    fail_count = 0
+    profiles = {}
+
+    options = options or {}
+    loaded = None
+    if jobs <= 1:
+        results = None
+        if pipeline and len(jobs_list) > 1 and not options.get('stream'):
+            loaded = iter_loaded_drawings([job[0] for job in jobs_list], options.get('use_cache', True),
+                                          options.get('cleanup_grid'), options.get('simplify_tolerance'))
+    else:
+        print(f"{jobs} paralel süreç kullanılıyor")
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker)
+        results = [executor.submit(convert_file, converter_class, plt_file, pdf_file, options, True, profile_hook)
+                   for plt_file, _, _, pdf_file in jobs_list]
+
+    try:
+        for index, (plt_file, filename, pdf_filename, pdf_file) in enumerate(jobs_list, 1):
+            print(f"\n[{index}/{len(jobs_list)}] İşleniyor: {filename}")
+            print("-" * 60)
+
+            if loaded is not None:
+                result = convert_loaded(converter_class, next(loaded), pdf_file, options, profile_hook, manifest)
+            elif results is None:
+                # Sıralı modda çıktı yakalanmaz, canlı yazılır
+                result = convert_file(converter_class, plt_file, pdf_file, options, capture_output=False,
+                                      profile_hook=profile_hook)
+            else:
+                try:
+                    result = results[index - 1].result()
+                except Exception as e:
+                    # İşçi süreç çöktüyse (ör. bellek yetersiz) dosya başarısız sayılır
+                    result = ConversionResult(False, str(e), '', 0.0)
+                print(result.output, end='')
+
+            if report_result(result, filename, pdf_filename, manifest, plt_file):
+                success_count += 1
+            else:
+                fail_count += 1
+
+            if profile_file and result.stats is not None:
+                profiles[filename] = result.stats
+                print(format_stats(result.stats))
+    finally:
+        if results is not None:
+            executor.shutdown(cancel_futures=True)
+        if loaded is not None:
+            loaded.close()
+        # Yarıda kesilse bile biten dosyalar kaydedilir
+        manifest.save()
+        if profile_file:
+            write_profile(profile_file, profiles)
+
+    return success_count, fail_count, skipped_count
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Dönüştürücüler için ölçüm (benchmark) programı
+plt_generator ile üretilen yapay PLT dosyalarını her dönüştürücüyle
+çevirir; süre, en yüksek bellek (RSS), çıktı boyutu ve sayfa sayısını
+JSON olarak kaydeder. Önceki bir sonuç dosyasıyla karşılaştırıp
+yavaşlamaları gösterebilir.
+
+Örnekler:
+  python benchmark.py --sizes 10k,100k
+  python benchmark.py --compare benchmark_results/onceki.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import importlib
+import subprocess
+import contextlib
+
+from plt_generator import SHAPES, generate_plt
+from hpgl_interpreter import INTERPRETER_VERSION
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Üretilen PLT dosyaları ve sonuçların klasörleri
+DATA_DIR = os.path.join(SCRIPT_DIR, 'benchmark_data')
+RESULTS_DIR = os.path.join(SCRIPT_DIR, 'benchmark_results')
+
+# Ad -> (modül, sınıf)
+CONVERTERS = {
+    'single': ('plt_to_pdf', 'PLTtoPDFConverter'),
+    'a4': ('plt_to_pdf_a4', 'PLTtoPDFA4Converter'),
+    'overlap': ('plt_to_pdf_a4_overlap', 'PLTtoPDFA4OverlapConverter'),
+    'overlay': ('plt_to_pdf_a4_overlay', 'PLTtoPDFA4OverlayConverter'),
+}
+DEFAULT_CONVERTERS = ('single', 'a4', 'overlay')
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000, '10M': 10_000_000}
+
+# Bu orandan fazla yavaşlama/büyüme karşılaştırmada gerileme sayılır
+DEFAULT_THRESHOLD = 0.10
+
+_PAGE_PATTERN = re.compile(rb'/Type\s*/Page\b')
+
+
+def data_file(shape, size_name, seed):
+    """Şekil/boyut/tohum için PLT dosyası; yoksa üret"""
+    path = os.path.join(DATA_DIR, f"{shape}_{size_name}_s{seed}.plt")
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        print(f"Üretiliyor: {os.path.basename(path)}", flush=True)
+        tmp_path = path + '.tmp'
+        generate_plt(tmp_path, shape, SIZES[size_name], seed)
+        os.replace(tmp_path, path)
+    return path
+
+
+def count_pages(pdf_file):
+    """PDF'teki sayfa nesnelerini say"""
+    with open(pdf_file, 'rb') as f:
+        return len(_PAGE_PATTERN.findall(f.read()))
+
+
+def run_one(converter_name, plt_file, pdf_file, fast_pdf=False):
+    """Tek dönüştürmeyi bu süreçte yap, ölçümü sözlük olarak döndür"""
+    module_name, class_name = CONVERTERS[converter_name]
+    converter_class = getattr(importlib.import_module(module_name), class_name)
+
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        converter = converter_class(plt_file, pdf_file, use_cache=False, fast_pdf=fast_pdf)
+        try:
+            success = bool(converter.convert())
+        except Exception as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            success = False
+    elapsed = time.perf_counter() - start
+
+    # Linux'ta KB, macOS'ta bayt
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak_rss *= 1024
+
+    return {
+        'success': success,
+        'wall_s': round(elapsed, 4),
+        'peak_rss_mb': round(peak_rss / (1024 * 1024), 1),
+        'output_bytes': os.path.getsize(pdf_file) if success else 0,
+        'pages': count_pages(pdf_file) if success else 0,
+        'stages': converter.stats.to_dict()['stages'],
+    }
+
+
+def measure(converter_name, plt_file, pdf_file, repeat, fast_pdf=False):
+    """Dönüştürmeyi her seferinde yeni bir süreçte çalıştır
+
+    Ayrı süreç, en yüksek bellek ölçümünün önceki çalıştırmalardan
+    etkilenmemesini sağlar. En kısa süre ve en yüksek bellek alınır.
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--run-one', converter_name, plt_file, pdf_file]
+    if fast_pdf:
+        command.append('--fast-pdf')
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(command, check=True, stdout=subprocess.PIPE, text=True).stdout
+        result = json.loads(output.splitlines()[-1])
+        if best is None:
+            best = result
+        else:
+            best['wall_s'] = min(best['wall_s'], result['wall_s'])
+            best['peak_rss_mb'] = max(best['peak_rss_mb'], result['peak_rss_mb'])
+    return best
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR, check=True,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _versions():
+    import numpy
+    import reportlab
+    return {'python': platform.python_version(), 'numpy': numpy.__version__,
+            'reportlab': reportlab.Version}
+
+
+def result_key(result):
+    return result['converter'], result['shape'], result['size']
+
+
+def compare(results, baseline_file, threshold):
+    """Sonuçları önceki bir çalıştırmayla karşılaştır, gerileme sayısını döndür"""
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = {result_key(r): r for r in json.load(f)['results']}
+
+    print(f"\nKarşılaştırma: {baseline_file}")
+    print(f"{'dönüştürücü':<10} {'şekil':<9} {'boyut':>5}  {'süre':>8}  {'bellek':>8}  {'çıktı':>8}")
+    regressions = 0
+    for result in results:
+        old = baseline.get(result_key(result))
+        if old is None or not (old['success'] and result['success']):
+            continue
+        changes = []
+        flagged = False
+        for field in ('wall_s', 'peak_rss_mb', 'output_bytes'):
+            ratio = result[field] / old[field] - 1 if old[field] else 0.0
+            flagged |= ratio > threshold
+            changes.append(f"{ratio:+7.1%}")
+        regressions += flagged
+        print(f"{result['converter']:<10} {result['shape']:<9} {result['size']:>5}  "
+              f"{'  '.join(changes)}{'  << GERİLEME' if flagged else ''}")
+    return regressions
+
+
+def main():
+    if len(sys.argv) in (5, 6) and sys.argv[1] == '--run-one':
+        print(json.dumps(run_one(*sys.argv[2:5], fast_pdf=sys.argv[5:] == ['--fast-pdf'])))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(SIZES),
+                        help=f"Virgülle ayrılmış boyutlar ({', '.join(SIZES)})")
+    parser.add_argument('--shapes', default=','.join(SHAPES),
+                        help=f"Virgülle ayrılmış şekiller ({', '.join(SHAPES)})")
+    parser.add_argument('--converters', default=','.join(DEFAULT_CONVERTERS),
+                        help=f"Virgülle ayrılmış dönüştürücüler ({', '.join(CONVERTERS)})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help="Her ölçümün tekrar sayısı (en iyisi alınır)")
+    parser.add_argument('--output', help="Sonuç JSON dosyası (varsayılan: benchmark_results/<zaman>.json)")
+    parser.add_argument('--fast-pdf', action='store_true', help="Dönüştürücüleri hızlı PDF yazıcıyla çalıştır")
+    parser.add_argument('--compare', metavar='JSON', help="Bu önceki sonuçlarla karşılaştır")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Gerileme sayılan artış oranı (varsayılan 0.10)")
+    args = parser.parse_args()
+
+    sizes = args.sizes.split(',')
+    shapes = args.shapes.split(',')
+    converters = args.converters.split(',')
+    for values, valid in ((sizes, SIZES), (shapes, SHAPES), (converters, CONVERTERS)):
+        unknown = [item for item in values if item not in valid]
+        if unknown:
+            parser.error(f"Bilinmeyen değer: {', '.join(unknown)}")
+
+    pdf_file = os.path.join(DATA_DIR, 'output.pdf')
+    results = []
+    print(f"{'dönüştürücü':<10} {'şekil':<9} {'boyut':>5}  {'süre (sn)':>9}  {'bellek (MB)':>11}  "
+          f"{'çıktı (KB)':>10}  {'sayfa':>5}")
+    for size_name in sizes:
+        for shape in shapes:
+            plt_file = data_file(shape, size_name, args.seed)
+            for converter_name in converters:
+                result = {'converter': converter_name, 'shape': shape, 'size': size_name,
+                          'segments': SIZES[size_name], 'input_bytes': os.path.getsize(plt_file)}
+                result.update(measure(converter_name, plt_file, pdf_file, args.repeat, args.fast_pdf))
+                results.append(result)
+                status = '' if result['success'] else '  BAŞARISIZ'
+                print(f"{converter_name:<10} {shape:<9} {size_name:>5}  {result['wall_s']:>9.2f}  "
+                      f"{result['peak_rss_mb']:>11.1f}  {result['output_bytes'] // 1024:>10}  "
+                      f"{result['pages']:>5}{status}", flush=True)
+
+    if os.path.exists(pdf_file):
+        os.remove(pdf_file)
+
+    report = {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'interpreter_version': INTERPRETER_VERSION,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'versions': _versions(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'fast_pdf': args.fast_pdf,
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"\nSonuçlar kaydedildi: {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{regressions} ölçümde gerileme var (eşik %{args.threshold * 100:.0f})")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
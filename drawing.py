@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Ayrıştırılmış ve normalize edilmiş çizim
+PLT dosyası bir kez okunup mm cinsinden, sol alt köşesi (0, 0) olan
+segmentlere ve yaylara çevrilir; tüm sayfa düzenleri (tek sayfa, A4, overlap,
+overlay) ve kalem başına çıktılar aynı Drawing nesnesinden çizilir
+"""
+
+import numpy as np
+
+from arc_store import ArcStore
+from hpgl_parser import iter_commands
+from geometry_cache import load_geometry
+from segment_cleanup import cleanup_segments
+from simplify import simplify_segments
+from profiling import NO_STATS
+
+
+# HPGL birimlerini mm'ye çevirme (1016 HPGL units per inch)
+UNIT_TO_MM = 25.4 / 1016
+
+
+class Drawing:
+    """Normalize edilmiş çizim geometrisi (mm)"""
+
+    def __init__(self, plt_file, segments, width_mm, height_mm, source_count, arcs=None):
+        self.plt_file = plt_file
+        self.segments = segments  # SegmentStore, mm
+        self.arcs = arcs if arcs is not None else ArcStore()  # ArcStore, mm
+        self.width_mm = width_mm
+        self.height_mm = height_mm
+        self.source_count = source_count  # Temizleme/sadeleştirme öncesi segment sayısı
+
+    def pens(self):
+        """Çizimde kullanılan kalem numaraları (sıralı)"""
+        return np.union1d(self.segments.unique_pens(), self.arcs.unique_pens()).tolist()
+
+    def pen_subset(self, pen):
+        """Sadece verilen kalemin geometrisi; boyutlar ve konumlar aynı kalır"""
+        return Drawing(self.plt_file, self.segments.select(self.segments.pens == pen), self.width_mm,
+                       self.height_mm, self.source_count, self.arcs.select(self.arcs.pens == pen))
+
+
+def load_drawing(plt_file, unit_to_mm=UNIT_TO_MM, use_cache=True, cleanup_grid=None,
+                 simplify_tolerance=None, stats=NO_STATS, digest=None, data=None, log=None):
+    """PLT dosyasını oku, normalize et; çizim yoksa hata yazıp None döndür
+
+    digest: önceden hesaplanmış içerik özeti (önbellek için dosya tekrar okunmaz).
+    data: önceden okunmuş dosya içeriği (verilirse dosya hiç okunmaz).
+    log: ilerleme ve hata mesajlarının yazılacağı akış (varsayılan sys.stdout).
+    """
+    print(f"PLT dosyası okunuyor: {plt_file}", file=log)
+    if next(iter_commands(plt_file, data=data), None) is None:
+        print("Hata: PLT dosyasında geçerli komut bulunamadı!", file=log)
+        return None
+    stats.lap('probe')
+
+    # Tüm çizgileri ve yayları topla (HPGL birimlerinde)
+    lines, arcs = load_geometry(plt_file, use_cache, stats=stats, digest=digest, data=data, log=log)
+
+    if not lines and not arcs:
+        print("Hata: Çizim verisi bulunamadı!", file=log)
+        return None
+
+    print(f"{len(lines)} çizgi segmenti bulundu", file=log)
+    if arcs:
+        print(f"{len(arcs)} yay/daire bulundu", file=log)
+
+    # Sınırları hesapla (yaylar tam sınır kutularıyla dahil)
+    bounds = [store.bounds() for store in (lines, arcs) if store]
+    min_x, min_y = min(b[0] for b in bounds), min(b[1] for b in bounds)
+    max_x, max_y = max(b[2] for b in bounds), max(b[3] for b in bounds)
+    stats.lap('bounds')
+
+    # Normalize et (Y ekseni çevirmeden); temizleme ve sadeleştirme sadece çizgilere uygulanır
+    normalized_lines = lines.normalized(min_x, min_y, unit_to_mm)
+    normalized_arcs = arcs.normalized(min_x, min_y, unit_to_mm)
+    stats.lap('normalize')
+    if cleanup_grid:
+        normalized_lines, cleanup_stats = cleanup_segments(normalized_lines, cleanup_grid)
+        stats.lap('cleanup')
+        print(f"Temizleme ({cleanup_grid} mm ızgara): {cleanup_stats.zero_length} sıfır uzunluklu, "
+              f"{cleanup_stats.duplicates} tekrar eden segment atıldı, {cleanup_stats.merged} segment birleştirildi", file=log)
+    if simplify_tolerance:
+        cleaned_count = len(normalized_lines)
+        normalized_lines = simplify_segments(normalized_lines, simplify_tolerance)
+        stats.lap('simplify')
+        print(f"Sadeleştirme ({simplify_tolerance} mm): "
+              f"{cleaned_count - len(normalized_lines)} segment kaldırıldı, {len(normalized_lines)} kaldı", file=log)
+
+    width_mm = (max_x - min_x) * unit_to_mm
+    height_mm = (max_y - min_y) * unit_to_mm
+
+    print(f"Çizim boyutu: {width_mm:.1f} mm x {height_mm:.1f} mm", file=log)
+    drawing = Drawing(plt_file, normalized_lines, width_mm, height_mm, len(lines), normalized_arcs)
+    pens = drawing.pens()
+    if len(pens) > 1:
+        print(f"{len(pens)} kalem kullanılıyor: {', '.join(map(str, pens))}", file=log)
+    return drawing
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Ayrıştırılmış PLT geometrisi için disk önbelleği
+Anahtar: dosya içeriğinin SHA-256 özeti + yorumlayıcı sürümü
+Segment ve yay dizileri, kalemleri ve sınırlar .npz dosyası olarak saklanır; aynı PLT
+tekrar dönüştürülürken ayrıştırma tamamen atlanır
+"""
+
+import os
+import glob
+import shutil
+import hashlib
+import tempfile
+
+import numpy as np
+
+from arc_store import ArcStore
+from hpgl_interpreter import INTERPRETER_VERSION, interpret_file
+from profiling import NO_STATS
+from segment_store import SegmentStore
+
+
+# Önbellek klasörü (programların yanında)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.plt_cache')
+
+# Önbelleğin en fazla kaplayacağı alan; aşılınca en eski kullanılanlar silinir
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# Özet hesaplarken okuma parça boyutu
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def data_digest(data):
+    """Bellekteki dosya içeriğinin SHA-256 özeti (hex); file_digest ile aynı sonuç"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(plt_file):
+    """Dosya içeriğinin SHA-256 özeti (hex)"""
+    digest = hashlib.sha256()
+    with open(plt_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(digest, cache_dir=CACHE_DIR):
+    """Özet ve yorumlayıcı sürümüne karşılık gelen önbellek dosyası"""
+    return os.path.join(cache_dir, f"{digest}-v{INTERPRETER_VERSION}.npz")
+
+
+def load_geometry(plt_file, use_cache=True, cache_dir=CACHE_DIR, stats=NO_STATS, digest=None, data=None,
+                  log=None):
+    """PLT dosyasının (segmentler, yaylar) çiftini önbellekten al, yoksa ayrıştırıp kaydet
+
+    digest verilirse (ör. boru hattında önceden hesaplandıysa) özet tekrar hesaplanmaz;
+    data (önceden okunmuş içerik) verilirse dosya tekrar okunmaz. Uyarılar log'a
+    (varsayılan sys.stdout) yazılır.
+    """
+    if not use_cache:
+        return interpret_file(plt_file, stats=stats, data=data)
+
+    if digest is None:
+        digest = data_digest(data) if data is not None else file_digest(plt_file)
+    path = cache_path(digest, cache_dir)
+    stats.lap('hash')
+    cached = _read_entry(path)
+    stats.lap('cache_read')
+    if cached is not None:
+        stats.count('cache_hits')
+        return cached
+
+    segments, arcs = interpret_file(plt_file, stats=stats, data=data)
+    _write_entry(path, segments, arcs, log)
+    evict(cache_dir)
+    stats.lap('cache_write')
+    return segments, arcs
+
+
+def _read_entry(path):
+    try:
+        with np.load(path) as entry:
+            data = entry['segments']
+            segment_pens = entry['segment_pens']
+            arcs = entry['arcs']
+            arc_pens = entry['arc_pens']
+            bounds = tuple(entry['bounds'].tolist()) if len(data) else None
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Bozuk/yarım kalmış kayıt: sil ve yeniden ayrıştır
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    # LRU için son kullanım zamanını güncelle
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return SegmentStore(data, bounds, segment_pens), ArcStore(arcs, arc_pens)
+
+
+def _write_entry(path, segments, arcs, log=None):
+    bounds = segments.bounds() if len(segments) else (0.0, 0.0, 0.0, 0.0)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Paralel süreçler aynı dosyayı yazabilir: önce geçici dosya, sonra taşı
+        fd, tmp_path = tempfile.mkstemp(suffix='.npz.tmp', dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, segments=segments.data, segment_pens=segments.pens, arcs=arcs.data, arc_pens=arcs.pens,
+                     bounds=np.array(bounds))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Önbellek yazılamazsa dönüştürme yine de devam eder
+        print(f"Uyarı: Önbellek yazılamadı: {e}", file=log)
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Toplam boyut sınırı aşılırsa en uzun süredir kullanılmayan kayıtları sil"""
+    entries = []
+    for path in glob.glob(os.path.join(cache_dir, '*.npz')):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """Önbellek klasörünü tamamen sil"""
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+        print(f"Önbellek temizlendi: {cache_dir}")
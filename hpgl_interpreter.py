@@ -0,0 +1,802 @@
+#!/usr/bin/env python3
+"""
+HPGL kalem komutlarını (PU/PD/PA/PR/IN/SP) toplu olarak çizgi segmentlerine çevirir
+Komutlar gruplar halinde işlenir; koordinatlar tek seferde NumPy dizisine
+çevrilir, kalem durumu, seçili kalem (SP) ve göreli hareketler dizi
+işlemleriyle hesaplanır. Yay ve daire komutları (AA/AR/AT/RT/CI)
+segmentlere bölünmeden yay olarak (ArcStore) tutulur.
+"""
+
+import codecs
+import math
+import re
+from collections import deque
+from itertools import chain, compress, islice, repeat
+
+import numpy as np
+
+from arc_store import ArcStore
+from hpgl_parser import (CHUNK_SIZE, COMMAND_PATTERN, decode_polyline_encoded, find_polyline_encoded,
+                         iter_file_chunks, split_polyline_encoded, tokenize_chunks)
+from profiling import NO_STATS
+from segment_store import DEFAULT_PEN, PEN_DTYPE, SegmentStore
+
+
+# Bir grupta işlenecek komut sayısı
+BATCH_SIZE = 1 << 16
+
+# Yorumlama sonucunu değiştiren her düzeltmede artırılır (geometri önbelleği anahtarı)
+# 3: segment ve yay kalemleri (SP), 4: PE blokları ve ':' kalem seçimi
+INTERPRETER_VERSION = 4
+
+# Komut kodları (yay komutları kalem komutlarından sonra: kod >= AA)
+# PE, yorumlamadan önce kalem komutlarına açılır (_expand_polyline_encoded)
+PU, PD, PA, PR, IN, SP, AA, AR, AT, RT, CI, PE = range(12)
+_COMMAND_CODES = {'PU': PU, 'PD': PD, 'PA': PA, 'PR': PR, 'IN': IN, 'SP': SP,
+                  'AA': AA, 'AR': AR, 'AT': AT, 'RT': RT, 'CI': CI, 'PE': PE}
+
+# Kalem numaralarının sınırı (PEN_DTYPE aralığı)
+_MAX_PEN = np.iinfo(PEN_DTYPE).max
+
+# Ayrıştırmadan önce silinen baytlar
+_WHITESPACE = b'\n\r '
+
+# Tek bir komut için en fazla kaç parça bekletilir
+_MAX_CARRY_CHUNKS = 8
+
+# Tamponun sonundaki (ters çevrilmiş) büyük harf dizisi
+_TRAILING_RUN = re.compile(rb'([^A-Z]*)([A-Z]+)')
+
+# Parçanın sonundaki büyük harfler (sonraki parçayla birlikte PE komutu olabilir)
+_TRAILING_LETTERS = re.compile(rb'[A-Z]*\Z')
+
+# Bu sınırın altındaki tamsayıların toplam ve farkları float64'te tam olarak hesaplanır
+_EXACT_INT_LIMIT = 2.0 ** 52
+
+
+def _parse_values(param_strs):
+    """Parametre metinlerini tek seferde float dizisine çevir
+
+    Her komutun parametreleri ';' silinip ',' ile bölünür; boş ya da
+    sayıya çevrilemeyen parçalar atlanır. (değerler, komut başına geçerli
+    değer sayısı) döner.
+    """
+    part_counts = np.fromiter(map(str.count, param_strs, repeat(',')), dtype=np.int64,
+                              count=len(param_strs)) + 1
+    parts = ','.join(param_strs).replace(';', '').split(',')
+    valid = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts)) > 0
+
+    try:
+        values = np.fromiter(map(float, filter(None, parts)), dtype=np.float64,
+                             count=int(valid.sum()))
+    except ValueError:
+        # Hızlı yol başarısız: geçersiz parçaları tek tek ayıkla
+        values = []
+        for i, part in enumerate(parts):
+            valid[i] = False
+            part = part.strip()
+            if part:
+                try:
+                    values.append(float(part))
+                    valid[i] = True
+                except ValueError:
+                    pass
+        values = np.array(values, dtype=np.float64)
+
+    part_starts = np.zeros(len(param_strs), dtype=np.int64)
+    np.cumsum(part_counts[:-1], out=part_starts[1:])
+    value_counts = np.add.reduceat(valid.astype(np.int64), part_starts)
+    return values, value_counts
+
+
+def _accumulate_positions(values, relative, x0, y0, integral=False):
+    """Noktaların mutlak konumlarını hesapla
+
+    Göreli (PR) noktalar, son mutlak noktadan itibaren sırayla toplanır;
+    sonuç, Python döngüsündeki x + dx toplamlarıyla birebir aynıdır.
+    Tamsayı koordinatlı gruplar tek kümülatif toplamla (yuvarlamasız),
+    kesirli değer içeren gruplar ise tek tek sırayla toplanır.
+    """
+    if not relative.any():
+        return values[:, 0].copy(), values[:, 1].copy()
+
+    # Başlangıç konumu ilk mutlak nokta olarak eklenir
+    points = np.concatenate(([[x0, y0]], values))
+    is_absolute = np.concatenate(([True], ~relative))
+    run_starts = np.flatnonzero(is_absolute)
+    run_ends = np.append(run_starts[1:], len(points))
+    run_lengths = run_ends - run_starts
+
+    if integral and float(x0).is_integer() and float(y0).is_integer() and max(abs(x0), abs(y0)) < _EXACT_INT_LIMIT:
+        run_integral = np.ones(len(run_starts), dtype=bool)
+        exact = np.ones(len(points), dtype=bool)
+    else:
+        integral = np.all((np.floor(points) == points) & (np.abs(points) < _EXACT_INT_LIMIT), axis=1)
+        run_integral = np.minimum.reduceat(integral, run_starts)
+        exact = np.repeat(run_integral, run_lengths)
+
+    deltas = points.copy()
+    deltas[is_absolute | ~exact] = 0.0
+    if np.abs(deltas).sum() >= _EXACT_INT_LIMIT:
+        # Toplam çok büyük: tüm grupları sırayla topla
+        run_integral[:] = False
+        exact[:] = False
+        deltas[:] = 0.0
+
+    sums = np.cumsum(deltas, axis=0)
+    # Her grubun başlangıç noktası, grubun kümülatif toplamlarına eklenir
+    bases = points[run_starts] - sums[run_starts]
+    positions = np.repeat(bases, run_lengths, axis=0) + sums
+    # Kesirli mutlak noktalar (v - s + s yuvarlanabilir) doğrudan alınır
+    inexact = is_absolute & ~exact
+    positions[inexact] = points[inexact]
+
+    slow_runs = np.flatnonzero(~run_integral & (run_ends - run_starts > 1))
+    for run in slow_runs:
+        start, end = run_starts[run], run_ends[run]
+        np.cumsum(points[start:end], axis=0, out=positions[start:end])
+
+    return positions[1:, 0], positions[1:, 1]
+
+
+# İki harfli komut (ilk harf * 256 + ikinci harf) -> komut kodu
+_CODE_TABLE = np.full(1 << 16, -1, dtype=np.int8)
+for _name, _code in _COMMAND_CODES.items():
+    _CODE_TABLE[ord(_name[0]) * 256 + ord(_name[1])] = _code
+
+# Hızlı yolda karakter sınıfları (0: hızlı yola uymayan karakter)
+_UPPER, _NUMBER, _COMMA, _SEMICOLON = 1, 2, 3, 4
+# bytes.translate tablosu: tampon tek geçişte sınıf baytlarına çevrilir
+_CHAR_CLASSES = bytearray(256)
+_CHAR_CLASSES[ord('A'):ord('Z') + 1] = bytes([_UPPER]) * 26
+_CHAR_CLASSES[ord('0'):ord('9') + 1] = bytes([_NUMBER]) * 10
+for _char in b'.+-':
+    _CHAR_CLASSES[_char] = _NUMBER
+_CHAR_CLASSES[ord(',')] = _COMMA
+_CHAR_CLASSES[ord(';')] = _SEMICOLON
+_CHAR_CLASSES = bytes(_CHAR_CLASSES)
+
+# Hızlı yolda bir sayının en fazla rakam sayısı (mantis 2**53 altında kalmalı)
+_MAX_DIGITS = 15
+_FLOAT_POWERS = 10.0 ** np.arange(_MAX_DIGITS + 1)
+_INT_POWERS = 10 ** np.arange(_MAX_DIGITS + 1, dtype=np.int64)
+
+
+def _scan_buffer(buffer, stats=NO_STATS):
+    """Bayt tamponundaki kalem komutlarını ve sayıları çıkar
+
+    Komut eşleştirmesi re.findall(r'([A-Z]{2})([^A-Z]*)') ile aynıdır:
+    büyük harf dizileri baştan itibaren ikişer ikişer komut olur. Sayılar
+    rakamlardan doğrudan hesaplanır (mantis / 10**kesir, float() ile aynı
+    yuvarlama). Tampon ASCII değilse ya da parametrelerde basit ondalık
+    sayı dışında bir şey varsa None döner.
+    """
+    chars = np.frombuffer(buffer, dtype=np.uint8)
+    tokens = _tokenize_buffer(buffer, chars)
+    stats.lap('tokenize')
+    if tokens is None:
+        return None
+    codes, part_starts, lengths, value_counts = tokens
+
+    parsed = _parse_parts(buffer, chars, part_starts, lengths)
+    stats.lap('parse_numbers')
+    if parsed is None:
+        return None
+    values, integral = parsed
+    return codes, values, value_counts, integral
+
+
+def _tokenize_buffer(buffer, chars):
+    """Komutları ve sayı parçalarının konumlarını bul
+
+    (komut kodları, parça başlangıçları, parça uzunlukları, komut başına
+    parça sayısı) döner; hızlı yola uymayan tamponda None döner. Sayı
+    parçaları, sayı karakterlerinin (rakam, '.', '+', '-') kesintisiz
+    dizileridir; her komutun parçaları, kendi başlangıcı ile sonraki
+    komutun başlangıcı arasındakilerdir. Parçalar komutlara konumlarının
+    ikili aramasıyla değil, komut başlangıçlarının parça dizisinde
+    aranmasıyla dağıtılır (komut sayısı kadar arama).
+    """
+    no_int = np.empty(0, dtype=np.int64)
+    empty = (np.empty(0, dtype=np.int8), no_int, no_int, no_int)
+    if not len(chars):
+        return empty
+    classes = np.frombuffer(buffer.translate(_CHAR_CLASSES), dtype=np.uint8)
+    # Bilinmeyen karakterler (ASCII dışı, küçük harf, ...) hızlı yola uymaz
+    if not classes.min():
+        return None
+
+    # Tüm büyük harf dizileri çift uzunluktaysa komutlar dizinin çift konumlarıdır
+    upper_pos = np.flatnonzero(classes == _UPPER)
+    if len(upper_pos) < 2:
+        return empty
+    breaks = np.flatnonzero(np.diff(upper_pos) != 1)
+    run_lengths = np.diff(np.concatenate(([0], breaks + 1, [len(upper_pos)])))
+    if (run_lengths % 2).any():
+        return None
+    cmd_pos = upper_pos[0::2]
+
+    # ';' sadece parametrelerin son karakteri olabilir (sonrasında komut veya tampon sonu)
+    semicolons = np.flatnonzero(classes == _SEMICOLON)
+    semicolons = semicolons[semicolons > cmd_pos[0]]
+    following = semicolons + 1
+    following = following[following < len(chars)]
+    if (classes[following] != _UPPER).any():
+        return None
+
+    # Sayı parçaları: sayı karakteri dizilerinin [başlangıç, bitiş) aralıkları
+    is_number = np.zeros(len(chars) + 2, dtype=bool)
+    np.equal(classes, _NUMBER, out=is_number[1:-1])
+    edges = np.flatnonzero(is_number[1:] != is_number[:-1])
+    part_starts, part_ends = edges[0::2], edges[1::2]
+    bounds = np.append(np.searchsorted(part_starts, cmd_pos), len(part_starts))
+    value_counts = np.diff(bounds)
+    part_starts = part_starts[bounds[0]:]
+    lengths = part_ends[bounds[0]:] - part_starts
+
+    codes = _CODE_TABLE[chars[cmd_pos].astype(np.int64) * 256 + chars[cmd_pos + 1]]
+    known = codes >= 0
+    if not known.any():
+        return empty
+    if not known.all():
+        owned = np.repeat(known, value_counts)
+        part_starts, lengths = part_starts[owned], lengths[owned]
+        codes, value_counts = codes[known], value_counts[known]
+    return codes, part_starts, lengths, value_counts
+
+
+def _parse_parts(buffer, chars, part_starts, lengths):
+    """Sayı parçalarını rakamlarından float'a çevir, (değerler, tamsayı mı) döndür
+
+    Parçalar sağa yaslanmış (sütun, parça) matrisine toplanır; nokta ve
+    işaret sıfır basamak sayılıp mantis sütun sütun hesaplanır, noktanın
+    eklediği basamak sonra çıkarılır. Parçalarda sadece sayı karakterleri
+    vardır (bkz. _tokenize_buffer).
+    """
+    if not len(lengths):
+        return np.empty(0), True
+
+    width = int(lengths.max())
+    if width > _MAX_DIGITS + 2:
+        return None
+    # İşaret sadece parçanın ilk karakteri olabilir
+    first = chars[part_starts]
+    has_sign = (first == ord('-')) | (first == ord('+'))
+    if np.count_nonzero((chars == ord('-')) | (chars == ord('+'))) != np.count_nonzero(has_sign):
+        return None
+
+    columns = np.arange(width)[:, None]
+    outside = columns < width - lengths
+    padded = np.concatenate((np.zeros(width, dtype=np.uint8), chars))
+    matrix = padded[part_starts + lengths + columns]
+    digits = matrix - 48
+    digits[(digits >= 10) | outside] = 0
+
+    digit_count = lengths - has_sign
+    fraction = None
+    if b'.' in buffer:
+        is_dot = (matrix == ord('.')) & ~outside
+        dot_count = is_dot.sum(axis=0)
+        if dot_count.max() > 1:
+            return None
+        digit_count = digit_count - dot_count
+        has_dot = dot_count > 0
+        fraction = np.where(has_dot, width - 1 - is_dot.argmax(axis=0), 0)
+    if digit_count.min() == 0 or digit_count.max() > _MAX_DIGITS:
+        return None
+
+    mantissa = digits[0].astype(np.int64)
+    for column in range(1, width):
+        mantissa *= 10
+        mantissa += digits[column]
+    if fraction is not None:
+        # Noktanın sıfır basamağı çıkarılır: üst basamaklar bir basamak aşağı kayar
+        low_power = _INT_POWERS[fraction]
+        mantissa = np.where(has_dot, mantissa // (low_power * 10) * low_power + mantissa % low_power, mantissa)
+        values = mantissa / _FLOAT_POWERS[fraction]
+    else:
+        values = mantissa.astype(np.float64)
+    values *= 1 - 2 * (first == ord('-'))
+    return values, fraction is None or not fraction.any()
+
+
+def _expand_polyline_encoded(codes, values, value_counts, integral, payloads):
+    """PE komutlarını çözülmüş noktalarına karşılık gelen kalem komutlarıyla değiştir
+
+    Her nokta bir kalem komutu (PU/PD, değersiz) ve bir hareket (PA/PR),
+    her ':' kalem seçimi bir SP komutu olur; böylece PE noktaları doğrudan
+    toplu yorumlayıcının dizilerine eklenir ve PE'den sonra kalem son
+    noktadaki durumunda kalır. (kodlar, değerler, komut başına değer
+    sayısı, tamsayı mı) döner.
+    """
+    points, pen_up, absolute, pair_counts, pen_selects = decode_polyline_encoded(payloads)
+    markers = np.flatnonzero(codes == PE)
+    pair_counts = np.append(pair_counts, np.zeros(len(markers), dtype=np.int64))[:len(markers)]
+    points = points[:pair_counts.sum()]
+    select_values, select_block, select_point = pen_selects
+    in_block = select_block < len(markers)
+    select_values, select_block, select_point = select_values[in_block], select_block[in_block], select_point[in_block]
+    select_counts = np.bincount(select_block, minlength=len(markers))
+
+    sizes = np.ones(len(codes), dtype=np.int64)
+    sizes[markers] = 2 * pair_counts + select_counts
+    out_starts = np.cumsum(sizes) - sizes
+    new_codes = np.empty(int(sizes.sum()), dtype=np.int8)
+    new_counts = np.zeros(len(new_codes), dtype=np.int64)
+    kept = codes != PE
+    new_codes[out_starts[kept]] = codes[kept]
+    new_counts[out_starts[kept]] = value_counts[kept]
+
+    # Blok içindeki yer: önceki noktalar iki, önceki kalem seçimleri bir komut kaplar
+    block_first = np.cumsum(pair_counts) - pair_counts
+    select_first = np.cumsum(select_counts) - select_counts
+    pair_block = np.repeat(np.arange(len(markers)), pair_counts)
+    point_index = np.arange(len(points))
+    selects_before = np.searchsorted(select_point, point_index, side='right') - select_first[pair_block]
+    pen_slots = out_starts[markers][pair_block] + 2 * (point_index - block_first[pair_block]) + selects_before
+    new_codes[pen_slots] = np.where(pen_up[:len(points)], PU, PD)
+    new_codes[pen_slots + 1] = np.where(absolute[:len(points)], PA, PR)
+    new_counts[pen_slots + 1] = 2
+    select_slots = (out_starts[markers][select_block] + 2 * (select_point - block_first[select_block]) +
+                    np.arange(len(select_values)) - select_first[select_block])
+    new_codes[select_slots] = SP
+    new_counts[select_slots] = 1
+
+    # Eklenen değerler komut sırasıyla, PE komutunun değer konumuna yerleştirilir
+    inserted_slots = np.concatenate((np.repeat(pen_slots + 1, 2), select_slots))
+    inserted = np.concatenate((points.ravel(), select_values))[np.argsort(inserted_slots, kind='stable')]
+    value_starts = np.cumsum(value_counts) - value_counts
+    new_values = np.insert(values, np.repeat(value_starts[markers], 2 * pair_counts + select_counts), inserted)
+    integral = integral and bool(np.all((np.floor(inserted) == inserted) & (np.abs(inserted) < _EXACT_INT_LIMIT)))
+    return new_codes, new_values, new_counts, integral
+
+
+def _three_point_arc(start_x, start_y, mid_x, mid_y, end_x, end_y):
+    """Başlangıç, ara ve bitiş noktasından geçen yay: (merkez x, y, yarıçap, başlangıç açısı, tarama)
+
+    Bitiş başlangıçla aynıysa başlangıç ile ara noktayı çap kabul eden
+    tam daire döner. Noktalar aynı doğru üzerindeyse None döner.
+    """
+    if (end_x, end_y) == (start_x, start_y):
+        if (mid_x, mid_y) == (start_x, start_y):
+            return None
+        center_x, center_y = (start_x + mid_x) / 2, (start_y + mid_y) / 2
+        return (center_x, center_y, math.hypot(mid_x - center_x, mid_y - center_y),
+                math.atan2(start_y - center_y, start_x - center_x), 2 * math.pi)
+
+    # Başlangıca göre koordinatlarla çevrel çember merkezi
+    bx, by = mid_x - start_x, mid_y - start_y
+    cx, cy = end_x - start_x, end_y - start_y
+    b_squared, c_squared = bx * bx + by * by, cx * cx + cy * cy
+    determinant = 2 * (bx * cy - by * cx)
+    if abs(determinant) <= 1e-12 * (b_squared + c_squared):
+        return None
+    ux = (cy * b_squared - by * c_squared) / determinant
+    uy = (bx * c_squared - cx * b_squared) / determinant
+
+    start_angle = math.atan2(-uy, -ux)
+    end_angle = math.atan2(cy - uy, cx - ux)
+    # determinant > 0: noktalar saat yönünün tersine sıralı
+    if determinant > 0:
+        sweep = (end_angle - start_angle) % (2 * math.pi)
+    else:
+        sweep = -((start_angle - end_angle) % (2 * math.pi))
+    return start_x + ux, start_y + uy, math.hypot(ux, uy), start_angle, sweep
+
+
+class HPGLInterpreter:
+    """Kalem durumunu gruplar arasında taşıyarak komutları segmentlere çevirir"""
+
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.pen_down = False
+        self.pen = DEFAULT_PEN
+
+    def feed(self, commands, stats=NO_STATS, payloads=None):
+        """Bir grup (komut, parametreler) çiftini işle, (SegmentStore, ArcStore) döndür
+
+        PE komutlarının parametreleri ayrılıp toplu çözülür. payloads
+        verilirse, parametreleri önceden ayrılmış PE komutlarının ';' ile
+        sonlanan (bayt) parametreleridir.
+        """
+        if not commands:
+            return SegmentStore(), ArcStore()
+        cmds, param_strs = zip(*commands)
+        if 'PE' in cmds:
+            if payloads is None:
+                payloads = ''.join(params if params.endswith(';') else params + ';'
+                                   for cmd, params in commands if cmd == 'PE').encode('latin-1', errors='ignore')
+            param_strs = ['' if cmd == 'PE' else params for cmd, params in commands]
+        codes = np.fromiter(map(_COMMAND_CODES.get, cmds, repeat(-1)), dtype=np.int8, count=len(cmds))
+        known = codes >= 0
+        if not known.any():
+            return SegmentStore(), ArcStore()
+        if not known.all():
+            param_strs = list(compress(param_strs, known.tolist()))
+            codes = codes[known]
+        else:
+            param_strs = list(param_strs)
+
+        values, value_counts = _parse_values(param_strs)
+        stats.lap('parse_numbers')
+        return self._counted(self._evaluate(codes, values, value_counts, payloads=payloads), len(codes), stats)
+
+    def feed_buffer(self, buffer, stats=NO_STATS):
+        """Boşlukları silinmiş, komut sınırında biten bir bayt tamponunu işle"""
+        payloads = None
+        if find_polyline_encoded(buffer) is not None:
+            # PE parametreleri bayt olarak ayrılır (8 bitlik basamaklar metne çevrilemez)
+            buffer, payloads = split_polyline_encoded(buffer)
+        scanned = _scan_buffer(buffer, stats)
+        if scanned is None:
+            # Hızlı yola uymayan tampon: metne çevirip komut komut işle
+            text = buffer.decode('utf-8', errors='ignore')
+            commands = COMMAND_PATTERN.findall(text)
+            stats.lap('tokenize')
+            return self.feed(commands, stats, payloads)
+        return self._counted(self._evaluate(*scanned, payloads=payloads), len(scanned[0]), stats)
+
+    def _counted(self, geometry, command_count, stats):
+        """Yorumlama süresini ve komut/segment/yay sayılarını kaydet"""
+        segments, arcs = geometry
+        stats.lap('evaluate')
+        stats.count('commands', command_count)
+        stats.count('segments', len(segments))
+        if len(arcs):
+            stats.count('arcs', len(arcs))
+        return geometry
+
+    def _evaluate(self, codes, values, value_counts, integral=False, payloads=None):
+        """Komut kodları ve ayrıştırılmış değerlerden (segmentler, yaylar) üret
+
+        Kalemi hareket ettiren yay komutları (AA/AR/AT/RT) sırayla tek tek,
+        aralarındaki kalem komutları ve daireler (CI) toplu olarak işlenir.
+        integral=True ise tüm değerlerin 2**52 altında tamsayı olduğu bilinir.
+        payloads: PE komutlarının sırayla parametreleri (bkz. feed).
+        """
+        if payloads:
+            codes, values, value_counts, integral = _expand_polyline_encoded(codes, values, value_counts,
+                                                                             integral, payloads)
+        moving_arcs = np.flatnonzero((codes >= AA) & (codes <= RT))
+        if not len(moving_arcs) and not (codes == CI).any():
+            return self._evaluate_lines(codes, values, value_counts, integral), ArcStore()
+
+        value_starts = np.zeros(len(codes) + 1, dtype=np.int64)
+        np.cumsum(value_counts, out=value_starts[1:])
+        line_parts = []
+        arc_parts = []
+        start = 0
+        for index in moving_arcs.tolist() + [len(codes)]:
+            if index > start:
+                self._evaluate_run(codes[start:index], values[value_starts[start]:value_starts[index]],
+                                   value_counts[start:index], integral, line_parts, arc_parts)
+            if index < len(codes):
+                params = values[value_starts[index]:value_starts[index + 1]].tolist()
+                self._evaluate_arc(int(codes[index]), params, line_parts, arc_parts)
+            start = index + 1
+
+        return SegmentStore.concatenate(line_parts), ArcStore.concatenate(arc_parts)
+
+    def _evaluate_run(self, codes, values, value_counts, integral, line_parts, arc_parts):
+        """Kalem komutları ve dairelerden (CI) oluşan grubu toplu olarak işle
+
+        CI kalemi hareket ettirmez: daireler çıkarılıp kalan komutlar
+        yorumlanır, her dairenin merkezi kendinden önceki komutların
+        bıraktığı kalem konumudur.
+        """
+        is_circle = codes == CI
+        if not is_circle.any():
+            line_parts.append(self._evaluate_lines(codes, values, value_counts, integral))
+            return
+
+        is_line = ~is_circle
+        circle_values = np.repeat(is_circle, value_counts)
+        value_starts = np.cumsum(value_counts) - value_counts
+        segments, center_x, center_y, pens = self._evaluate_lines(
+            codes[is_line], values[~circle_values], value_counts[is_line], integral,
+            marks=np.cumsum(is_line)[is_circle])
+        line_parts.append(segments)
+
+        # Yarıçap CI'nın ilk parametresi; parametresiz veya sıfır yarıçaplı daireler atlanır
+        radius = np.where(value_counts[is_circle] > 0,
+                          np.append(values, 0.0)[np.minimum(value_starts[is_circle], len(values))], 0.0)
+        drawn = radius != 0
+        circles = np.zeros((int(drawn.sum()), 5))
+        circles[:, 0] = center_x[drawn]
+        circles[:, 1] = center_y[drawn]
+        circles[:, 2] = np.abs(radius[drawn])
+        circles[:, 4] = 2 * np.pi
+        arc_parts.append(ArcStore(circles, pens[drawn]))
+
+    def _evaluate_arc(self, code, params, line_parts, arc_parts):
+        """Kalemi hareket ettiren tek bir yay komutunu işle
+
+        Yay arc_parts'a, düz çizgiye dönüşen yay line_parts'a eklenir.
+        AA/AR: merkez (mutlak/göreli) ve derece cinsinden tarama açısı,
+        yay kalemin bulunduğu noktadan başlar. AT/RT: ara nokta ve bitiş
+        noktasından geçen üç noktalı yay. Kiriş toleransı parametreleri yok
+        sayılır, yaylar PDF'e gerçek eğri olarak yazılır.
+        """
+        x, y = self.x, self.y
+        if code in (AA, AR):
+            if len(params) < 3:
+                return
+            center_x, center_y, sweep_degrees = params[:3]
+            if code == AR:
+                center_x += x
+                center_y += y
+            radius = math.hypot(x - center_x, y - center_y)
+            sweep = math.radians(max(-360.0, min(360.0, sweep_degrees)))
+            if not radius or not sweep:
+                return
+            start_angle = math.atan2(y - center_y, x - center_x)
+            end_angle = start_angle + sweep
+            self.x = center_x + radius * math.cos(end_angle)
+            self.y = center_y + radius * math.sin(end_angle)
+            if self.pen_down:
+                arc_parts.append(ArcStore([center_x, center_y, radius, start_angle, sweep], [self.pen]))
+            return
+
+        if len(params) < 4:
+            return
+        mid_x, mid_y, end_x, end_y = params[:4]
+        if code == RT:
+            mid_x, mid_y, end_x, end_y = mid_x + x, mid_y + y, end_x + x, end_y + y
+        self.x, self.y = end_x, end_y
+        if not self.pen_down:
+            return
+        arc = _three_point_arc(x, y, mid_x, mid_y, end_x, end_y)
+        if arc is not None:
+            arc_parts.append(ArcStore(arc, [self.pen]))
+        elif (end_x, end_y) != (x, y):
+            # Üç nokta aynı doğru üzerinde: düz çizgi
+            line_parts.append(SegmentStore([x, y, end_x, end_y], pens=[self.pen]))
+
+    def _evaluate_lines(self, codes, values, value_counts, integral=False, marks=None):
+        """Kalem komutlarının (PU/PD/PA/PR/IN/SP) segmentlerini toplu olarak üret
+
+        marks verilirse (her biri o ana kadar işlenmiş komut sayısı) o
+        anlardaki kalem konumları ve seçili kalemler de döner:
+        (segmentler, x'ler, y'ler, kalemler).
+        """
+        if not len(codes):
+            if marks is not None:
+                return (SegmentStore(), np.full(len(marks), self.x), np.full(len(marks), self.y),
+                        np.full(len(marks), self.pen, dtype=PEN_DTYPE))
+            return SegmentStore()
+        pairs = value_counts // 2
+
+        # Her komuttan sonraki kalem durumu (PA/PR durumu değiştirmez)
+        sets_pen = (codes == PU) | (codes == PD) | (codes == IN)
+        last_setter = np.maximum.accumulate(np.where(sets_pen, np.arange(len(codes)), -1))
+        pen_state = np.where(last_setter >= 0, codes[np.maximum(last_setter, 0)] == PD, self.pen_down)
+
+        # Komut başına nokta sayısı: PU sadece ilk çifti, IN (0, 0) noktasını kullanır, SP hareket etmez
+        point_counts = pairs.copy()
+        point_counts[codes == PU] = np.minimum(pairs[codes == PU], 1)
+        point_counts[codes == IN] = 1
+        point_counts[codes == SP] = 0
+
+        value_starts = np.zeros(len(codes), dtype=np.int64)
+        np.cumsum(value_counts[:-1], out=value_starts[1:])
+
+        # Her komuttan sonraki seçili kalem; parametresiz SP kalemi bırakır (kalem 0)
+        selects = np.flatnonzero(codes == SP)
+        if len(selects):
+            selected = np.where(value_counts[selects] > 0,
+                                np.append(values, 0.0)[np.minimum(value_starts[selects], len(values))], 0.0)
+            selected = np.clip(np.trunc(selected), 0, _MAX_PEN).astype(PEN_DTYPE)
+            last_select = np.searchsorted(selects, np.arange(len(codes)), side='right') - 1
+            pen_of = np.where(last_select >= 0, selected[np.maximum(last_select, 0)], self.pen).astype(PEN_DTYPE)
+        else:
+            pen_of = None
+        point_starts = np.zeros(len(codes), dtype=np.int64)
+        np.cumsum(point_counts[:-1], out=point_starts[1:])
+
+        point_cmd = np.repeat(np.arange(len(codes)), point_counts)
+        point_codes = codes[point_cmd]
+        pair_index = np.arange(len(point_cmd)) - point_starts[point_cmd]
+
+        # IN noktaları sonda eklenen (0, 0) çiftini gösterir
+        padded = np.append(values, (0.0, 0.0))
+        value_index = value_starts[point_cmd] + 2 * pair_index
+        value_index[point_codes == IN] = len(values)
+        point_values = np.stack((padded[value_index], padded[value_index + 1]), axis=1)
+
+        relative = point_codes == PR
+        draws = (point_codes == PD) | (((point_codes == PA) | relative) & pen_state[point_cmd])
+
+        xs, ys = _accumulate_positions(point_values, relative, self.x, self.y, integral)
+
+        prev_x = np.empty_like(xs)
+        prev_y = np.empty_like(ys)
+        if len(xs):
+            prev_x[0], prev_y[0] = self.x, self.y
+            prev_x[1:], prev_y[1:] = xs[:-1], ys[:-1]
+        segment_pens = None if pen_of is None else pen_of[point_cmd[draws]]
+        if segment_pens is None and self.pen != DEFAULT_PEN:
+            segment_pens = np.full(int(draws.sum()), self.pen, dtype=PEN_DTYPE)
+        segments = SegmentStore(np.stack((prev_x[draws], prev_y[draws], xs[draws], ys[draws]), axis=1),
+                                pens=segment_pens)
+
+        if marks is not None:
+            # İşaretten önceki son nokta (hiç nokta yoksa başlangıç konumu)
+            points_before = np.append(0, np.cumsum(point_counts))[marks]
+            mark_x = np.append(self.x, xs)[points_before]
+            mark_y = np.append(self.y, ys)[points_before]
+            if pen_of is None:
+                mark_pens = np.full(len(marks), self.pen, dtype=PEN_DTYPE)
+            else:
+                mark_pens = np.append(np.array([self.pen], dtype=PEN_DTYPE), pen_of)[marks]
+        if len(xs):
+            self.x, self.y = float(xs[-1]), float(ys[-1])
+        self.pen_down = bool(pen_state[-1])
+        if pen_of is not None:
+            self.pen = int(pen_of[-1])
+
+        if marks is not None:
+            return segments, mark_x, mark_y, mark_pens
+        return segments
+
+
+def iter_geometry_batches(commands, batch_size=BATCH_SIZE):
+    """Komut akışını gruplar halinde işleyip her grubun (segmentler, yaylar) çiftini üret"""
+    interpreter = HPGLInterpreter()
+    commands = iter(commands)
+    while True:
+        batch = list(islice(commands, batch_size))
+        if not batch:
+            break
+        segments, arcs = interpreter.feed(batch)
+        if len(segments) or len(arcs):
+            yield segments, arcs
+
+
+def _merge_geometry(batches):
+    """(segmentler, yaylar) gruplarını tek bir (SegmentStore, ArcStore) çiftinde birleştir"""
+    return (SegmentStore.concatenate(segments for segments, _ in batches),
+            ArcStore.concatenate(arcs for _, arcs in batches))
+
+
+def interpret(commands, batch_size=BATCH_SIZE):
+    """Tüm komut akışını tek bir (SegmentStore, ArcStore) çiftine çevir"""
+    return _merge_geometry(list(iter_geometry_batches(commands, batch_size)))
+
+
+def _split_point(buffer):
+    """Tamponda tamamlanmış komutların bittiği konumu bul
+
+    Son komut (parametreleri sonraki parçada devam edebileceği için) ve
+    sonda eşlenmemiş tek büyük harf bir sonraki parçaya bırakılır. ';' ile
+    bitmemiş bir PE komutu, başından itibaren sonraki parçaya kalır.
+    """
+    start = 0
+    found = find_polyline_encoded(buffer)
+    while found is not None:
+        command_start, payload_end = found
+        if payload_end < 0:
+            return command_start
+        start = payload_end + 1
+        found = find_polyline_encoded(buffer, start)
+    if start:
+        return start + _split_point(buffer[start:])
+
+    m = _TRAILING_RUN.match(buffer[::-1])
+    if m is None:
+        return len(buffer)
+    run_end = len(buffer) - len(m.group(1))
+    run_length = len(m.group(2))
+    if run_length % 2 == 0:
+        return run_end - 2
+    if run_end == len(buffer):
+        return run_end - 1
+    return len(buffer)
+
+
+def _strip_polyline_encoded(chunks, payloads):
+    """Bayt parçalarındaki PE parametrelerini ayırıp kalan baytları üret
+
+    Her PE komutu akışta "PE;" olarak kalır; ';' ile sonlanan (bayt)
+    parametreleri, "PE;" üretilmeden önce payloads kuyruğuna eklenir.
+    8 bitlik PE basamakları böylece metne çevrilmeden korunur.
+    """
+    pending = b''  # Parça sonundaki, PE komutunun başı olabilecek büyük harfler
+    open_payload = []  # Sonlandırıcısı (';') henüz okunmamış PE parametreleri
+    for chunk in chunks:
+        data = chunk.translate(None, _WHITESPACE)
+        if open_payload:
+            end = data.find(b';')
+            if end < 0:
+                open_payload.append(data)
+                continue
+            open_payload.append(data[:end + 1])
+            payloads.append(b''.join(open_payload))
+            open_payload = []
+            yield b'PE;'
+            data = data[end + 1:]
+
+        buffer = pending + data
+        position = 0
+        found = find_polyline_encoded(buffer)
+        while found is not None:
+            command_start, payload_end = found
+            yield buffer[position:command_start]
+            if payload_end < 0:
+                open_payload = [buffer[command_start + 2:]]
+                position = len(buffer)
+                break
+            payloads.append(buffer[command_start + 2:payload_end + 1])
+            yield b'PE;'
+            position = payload_end + 1
+            found = find_polyline_encoded(buffer, position)
+        rest = buffer[position:]
+        keep = len(_TRAILING_LETTERS.search(rest).group())
+        pending = rest[len(rest) - keep:]
+        yield rest[:len(rest) - keep]
+    if open_payload:
+        payloads.append(b''.join(open_payload) + b';')
+        yield b'PE;'
+    yield pending
+
+
+def iter_file_geometry_batches(plt_file, chunk_size=CHUNK_SIZE, stats=NO_STATS, data=None):
+    """PLT dosyasını (mmap üzerinden) bayt parçaları halinde okuyup her parçanın (segmentler, yaylar) çiftini üret
+
+    stats verilirse okuma/ayrıştırma aşamaları ölçülür; üretilen her grup
+    kullanıldıktan sonra çağıran taraf kendi aşamasını lap() ile kapatmalıdır.
+    data: önceden okunmuş dosya içeriği (verilirse dosya tekrar okunmaz).
+    """
+    interpreter = HPGLInterpreter()
+    chunks = iter_file_chunks(plt_file, chunk_size, data)
+    carry = b''
+    pending_pe = []  # Sonlandırıcısı (';') henüz okunmamış PE komutunun parçaları
+    while True:
+        chunk = next(chunks, b'')
+        data = chunk.translate(None, _WHITESPACE)
+        stats.count('bytes_read', len(chunk))
+        if pending_pe and chunk and b';' not in data:
+            # Uzun PE komutu sürüyor: parçalar biriktirilir, tampon tekrar taranmaz
+            pending_pe.append(data)
+            stats.lap('read')
+            continue
+        buffer = b''.join(pending_pe) + carry + data
+        pending_pe = []
+        if not chunk:
+            head, carry = buffer, b''
+        else:
+            split = _split_point(buffer)
+            head, carry = buffer[:split], buffer[split:]
+            if carry.startswith(b'PE'):
+                pending_pe, carry = [carry], b''
+        stats.lap('read')
+
+        if len(carry) > _MAX_CARRY_CHUNKS * chunk_size:
+            # Tek bir komut çok uzun: kalan dosyayı akış halinde komut komut işle
+            # PE parametreleri bayt olarak ayrılır (8 bitlik basamaklar metne çevrilemez)
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+            payloads = deque()
+            byte_chunks = _strip_polyline_encoded(chain([head, carry], chunks), payloads)
+            text_chunks = (decoder.decode(c) for c in byte_chunks)
+            commands = tokenize_chunks(chain(text_chunks, [decoder.decode(b'', final=True)]))
+            for batch in iter(lambda: list(islice(commands, BATCH_SIZE)), []):
+                stats.lap('tokenize')
+                pe_count = sum(cmd == 'PE' for cmd, _ in batch)
+                batch_payloads = b''.join(payloads.popleft() for _ in range(pe_count)) if pe_count else None
+                segments, arcs = interpreter.feed(batch, stats, batch_payloads)
+                if len(segments) or len(arcs):
+                    yield segments, arcs
+            return
+
+        segments, arcs = interpreter.feed_buffer(head, stats)
+        if len(segments) or len(arcs):
+            yield segments, arcs
+        if not chunk:
+            break
+
+
+def interpret_file(plt_file, chunk_size=CHUNK_SIZE, stats=NO_STATS, data=None):
+    """PLT dosyasının tüm geometrisini tek bir (SegmentStore, ArcStore) çifti olarak döndür"""
+    geometry = _merge_geometry(list(iter_file_geometry_batches(plt_file, chunk_size, stats, data)))
+    stats.lap('evaluate')
+    return geometry
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+HPGL (PLT) komut ayrıştırıcı
+Dosyayı bellek eşlemeli (mmap) parçalar halinde okur, komutları
+(komut, parametreler) olarak tek tek üretir. HPGL/2 PE (Polyline
+Encoded) komutlarının sıkıştırılmış koordinatlarını da çözer.
+"""
+
+import codecs
+import mmap
+import re
+from itertools import chain
+
+import numpy as np
+
+
+# Okuma parça boyutu (bayt)
+CHUNK_SIZE = 1 << 20  # 1 MB
+
+# Ayrıştırmadan önce silinen karakterler (satır sonları ve boşluklar)
+_STRIP_TABLE = str.maketrans('', '', '\n\r ')
+
+# HPGL komutlarını bul - 2 harfli komut + parametreler
+COMMAND_PATTERN = re.compile(r'([A-Z]{2})([^A-Z]*)')
+
+# PE komutunun parametreleri büyük harf içerebilir, ';' ile biter
+_TOKEN_PATTERN = re.compile(r'(PE)([^;]*;?)|([A-Z]{2})([^A-Z]*)')
+
+# Bir önceki parçada yarım kalan parametrelerin devamı
+_PARAMS_PATTERN = re.compile(r'[^A-Z]*')
+_PE_PARAMS_PATTERN = re.compile(r'[^;]*;?')
+
+# Bayt tamponunda büyük harf dizisinin çift konumunda başlayan (komut olan) ilk PE
+_PE_COMMAND = re.compile(rb'(?<![A-Z])(?:[A-Z]{2})*?PE')
+
+# PE bayrakları
+_PE_PEN, _PE_PEN_UP, _PE_ABSOLUTE, _PE_FRACTION, _PE_SEVEN_BIT = b':<=>7'
+
+
+def map_file(f):
+    """İkili modda açık dosyayı salt okunur mmap olarak eşle
+
+    Boş veya eşlenemeyen dosyalarda (ör. boru) içerik bytes olarak döner.
+    """
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        return f.read()
+
+
+def iter_file_chunks(plt_file, chunk_size=CHUNK_SIZE, data=None):
+    """Dosyayı mmap üzerinden bayt parçaları halinde üret
+
+    data: önceden okunmuş dosya içeriği (verilirse dosya tekrar okunmaz).
+    """
+    if data is not None:
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+        return
+    with open(plt_file, 'rb') as f:
+        buffer = map_file(f)
+        try:
+            for start in range(0, len(buffer), chunk_size):
+                yield buffer[start:start + chunk_size]
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+
+
+def iter_commands(plt_file, chunk_size=CHUNK_SIZE, data=None):
+    """PLT dosyasını parça parça oku ve (komut, parametreler) çiftlerini üret
+
+    Sonuç, tüm dosyayı okuyup boşlukları silip
+    re.findall(r'([A-Z]{2})([^A-Z]*)') çalıştırmakla birebir aynıdır;
+    parça sınırında bölünen komutlar bir sonraki parçayla birleştirilir.
+    Parçalar mmap'ten alınır ve artımlı UTF-8 çözücüyle metne çevrilir
+    (metin modundaki satır sonu çevirisi ve ara tampon kopyaları olmadan).
+    data verilirse dosya yerine bu baytlar okunur.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    text_chunks = (decoder.decode(chunk) for chunk in iter_file_chunks(plt_file, chunk_size, data))
+    yield from tokenize_chunks(chain(text_chunks, [decoder.decode(b'', final=True)]))
+
+
+def tokenize_chunks(chunks):
+    """Metin parçalarından oluşan akışı (komut, parametreler) çiftlerine ayır
+
+    PE komutunun parametreleri (büyük harfler dahil) ';' karakterine kadar
+    sürer ve sonlandırıcıyla birlikte tek parça olarak döner.
+    """
+    pending_cmd = None  # Parametreleri parça sonuna kadar uzanan komut
+    pending_parts = []
+    carry = ''  # Parça sonunda eşlenmemiş tek büyük harf
+
+    for chunk in chunks:
+        text = carry + chunk.translate(_STRIP_TABLE)
+        carry = ''
+        if not text:
+            continue
+
+        if pending_cmd is not None:
+            if pending_cmd == 'PE':
+                m = _PE_PARAMS_PATTERN.match(text)
+                finished = m.group().endswith(';')
+            else:
+                m = _PARAMS_PATTERN.match(text)
+                finished = m.end() < len(text)
+            pending_parts.append(m.group())
+            if not finished:
+                # Parametreler bu parçada da bitmedi
+                continue
+            yield pending_cmd, ''.join(pending_parts)
+            pending_cmd = None
+            pending_parts = []
+            text = text[m.end():]
+
+        last_end = 0
+        for m in _TOKEN_PATTERN.finditer(text):
+            if m.group(1):
+                cmd, params = m.group(1), m.group(2)
+                finished = params.endswith(';')
+            else:
+                cmd, params = m.group(3), m.group(4)
+                finished = m.end() < len(text)
+            if not finished:
+                # Son komutun parametreleri sonraki parçada devam edebilir
+                pending_cmd = cmd
+                pending_parts = [params]
+                break
+            yield cmd, params
+            last_end = m.end()
+        else:
+            # Sonda kalan tek büyük harf sonraki parçanın ilk harfiyle komut olabilir
+            if len(text) > last_end and 'A' <= text[-1] <= 'Z':
+                carry = text[-1]
+
+    if pending_cmd is not None:
+        yield pending_cmd, ''.join(pending_parts)
+
+
+def find_polyline_encoded(buffer, start=0):
+    """Bayt tamponunda start'tan sonraki ilk PE komutunu bul
+
+    (komut başlangıcı, parametre sonu) döner; parametre sonu ';'
+    karakterinin konumudur, ';' yoksa -1. PE yoksa None döner.
+    """
+    if buffer.find(b'PE', start) < 0:
+        return None
+    m = _PE_COMMAND.search(buffer, start)
+    if m is None:
+        return None
+    return m.end() - 2, buffer.find(b';', m.end())
+
+
+def split_polyline_encoded(buffer):
+    """Tampondaki PE komutlarının parametrelerini ayır
+
+    (PE parametreleri boşaltılmış komutlar, ';' ile sonlanan PE
+    parametreleri) döner; her PE komutu yerinde "PE;" olarak kalır.
+    """
+    plain, payloads = [], []
+    position = 0
+    found = find_polyline_encoded(buffer)
+    while found is not None:
+        command_start, payload_end = found
+        if payload_end < 0:
+            payload_end = len(buffer)
+        plain += [buffer[position:command_start + 2], b';']
+        payloads += [buffer[command_start + 2:payload_end], b';']
+        position = payload_end + 1
+        found = find_polyline_encoded(buffer, position)
+    plain.append(buffer[position:])
+    return b''.join(plain), b''.join(payloads)
+
+
+def _block_start_values(values, separators):
+    """Her konum için, içinde bulunduğu bloğun başındaki değer (bloklar ';' ile ayrılır)"""
+    last_separator = np.maximum.accumulate(np.where(separators, np.arange(len(values)), -1))
+    return np.where(last_separator >= 0, values[np.maximum(last_separator, 0)], 0)
+
+
+def decode_polyline_encoded(data):
+    """';' ile sonlanan bir veya daha fazla PE parametre bloğunu birlikte çöz
+
+    (noktalar (N, 2), kalem kalkık mı, mutlak mı, blok başına nokta
+    sayısı, kalem seçimleri) döner; kalem seçimleri (kalem numaraları,
+    blokları, seçimden sonraki ilk noktanın indeksi) dizileridir (seçim
+    bloğun son noktasından sonraysa indeks bloğun sonudur). Sayılar en düşük basamaktan başlayarak yazılır: 8
+    bitlik modda 63-126 arası baytlar devam, 191-254 arası son basamaktır
+    (6 bit); '7' bayrağından sonra 63-94 devam, 95-126 son basamaktır (5
+    bit). En düşük bit işarettir. Bayraklar: ':' kalem seçimi ve '>' kesir
+    bit sayısı (bir sayı parametre alır), '<' sonraki noktada kalem kalkık,
+    '=' sonraki nokta mutlak (varsayılan: göreli, kalem inik). Bayraklar
+    ve mod kendi bloğunda geçerlidir; tüm bloklar dizi işlemleriyle
+    birlikte çözülür.
+    """
+    chars = np.frombuffer(data, dtype=np.uint8)
+    separators = chars == ord(';')
+    block_count = int(separators.sum())
+    block_of = np.cumsum(separators) - separators
+
+    sevens = np.cumsum(chars == _PE_SEVEN_BIT)
+    seven_bit = sevens > _block_start_values(sevens, separators)
+    is_digit = (chars >= 63) & ((chars <= 126) | (~seven_bit & (chars >= 191) & (chars <= 254)))
+    is_last = is_digit & np.where(seven_bit, chars >= 95, chars >= 191)
+
+    # Son basamağı kendi bloğunda olmayan (yarım kalmış) sayılar atılır
+    digit_pos = np.flatnonzero(is_digit)
+    last_digit = is_last[digit_pos]
+    following_last = np.minimum.accumulate(
+        np.where(last_digit, np.arange(len(digit_pos)), len(digit_pos))[::-1])[::-1]
+    closing_pos = np.append(digit_pos, len(chars))[following_last]
+    complete = closing_pos < len(chars)
+    complete[complete] = block_of[closing_pos[complete]] == block_of[digit_pos[complete]]
+    digit_pos, last_digit = digit_pos[complete], last_digit[complete]
+
+    # Basamak değerleri, sayı içindeki bit kaydırmalarıyla toplanır
+    digit_seven = seven_bit[digit_pos]
+    digits = chars[digit_pos].astype(np.int64) - np.where(last_digit, np.where(digit_seven, 95, 191), 63)
+    bits = np.where(digit_seven, 5, 6)
+    first_digit = np.flatnonzero(np.concatenate(([True], last_digit[:-1]))[:len(last_digit)])
+    number_of_digit = np.cumsum(last_digit) - last_digit
+    bit_offsets = np.cumsum(bits) - bits
+    shifts = np.minimum(bit_offsets - bit_offsets[first_digit][number_of_digit], 62)
+    raw = np.add.reduceat(digits << shifts, first_digit) if len(first_digit) else np.empty(0, dtype=np.int64)
+    numbers = np.where(raw & 1, -(raw >> 1), raw >> 1).astype(np.float64)
+    number_pos = digit_pos[last_digit]
+    number_block = block_of[number_pos]
+
+    # Parametreli bayraklardan (':' ve '>') hemen sonraki sayı bayrağın değeridir
+    flag_pos = np.flatnonzero((chars == _PE_PEN) | (chars == _PE_FRACTION))
+    flag_number = np.searchsorted(number_pos, flag_pos)
+    has_value = flag_number < len(numbers)
+    has_value[has_value] = number_block[flag_number[has_value]] == block_of[flag_pos[has_value]]
+    flag_pos, flag_number = flag_pos[has_value], flag_number[has_value]
+    is_coordinate = np.ones(len(numbers), dtype=bool)
+    is_coordinate[flag_number] = False
+
+    # Koordinatlar blok içinde çiftlenir; tek kalan son koordinat atılır
+    coordinates = numbers[is_coordinate]
+    coordinate_pos = number_pos[is_coordinate]
+    coordinate_block = number_block[is_coordinate]
+    per_block = np.bincount(coordinate_block, minlength=block_count)
+    block_first = np.cumsum(per_block) - per_block
+    ordinal = np.arange(len(coordinates)) - block_first[coordinate_block]
+    paired = ordinal < (per_block // 2 * 2)[coordinate_block]
+    points = coordinates[paired].reshape(-1, 2)
+    pair_pos = coordinate_pos[paired][0::2]
+    pair_block = coordinate_block[paired][0::2]
+
+    def flagged_pairs(flag):
+        """Bayrağın etkilediği noktalar: aynı bloktaki bir sonraki nokta"""
+        marked = np.zeros(len(points), dtype=bool)
+        positions = np.flatnonzero(chars == flag)
+        targets = np.searchsorted(pair_pos, positions)
+        valid = targets < len(points)
+        valid[valid] = pair_block[targets[valid]] == block_of[positions[valid]]
+        marked[targets[valid]] = True
+        return marked
+
+    # Kesir bit sayısı, aynı blokta noktadan önceki son '>' bayrağının değeridir
+    is_fraction = chars[flag_pos] == _PE_FRACTION
+    fraction_pos = flag_pos[is_fraction]
+    fraction_bits = np.append(0.0, numbers[flag_number[is_fraction]])
+    fraction_block = np.append(-1, block_of[fraction_pos])
+    previous = np.searchsorted(fraction_pos, pair_pos)
+    previous[fraction_block[previous] != pair_block] = 0
+    if previous.any():
+        points = points / (2.0 ** fraction_bits[previous])[:, None]
+
+    # Kalem seçimi, aynı bloktaki bir sonraki noktadan (yoksa blok sonundan) itibaren geçerlidir
+    pair_counts = np.bincount(pair_block, minlength=block_count)
+    is_pen = ~is_fraction
+    select_block = block_of[flag_pos[is_pen]]
+    select_point = np.minimum(np.searchsorted(pair_pos, flag_pos[is_pen]), np.cumsum(pair_counts)[select_block])
+    pen_selects = (numbers[flag_number[is_pen]], select_block, select_point)
+    return points, flagged_pairs(_PE_PEN_UP), flagged_pairs(_PE_ABSOLUTE), pair_counts, pen_selects
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+output_pdf klasöründeki çıktıların kaydı (manifest)
+Her PDF için kaynak PLT'nin özeti, boyutu, değişim zamanı, dönüştürme
+modu ve ayarları tutulur; değişmemiş dosyalar tekrar dönüştürülmez
+"""
+
+import os
+import json
+import tempfile
+
+from geometry_cache import file_digest
+from hpgl_interpreter import INTERPRETER_VERSION
+from pen_layers import existing_pen_files
+
+
+# Manifest dosyasının adı (output_pdf içinde)
+MANIFEST_FILE = '.manifest.json'
+
+
+class BuildManifest:
+    """Bir dönüştürme modunun (PDF soneki) çıktı kayıtları
+
+    Dosyada modlar ayrı tutulur: {mod: {pdf_adı: kayıt}}; farklı
+    programların kayıtları birbirini ezmez.
+    """
+
+    def __init__(self, output_dir, mode, settings):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.mode = mode
+        self.settings = settings
+        self.entries = self._load().get(mode, {})
+        self._digests = {}
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Manifest yok veya bozuk: her şey yeniden dönüştürülür
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _digest(self, plt_file):
+        if plt_file not in self._digests:
+            self._digests[plt_file] = file_digest(plt_file)
+        return self._digests[plt_file]
+
+    def remember_digest(self, plt_file, digest):
+        """Başka yerde hesaplanmış özeti kullan (kayıt sırasında dosya tekrar okunmaz)"""
+        self._digests[plt_file] = digest
+
+    def is_current(self, plt_file, pdf_filename):
+        """PDF mevcut ve kaynak/ayarlar kayıttakiyle aynı mı"""
+        entry = self.entries.get(pdf_filename)
+        if (entry is None or entry.get('settings') != self.settings
+                or entry.get('interpreter_version') != INTERPRETER_VERSION
+                or entry.get('input') != os.path.basename(plt_file)
+                or not os.path.exists(os.path.join(self.output_dir, pdf_filename))):
+            return False
+
+        stat = os.stat(plt_file)
+        if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return True
+
+        # Boyut/zaman değişmiş ama içerik aynı olabilir (ör. kopyalama)
+        if entry['size'] != stat.st_size or self._digest(plt_file) != entry['sha256']:
+            return False
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return True
+
+    def record(self, plt_file, pdf_filename):
+        """Başarılı dönüştürmeyi kaydet"""
+        stat = os.stat(plt_file)
+        self.entries[pdf_filename] = {
+            'input': os.path.basename(plt_file),
+            'sha256': self._digest(plt_file),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'mode': self.mode,
+            'settings': self.settings,
+            'interpreter_version': INTERPRETER_VERSION,
+        }
+
+    def forget(self, pdf_filename):
+        """Başarısız dönüştürmenin kaydını sil (sonraki çalıştırmada tekrar denenir)"""
+        self.entries.pop(pdf_filename, None)
+
+    def remove_orphans(self, plt_files):
+        """Kaynağı silinmiş çıktıları (ve kalem PDF'lerini) sil, silinen PDF adlarını döndür"""
+        inputs = {os.path.basename(plt_file) for plt_file in plt_files}
+        removed = []
+        for pdf_filename, entry in list(self.entries.items()):
+            if entry.get('input') in inputs:
+                continue
+            pdf_file = os.path.join(self.output_dir, pdf_filename)
+            if os.path.exists(pdf_file):
+                os.remove(pdf_file)
+            for pen_pdf_file in existing_pen_files(pdf_file):
+                os.remove(pen_pdf_file)
+            del self.entries[pdf_filename]
+            removed.append(pdf_filename)
+        return removed
+
+    def save(self):
+        """Bu modun kayıtlarını dosyaya yaz (diğer modlar korunur)"""
+        data = self._load()
+        data[self.mode] = self.entries
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.output_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Çizimi A4 sayfalarına bölerek çizme (A4, overlap ve overlay düzenleri)
+Sayfa döngüsü tüm düzenler için ortaktır; düzenler sadece sayfa adımını,
+her sayfanın çizimdeki penceresini, form kırpma alanını ve sayfa
+süslemelerini (etiket, bilgi, kesikli sınır çizgileri) belirler. Paralel
+sayfa çizimi (--tile-jobs) da pencereleri aynı düzen nesnesinden alır.
+"""
+
+from reportlab.lib.units import mm
+from reportlab.lib.pagesizes import A4
+
+from pdf_render import define_drawing_form, draw_form_tile, draw_geometry, new_canvas
+from pen_layers import write_pen_files
+from spatial_index import SegmentGrid
+from tile_render import clip_tile, render_tiles, select_tile
+
+
+# reportlab biten sayfaları save()'e kadar bellekte tutar; bu kadar sayfa veya
+# segment içeren çok sayfalı işlerde --fast-pdf önerilir
+BUFFERED_WARN_PAGES = 50
+BUFFERED_WARN_SEGMENTS = 1000000
+
+
+class A4Layout:
+    """Bitişik A4 sayfaları: margin sadece çizimin dış kenarlarında"""
+
+    notice = None  # Sayfa ızgarası yazıldıktan sonra gösterilen not
+    footnote = None  # PDF kaydedildikten sonra gösterilen not
+
+    def __init__(self):
+        self.page_width = 210  # mm
+        self.page_height = 297  # mm
+        self.margin = 20  # 2 cm margin
+
+    def step(self):
+        """Komşu sayfaların çizimdeki başlangıçları arasındaki mesafe (mm)"""
+        # Margin sadece dış kenarlarda, ortada değil - bu yüzden tam A4 kullan
+        return self.page_width, self.page_height
+
+    def tile_window(self, row, col, rows, cols):
+        """Sayfanın çizimdeki alanı ve çizimin sayfaya ötelemesi (mm):
+        (başlangıç x, y, bitiş x, y, öteleme x, y)"""
+        page_start_x = col * self.page_width
+        page_start_y = row * self.page_height
+        page_end_x = page_start_x + self.page_width
+        page_end_y = page_start_y + self.page_height
+
+        # Margin hesapla (sadece dış kenarlarda: ilk sütunda sol, son satırda alt)
+        left_margin = self.margin if col == 0 else 0
+        bottom_margin = self.margin if row == rows - 1 else 0
+        return (page_start_x, page_start_y, page_end_x, page_end_y,
+                left_margin - page_start_x, bottom_margin - page_start_y)
+
+    def form_clip(self, window):
+        """Çizim formunun sayfada kırpılacağı dikdörtgen (x, y, genişlik, yükseklik; mm)"""
+        page_start_x, page_start_y, _, _, offset_x, offset_y = window
+        # Sayfanın alanı (margin'ler içinde)
+        return offset_x + page_start_x, offset_y + page_start_y, self.page_width, self.page_height
+
+    def decorate(self, c, row, col, rows, cols, page_count, drawing):
+        """Sayfa etiketi ve bilgi metni"""
+        # Sayfa etiketi (A1, A2, B1, B2 şeklinde)
+        c.setFillColorRGB(0, 0, 0)
+        c.setFont("Helvetica-Bold", 12)
+        page_label = f"{chr(65 + row)}{col + 1}"
+        c.drawString(10 * mm, (self.page_height - 10) * mm, page_label)
+
+        # Bilgi metni
+        c.setFont("Helvetica", 8)
+        info = (f"Sayfa {page_count} | Çizim: {drawing.width_mm:.0f}x{drawing.height_mm:.0f}mm | "
+                f"Grid: {row+1}/{rows}, {col+1}/{cols}")
+        c.drawString(10 * mm, 10 * mm, info)
+
+
+class A4OverlapLayout:
+    """Print ekranı mantığıyla örtüşen tam A4 sayfaları (2 cm overlap)"""
+
+    notice = "2cm overlap ile..."
+    footnote = None
+
+    def __init__(self):
+        self.page_width = 210  # mm
+        self.page_height = 297  # mm
+        self.overlap = 20  # 2 cm overlap
+
+    def step(self):
+        """Komşu sayfaların çizimdeki başlangıçları arasındaki mesafe (mm)"""
+        # Her sayfa overlap kadar daha az ilerler: A4 210mm, overlap 20mm → 190mm
+        return self.page_width - self.overlap, self.page_height - self.overlap
+
+    def tile_window(self, row, col, rows, cols):
+        """Sayfanın çizimdeki alanı ve çizimin sayfaya ötelemesi (mm):
+        (başlangıç x, y, bitiş x, y, öteleme x, y)"""
+        # Her sayfa step kadar ilerler, ama tam A4 gösterir
+        step_width, step_height = self.step()
+        page_start_x = col * step_width
+        page_start_y = row * step_height
+        page_end_x = page_start_x + self.page_width
+        page_end_y = page_start_y + self.page_height
+        return page_start_x, page_start_y, page_end_x, page_end_y, -page_start_x, -page_start_y
+
+    def form_clip(self, window):
+        """Çizim formunun sayfada kırpılacağı dikdörtgen (x, y, genişlik, yükseklik; mm)"""
+        return 0, 0, self.page_width, self.page_height
+
+    def decorate(self, c, row, col, rows, cols, page_count, drawing):
+        """Overlap sınırları, sayfa etiketi ve bilgi metni"""
+        # Overlap sınırlarını kesikli çizgilerle göster
+        c.setStrokeColorRGB(0.7, 0.7, 0.7)
+        c.setLineWidth(0.3)
+        c.setDash([3, 3])
+
+        # Sağda sayfa varsa, sağ kenarda overlap çizgisi
+        if col < cols - 1:
+            x_pos = (self.page_width - self.overlap) * mm
+            c.line(x_pos, 0, x_pos, self.page_height * mm)
+
+        # Altta sayfa varsa, alt kenarda overlap çizgisi
+        if row < rows - 1:
+            y_pos = self.overlap * mm
+            c.line(0, y_pos, self.page_width * mm, y_pos)
+
+        c.setDash()
+
+        # Sayfa etiketi
+        c.setFillColorRGB(0, 0, 0)
+        c.setFont("Helvetica-Bold", 12)
+        page_label = f"{chr(65 + row)}{col + 1}"
+        c.drawString(5 * mm, (self.page_height - 5) * mm, page_label)
+
+        # Bilgi
+        c.setFont("Helvetica", 7)
+        info = f"Sayfa {page_count} | 2cm overlap"
+        c.drawString(5 * mm, 5 * mm, info)
+
+
+class A4OverlayLayout:
+    """Yapıştırma için margin'li ve 2 cm bindirmeli A4 sayfaları"""
+
+    notice = "2cm overlap alanları ekleniyor..."
+    footnote = "Not: Kesikli çizgiler yapıştırma sınırlarını gösterir"
+
+    def __init__(self):
+        self.page_width = 210  # mm
+        self.page_height = 297  # mm
+        self.margin = 20  # 2 cm margin (yapıştırma için kullanılacak)
+        self.overlap = 20  # 2 cm overlap (bindirme alanı)
+
+    def printable_size(self):
+        """Margin'ler içindeki yazdırılabilir alan (mm): 170 x 257"""
+        return self.page_width - (2 * self.margin), self.page_height - (2 * self.margin)
+
+    def step(self):
+        """Komşu sayfaların çizimdeki başlangıçları arasındaki mesafe (mm)"""
+        # Sayfalar arası overlap olduğu için efektif alan overlap kadar küçük: 150 x 237
+        printable_width, printable_height = self.printable_size()
+        return printable_width - self.overlap, printable_height - self.overlap
+
+    def tile_window(self, row, col, rows, cols):
+        """Sayfanın çizimdeki alanı ve çizimin sayfaya ötelemesi (mm):
+        (başlangıç x, y, bitiş x, y, öteleme x, y)"""
+        printable_width, printable_height = self.printable_size()
+        effective_width, effective_height = self.step()
+
+        # Her sayfa effective_width kadar ilerler (overlap hariç)
+        # Ama gösterdiği alan printable_width kadardır (overlap dahil)
+        page_start_x = col * effective_width
+        page_start_y = row * effective_height
+        page_end_x = page_start_x + printable_width
+        page_end_y = page_start_y + printable_height
+        return (page_start_x, page_start_y, page_end_x, page_end_y,
+                self.margin - page_start_x, self.margin - page_start_y)
+
+    def form_clip(self, window):
+        """Çizim formunun sayfada kırpılacağı dikdörtgen (x, y, genişlik, yükseklik; mm)"""
+        # Yazdırılabilir alan
+        return (self.margin, self.margin) + self.printable_size()
+
+    def decorate(self, c, row, col, rows, cols, page_count, drawing):
+        """Yapıştırma sınırları, sayfa etiketi, bilgi metni ve yapıştırma talimatları"""
+        effective_width, effective_height = self.step()
+
+        # Overlap sınırlarını kesikli çizgilerle göster
+        c.setStrokeColorRGB(0.5, 0.5, 0.5)
+        c.setLineWidth(0.3)
+        c.setDash([3, 3])
+
+        # Sağ kenar overlap sınırı (sonraki sayfayla örtüşen alan, 170-20=150mm'de)
+        if col < cols - 1:
+            x_pos = (self.margin + effective_width) * mm
+            c.line(x_pos, self.margin * mm, x_pos, (self.page_height - self.margin) * mm)
+
+        # Alt kenar overlap sınırı (sonraki sayfayla örtüşen alan)
+        if row < rows - 1:
+            y_pos = (self.margin + effective_height) * mm
+            c.line(self.margin * mm, y_pos, (self.page_width - self.margin) * mm, y_pos)
+
+        c.setDash()  # Reset
+
+        # Sayfa etiketi (A1, A2, B1, B2 şeklinde)
+        c.setFillColorRGB(0, 0, 0)
+        c.setFont("Helvetica-Bold", 12)
+        page_label = f"{chr(65 + row)}{col + 1}"
+        c.drawString(10 * mm, (self.page_height - 10) * mm, page_label)
+
+        # Bilgi metni
+        c.setFont("Helvetica", 8)
+        info = f"Sayfa {page_count} | Çizim: {drawing.width_mm:.0f}x{drawing.height_mm:.0f}mm | 2cm overlap"
+        c.drawString(10 * mm, 10 * mm, info)
+
+        # Yapıştırma talimatları
+        c.setFont("Helvetica", 6)
+        instructions = []
+        if col < cols - 1:
+            instructions.append(f"Sağ: {chr(65 + row)}{col + 2} ile yapıştır")
+        if row < rows - 1:
+            instructions.append(f"Alt: {chr(65 + row + 1)}{col + 1} ile yapıştır")
+
+        if instructions:
+            c.drawString(10 * mm, 15 * mm, " | ".join(instructions))
+
+
+def grid_size(layout, width_mm, height_mm):
+    """Çizimi kaplayan sayfa ızgarası: (satır, sütun)"""
+    step_width, step_height = layout.step()
+    cols = int((width_mm + step_width - 1) / step_width)
+    rows = int((height_mm + step_height - 1) / step_height)
+    return rows, cols
+
+
+def render_pages(converter, drawing, layout):
+    """Ayrıştırılmış çizimi düzenin A4 sayfalarına bölerek dönüştürücünün PDF'ine yaz
+
+    Dönüştürücünün seçenekleri (use_form, fast_pdf, tile_jobs, split_pens)
+    ve istatistikleri kullanılır. Boş sayfalar atlanır.
+    """
+    stats = converter.stats
+    normalized_lines = drawing.segments
+    normalized_arcs = drawing.arcs
+    rows, cols = grid_size(layout, drawing.width_mm, drawing.height_mm)
+
+    # Segmentleri sayfa adımı boyutunda hücrelere bir kez dağıt
+    line_index = SegmentGrid(normalized_lines, *layout.step())
+    stats.lap('index')
+
+    print(f"A4 grid: {rows} satır x {cols} sütun = {rows * cols} sayfa")
+    if layout.notice:
+        print(layout.notice)
+    if not converter.fast_pdf and rows * cols > 1 and \
+            (rows * cols >= BUFFERED_WARN_PAGES or len(normalized_lines) >= BUFFERED_WARN_SEGMENTS):
+        print(f"Uyarı: reportlab {rows * cols} sayfanın tamamını kaydedene kadar bellekte tutar; "
+              f"büyük çok sayfalı işlerde --fast-pdf sayfaları bittikçe dosyaya yazar")
+
+    # PDF oluştur
+    c = new_canvas(converter.pdf_file, A4, converter.fast_pdf)
+    stats.lap('setup')
+
+    if converter.use_form:
+        # Tüm çizim bir kez yazılır, sayfalar bu forma referans verir
+        define_drawing_form(c, normalized_lines, normalized_arcs, drawing.width_mm, drawing.height_mm)
+        stats.lap('form')
+    page_count = 0
+
+    tile_results = None
+    if converter.tile_jobs > 1 and not converter.use_form:
+        # Sayfaların çizim içerikleri işçi süreçlerde sayfa sırasıyla üretilir
+        print(f"Sayfalar {converter.tile_jobs} paralel süreçte çiziliyor")
+        tile_results = render_tiles(line_index, normalized_arcs, layout, rows, cols, converter.tile_jobs)
+
+    for row in range(rows):
+        for col in range(cols):
+            # Bu sayfada gösterilecek alan
+            window = layout.tile_window(row, col, rows, cols)
+            offset_x, offset_y = window[4:]
+
+            # Bu sayfadaki çizgileri ve yayları filtrele
+            if tile_results is None:
+                page_lines, page_arcs = select_tile(line_index, normalized_arcs, window)
+                selected_count = len(page_lines) + len(page_arcs)
+            else:
+                selected_count, drawn_count, content = next(tile_results)
+            stats.count('tiles_visited')
+            stats.lap('tile_filter')
+
+            # Boş sayfa atlama
+            if not selected_count:
+                stats.count('empty_tiles_skipped')
+                continue
+
+            page_count += 1
+
+            # Çizgileri çiz
+            c.setStrokeColorRGB(0, 0, 0)
+            c.setLineWidth(0.5)
+            c.setLineCap(1)
+            c.setLineJoin(1)
+
+            if converter.use_form:
+                # Ortak çizim formunu düzenin kırpma alanına yerleştir
+                draw_form_tile(c, offset_x, offset_y, *layout.form_clip(window))
+                stats.add_page(selected_count)
+            elif tile_results is not None:
+                # İşçide kırpılıp hazırlanmış içerik olduğu gibi eklenir
+                if content:
+                    c.draw_compressed(content)
+                stats.add_page(drawn_count)
+            else:
+                # Sadece sayfada görünen kısımları çiz
+                page_lines, page_arcs = clip_tile(page_lines, page_arcs, window,
+                                                  layout.page_width, layout.page_height)
+                stats.lap('clip')
+                draw_geometry(c, page_lines, page_arcs, offset_x, offset_y)
+                stats.add_page(len(page_lines) + len(page_arcs))
+            stats.lap('draw')
+
+            layout.decorate(c, row, col, rows, cols, page_count, drawing)
+            c.showPage()
+            stats.lap('page_layout')
+
+    c.save()
+    stats.lap('save')
+    print(f"{page_count} sayfalık PDF başarıyla oluşturuldu: {converter.pdf_file}")
+    if layout.footnote:
+        print(layout.footnote)
+    if converter.split_pens:
+        # Her kalem aynı çizimden ayrı bir PDF'e yazılır (tekrar ayrıştırılmaz)
+        return write_pen_files(converter, drawing)
+    return True
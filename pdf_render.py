@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Segmentleri PDF'e çizme yardımcıları
+Ardışık bağlı segmentler tek bir çoklu çizgiye (polyline) birleştirilir ve
+sayfadaki tüm çoklu çizgiler tek bir path nesnesi olarak çizilir. Yaylar
+kübik Bézier eğrileriyle ayrı bir path olarak çizilir. Birden fazla kalem
+(SP) varsa geometri kaleme göre gruplanır: her kalem için bir renk/kalınlık
+değişikliği ve bir path yazılır.
+"""
+
+import numpy as np
+from reportlab.pdfgen import canvas
+from reportlab.lib.units import mm
+
+from pdf_writer import PDFWriter
+from pen_layers import pen_style
+from segment_store import DEFAULT_PEN
+
+
+# Sayfa kenarından taşan kısım kırpılırken bırakılan pay (mm)
+# Yuvarlak uçlu 0.5pt çizgilerin kenarda görünür farkı olmaması için
+CLIP_PAD_MM = 1.0
+
+# Tüm çizimi bir kez tutan PDF formunun (Form XObject) adı
+DRAWING_FORM = 'Drawing'
+
+
+def new_canvas(pdf_file, pagesize, fast_pdf=False):
+    """PDF çıktısı başlat: reportlab Canvas veya hızlı PDFWriter (fast_pdf)"""
+    if fast_pdf:
+        return PDFWriter(pdf_file, pagesize)
+    return canvas.Canvas(pdf_file, pagesize=pagesize)
+
+
+def polyline_points(segments):
+    """Bağlı segmentleri çoklu çizgilere çevir
+
+    Bir segmentin başlangıcı bir öncekinin bitişiyle aynıysa ve kalemleri
+    aynıysa ikisi aynı çoklu çizgidedir. (her çoklu çizginin ilk nokta
+    indeksi, noktalar) döner.
+    """
+    data = segments.data
+    if not len(data):
+        return np.empty(0, dtype=np.int64), np.empty((0, 2))
+
+    pens = segments.pens
+    is_start = np.ones(len(data), dtype=bool)
+    is_start[1:] = (data[1:, 0] != data[:-1, 2]) | (data[1:, 1] != data[:-1, 3]) | (pens[1:] != pens[:-1])
+    segment_starts = np.flatnonzero(is_start)
+    polyline_of_segment = np.cumsum(is_start) - 1
+
+    # Her çoklu çizgi: ilk segmentin başlangıcı + tüm segmentlerin bitişleri
+    point_starts = segment_starts + np.arange(len(segment_starts))
+    points = np.empty((len(data) + len(segment_starts), 2))
+    points[point_starts] = data[segment_starts, :2]
+    points[np.arange(len(data)) + polyline_of_segment + 1] = data[:, 2:]
+    return point_starts, points
+
+
+def clip_to_page(segments, offset_x, offset_y, page_width, page_height):
+    """Segmentleri (veya yayları) sayfanın görünen alanına kırp
+
+    offset_x/offset_y, draw_polylines'a verilen ötelemedir (mm); sayfa
+    dışında kalan parçalar içerik akışına hiç yazılmaz. SegmentStore ve
+    ArcStore aynı clipped() arayüzünü sağlar.
+    """
+    return segments.clipped(-offset_x - CLIP_PAD_MM, -offset_y - CLIP_PAD_MM,
+                            page_width - offset_x + CLIP_PAD_MM,
+                            page_height - offset_y + CLIP_PAD_MM)
+
+
+def draw_polylines(c, segments, offset_x=0, offset_y=0):
+    """Segmentleri (mm) ötelenmiş olarak tek path halinde çiz"""
+    point_starts, points = polyline_points(segments)
+    if not len(points):
+        return
+
+    if isinstance(c, PDFWriter):
+        # İçerik akışı dizilerden toplu olarak üretilir
+        c.stroke_polylines(point_starts, (points + (offset_x, offset_y)) * mm)
+        return
+
+    xs = ((points[:, 0] + offset_x) * mm).tolist()
+    ys = ((points[:, 1] + offset_y) * mm).tolist()
+    bounds = point_starts.tolist() + [len(xs)]
+
+    path = c.beginPath()
+    move_to = path.moveTo
+    line_to = path.lineTo
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        move_to(xs[start], ys[start])
+        for i in range(start + 1, end):
+            line_to(xs[i], ys[i])
+    c.drawPath(path, stroke=1, fill=0)
+
+
+def arc_curves(arcs, offset_x=0, offset_y=0):
+    """Yayların (mm) ötelenmiş Bézier eğrileri (pt): (parça sayıları, başlangıçlar, kontrol noktaları)"""
+    piece_counts, starts, controls = arcs.bezier_curves()
+    return piece_counts, (starts + (offset_x, offset_y)) * mm, (controls + (offset_x, offset_y) * 3) * mm
+
+
+def draw_arcs(c, arcs, offset_x=0, offset_y=0):
+    """Yayları (mm) ötelenmiş olarak tek path halinde Bézier eğrileriyle çiz"""
+    if not len(arcs):
+        return
+    piece_counts, starts, controls = arc_curves(arcs, offset_x, offset_y)
+
+    if isinstance(c, PDFWriter):
+        c.stroke_curves(piece_counts, starts, controls)
+        return
+
+    path = c.beginPath()
+    curves = iter(controls.tolist())
+    for count, (x, y) in zip(piece_counts.tolist(), starts.tolist()):
+        path.moveTo(x, y)
+        for _ in range(count):
+            path.curveTo(*next(curves))
+    c.drawPath(path, stroke=1, fill=0)
+
+
+def pen_groups(segments, arcs):
+    """Segment ve yayları kaleme göre grupla: [(kalem, segmentler, yaylar), ...]
+
+    Gruplar kalem numarasına göre sıralıdır, grup içinde çizim sırası
+    korunur. Tek kalem varsa kümeler kopyalanmadan döner.
+    """
+    pens = np.union1d(segments.unique_pens(), arcs.unique_pens())
+    if len(pens) <= 1:
+        return [(int(pens[0]) if len(pens) else DEFAULT_PEN, segments, arcs)]
+    return [(int(pen), segments.select(segments.pens == pen), arcs.select(arcs.pens == pen)) for pen in pens]
+
+
+def set_pen_style(c, pen):
+    """Kalemin rengini ve çizgi kalınlığını seç"""
+    color, width = pen_style(pen)
+    c.setStrokeColorRGB(*color)
+    c.setLineWidth(width)
+
+
+def draw_geometry(c, segments, arcs, offset_x=0, offset_y=0):
+    """Segmentleri ve yayları (mm) ötelenmiş olarak kalem başına bir path halinde çiz
+
+    Sadece varsayılan kalemin stiliyle çizilen geometride çizgi ayarlarına
+    dokunulmaz (çağıran taraf ayarlamıştır); kalemler değiştiyse sonunda
+    varsayılan kalemin stiline dönülür.
+    """
+    groups = pen_groups(segments, arcs)
+    styled = len(groups) > 1 or pen_style(groups[0][0]) != pen_style(DEFAULT_PEN)
+    for pen, pen_segments, pen_arcs in groups:
+        if styled:
+            set_pen_style(c, pen)
+        draw_polylines(c, pen_segments, offset_x, offset_y)
+        draw_arcs(c, pen_arcs, offset_x, offset_y)
+    if styled:
+        set_pen_style(c, DEFAULT_PEN)
+
+
+def define_drawing_form(c, segments, arcs, width_mm, height_mm):
+    """Normalize edilmiş tüm çizimi sayfalarda tekrar kullanılacak form olarak yaz"""
+    pad = CLIP_PAD_MM * mm
+    c.beginForm(DRAWING_FORM, -pad, -pad, width_mm * mm + pad, height_mm * mm + pad)
+    # Form kendi grafik durumuyla başlar, çizgi ayarları burada yapılmalı
+    c.setStrokeColorRGB(0, 0, 0)
+    c.setLineWidth(0.5)
+    c.setLineCap(1)
+    c.setLineJoin(1)
+    draw_geometry(c, segments, arcs)
+    c.endForm()
+
+
+def draw_form_tile(c, offset_x, offset_y, clip_x, clip_y, clip_width, clip_height):
+    """Çizim formunu (mm) ötelenmiş olarak yerleştir, sayfadaki dikdörtgene kırp"""
+    c.saveState()
+    clip = c.beginPath()
+    clip.rect(clip_x * mm, clip_y * mm, clip_width * mm, clip_height * mm)
+    c.clipPath(clip, stroke=0, fill=0)
+    c.translate(offset_x * mm, offset_y * mm)
+    c.doForm(DRAWING_FORM)
+    c.restoreState()
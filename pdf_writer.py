@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Hızlı PDF yazıcı (--fast-pdf)
+Dönüştürücülerin kullandığı reportlab Canvas metotlarının küçük bir
+alt kümesini sağlar. Çoklu çizgilerin içerik akışı segment dizilerinden
+toplu olarak üretilir: koordinatlar sabit ondalıklı tam sayılara çevrilip
+NumPy ile bayt dizisine yazılır, nokta başına Python çağrısı yapılmaz.
+Nesneler oluşturuldukça dosyaya yazılır; bellekte sadece sayfanın
+içeriği ve nesne konumları (xref) tutulur. reportlab yolu referans
+olarak kalır.
+"""
+
+import os
+import zlib
+
+import numpy as np
+
+
+# İçerik akışındaki koordinatların ondalık basamak sayısı (pt)
+# 0.01 pt ≈ 0.0035 mm, HPGL biriminden (0.025 mm) çok daha hassas
+COORD_DECIMALS = 2
+
+# İçerik akışına bir seferde yazılan nokta sayısı (bellek kullanımını sınırlar)
+CHUNK_POINTS = 1 << 16
+
+# save() tamamlanana kadar PDF bu uzantılı geçici dosyaya yazılır
+PART_SUFFIX = '.part'
+
+# WinAnsiEncoding'de olmayan Türkçe harfler, bu kodlamada boş kalan kodlara yerleştirilir
+_EXTRA_GLYPHS = {'İ': (0x7F, 'Idotaccent'), 'Ğ': (0x81, 'Gbreve'), 'ğ': (0x8D, 'gbreve'),
+                 'Ş': (0x8F, 'Scedilla'), 'ş': (0x90, 'scedilla'), 'ı': (0x9D, 'dotlessi')}
+
+_SPACE, _NEWLINE, _POINT, _MINUS = b' \n.-'
+
+
+def _number(value):
+    """Tek sayıyı PDF içerik akışı için kısa metne çevir"""
+    text = f"{value:.{COORD_DECIMALS}f}".rstrip('0').rstrip('.')
+    return '0' if text in ('', '-0') else text
+
+
+def _numbers(*values):
+    return ' '.join(_number(value) for value in values)
+
+
+def _encode_text(text):
+    """Metni WinAnsi (+ Türkçe harfler) baytlarına çevir, PDF dizgisi olarak kaçışla"""
+    encoded = bytearray()
+    for char in text:
+        if char in _EXTRA_GLYPHS:
+            encoded.append(_EXTRA_GLYPHS[char][0])
+        else:
+            encoded += char.encode('cp1252', errors='replace')
+    return bytes(encoded).replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def fixed_point_chars(values, decimals=COORD_DECIMALS):
+    """Sayıları sabit ondalıklı metne çevir
+
+    (n, genişlik) uint8 karakter matrisi ve geçerli karakter maskesi
+    döner; her satırın maskelenmiş karakterleri bir sayının metnidir
+    (ör. -12.50). Sayılar sağa yaslanır, basamaklar vektörel hesaplanır.
+    """
+    scaled = np.rint(np.asarray(values, dtype=np.float64) * 10 ** decimals).astype(np.int64)
+    magnitude = np.abs(scaled)
+    digit_count = max(decimals + 1, len(str(int(magnitude.max()))) if len(magnitude) else 1)
+    remaining = magnitude.copy()
+    width = digit_count + 2 if decimals else digit_count + 1  # basamaklar + nokta + işaret
+
+    chars = np.full((len(scaled), width), _SPACE, dtype=np.uint8)
+    mask = np.zeros((len(scaled), width), dtype=bool)
+    column = width - 1
+    for position in range(digit_count):
+        if decimals and position == decimals:
+            chars[:, column] = _POINT
+            mask[:, column] = True
+            column -= 1
+        chars[:, column] = 48 + remaining % 10
+        # Kesir basamakları ve birler basamağı her zaman yazılır
+        mask[:, column] = magnitude >= 10 ** position if position > decimals else True
+        remaining //= 10
+        column -= 1
+    chars[:, column] = _MINUS
+    mask[:, column] = scaled < 0
+    return chars, mask
+
+
+def polyline_operators(point_starts, points):
+    """Çoklu çizgilerin (pt) path operatörlerini bayt olarak üret
+
+    Her nokta bir satır olur: çoklu çizgi başlangıçları "x y m",
+    diğerleri "x y l". Bellek sınırlı kalsın diye parça parça üretilir.
+    """
+    is_start = np.zeros(len(points), dtype=bool)
+    is_start[point_starts] = True
+    for start in range(0, len(points), CHUNK_POINTS):
+        chunk = points[start:start + CHUNK_POINTS]
+        x_chars, x_mask = fixed_point_chars(chunk[:, 0])
+        y_chars, y_mask = fixed_point_chars(chunk[:, 1])
+
+        tail = np.empty((len(chunk), 3), dtype=np.uint8)
+        tail[:, 0] = _SPACE
+        tail[:, 1] = np.where(is_start[start:start + CHUNK_POINTS], ord('m'), ord('l'))
+        tail[:, 2] = _NEWLINE
+        separator = np.full((len(chunk), 1), _SPACE, dtype=np.uint8)
+
+        chars = np.hstack((x_chars, separator, y_chars, tail))
+        mask = np.hstack((x_mask, np.ones((len(chunk), 1), dtype=bool), y_mask,
+                          np.ones((len(chunk), 3), dtype=bool)))
+        yield chars[mask].tobytes()
+
+
+def polyline_content(point_starts, points):
+    """Çoklu çizgileri (pt) tek path olarak çizen içerik akışı parçası"""
+    return b''.join(polyline_operators(point_starts, points)) + b'S\n'
+
+
+def curve_operators(piece_counts, starts, controls):
+    """Bézier eğrilerinin (pt) path operatörlerini bayt olarak üret
+
+    Her eğri "x y m" satırıyla başlar, her parçası bir
+    "x1 y1 x2 y2 x3 y3 c" satırı olur (ArcStore.bezier_curves çıktısı).
+    """
+    move_rows = np.cumsum(piece_counts + 1) - (piece_counts + 1)
+    is_move = np.zeros(len(starts) + len(controls), dtype=bool)
+    is_move[move_rows] = True
+    values = np.zeros((len(is_move), 6))
+    values[move_rows, :2] = starts
+    values[~is_move] = controls
+
+    for start in range(0, len(values), CHUNK_POINTS):
+        chunk = values[start:start + CHUNK_POINTS]
+        moves = is_move[start:start + CHUNK_POINTS, None]
+        separator = np.full((len(chunk), 1), _SPACE, dtype=np.uint8)
+        parts, masks = [], []
+        for column in range(6):
+            chars, mask = fixed_point_chars(chunk[:, column])
+            if column >= 2:
+                # Başlangıç satırlarında sadece ilk iki sayı yazılır
+                mask &= ~moves
+            if column:
+                parts.append(separator)
+                masks.append(~moves if column >= 2 else np.ones_like(moves))
+            parts.append(chars)
+            masks.append(mask)
+
+        tail = np.empty((len(chunk), 3), dtype=np.uint8)
+        tail[:, 0] = _SPACE
+        tail[:, 1] = np.where(moves[:, 0], ord('m'), ord('c'))
+        tail[:, 2] = _NEWLINE
+        chars = np.hstack(parts + [tail])
+        mask = np.hstack(masks + [np.ones((len(chunk), 3), dtype=bool)])
+        yield chars[mask].tobytes()
+
+
+def curve_content(piece_counts, starts, controls):
+    """Bézier eğrilerini (pt) tek path olarak çizen içerik akışı parçası"""
+    return b''.join(curve_operators(piece_counts, starts, controls)) + b'S\n'
+
+
+class _Path:
+    """beginPath() ile oluşturulan basit path (moveTo/lineTo/rect)"""
+
+    def __init__(self):
+        self.ops = []
+
+    def moveTo(self, x, y):
+        self.ops.append(f"{_numbers(x, y)} m")
+
+    def lineTo(self, x, y):
+        self.ops.append(f"{_numbers(x, y)} l")
+
+    def rect(self, x, y, width, height):
+        self.ops.append(f"{_numbers(x, y, width, height)} re")
+
+
+class PDFWriter:
+    """reportlab Canvas yerine kullanılabilen hızlı PDF yazıcı
+
+    Sadece dönüştürücülerin kullandığı metotlar vardır. İçerik akışları,
+    formlar ve sayfalar oluşturuldukları anda sıkıştırılıp geçici dosyaya
+    (filename + PART_SUFFIX) yazılır; sayfa sayısı ne olursa olsun bellekte
+    sadece bitmemiş sayfanın operatörleri ve nesne konumları kalır. save()
+    ortak nesneleri ve xref tablosunu ekleyip dosyayı asıl adına taşır.
+    filename None ise (ör. tile_render işçileri) sadece page_content()
+    kullanılabilir.
+    """
+
+    def __init__(self, filename, pagesize):
+        self.filename = filename
+        self.pagesize = pagesize
+        # Nesnelerin dosyadaki konumları; nesne numarası = indeks + 1
+        # 1: Catalog, 2: Pages, 3: ortak kaynaklar, 4: font kodlaması (save'de yazılır)
+        self._offsets = [None, None, None, None]
+        self._file = None
+        self._page_ids = []
+        self._fonts = {}  # Font adı -> kaynak adı (F1, F2, ...)
+        self._forms = {}  # Form adı -> (kaynak adı, nesne numarası)
+        self._page_ops = []
+        self._page_contents = []  # Sayfanın içerik akışı nesneleri
+        self._ops = self._page_ops  # Form tanımlanırken formun operatörleri
+        self._form = None
+        self._font = None
+
+    def __del__(self):
+        # save() çağrılmadan bırakıldıysa (ör. dönüştürme hatası) yarım dosya silinir
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+            os.remove(self.filename + PART_SUFFIX)
+
+    def _write_object(self, object_id, body):
+        if self._file is None:
+            self._file = open(self.filename + PART_SUFFIX, 'wb')
+            self._file.write(b'%PDF-1.4\n%\x93\x8c\x8b\x9e\n')
+        self._offsets[object_id - 1] = self._file.tell()
+        self._file.write(b'%d 0 obj\n' % object_id + body + b'\nendobj\n')
+
+    def _add_object(self, body):
+        self._offsets.append(None)
+        object_id = len(self._offsets)
+        self._write_object(object_id, body)
+        return object_id
+
+    def _add_stream(self, dictionary, data):
+        data = zlib.compress(data)
+        return self._add_object(b'<< %s/Filter /FlateDecode /Length %d >>\nstream\n' % (dictionary, len(data)) +
+                                data + b'\nendstream')
+
+    def _write(self, op):
+        self._ops.append(op.encode('latin-1') + b'\n')
+
+    # Grafik durumu
+    def setStrokeColorRGB(self, r, g, b):
+        self._write(f"{_numbers(r, g, b)} RG")
+
+    def setFillColorRGB(self, r, g, b):
+        self._write(f"{_numbers(r, g, b)} rg")
+
+    def setLineWidth(self, width):
+        self._write(f"{_number(width)} w")
+
+    def setLineCap(self, mode):
+        self._write(f"{mode} J")
+
+    def setLineJoin(self, mode):
+        self._write(f"{mode} j")
+
+    def setDash(self, array=(), phase=0):
+        self._write(f"[{_numbers(*array)}] {_number(phase)} d")
+
+    def saveState(self):
+        self._write("q")
+
+    def restoreState(self):
+        self._write("Q")
+
+    def translate(self, dx, dy):
+        self._write(f"1 0 0 1 {_numbers(dx, dy)} cm")
+
+    # Çizim
+    def line(self, x1, y1, x2, y2):
+        self._write(f"{_numbers(x1, y1)} m {_numbers(x2, y2)} l S")
+
+    def beginPath(self):
+        return _Path()
+
+    def drawPath(self, path, stroke=1, fill=0):
+        self._write('\n'.join(path.ops + ['S' if stroke else 'n']))
+
+    def clipPath(self, path, stroke=0, fill=0):
+        self._write('\n'.join(path.ops + ['W', 'S' if stroke else 'n']))
+
+    def stroke_polylines(self, point_starts, points):
+        """Çoklu çizgileri (pt) tek path olarak çiz"""
+        if not len(points):
+            return
+        self._ops.append(polyline_content(point_starts, points))
+
+    def stroke_curves(self, piece_counts, starts, controls):
+        """Bézier eğrilerini (pt) tek path olarak çiz"""
+        if not len(starts):
+            return
+        self._ops.append(curve_content(piece_counts, starts, controls))
+
+    def page_content(self):
+        """Sayfaya şu ana kadar yazılmış, sıkıştırılmamış içerik akışı"""
+        return b''.join(self._page_ops)
+
+    def flush_content(self):
+        """Sayfaya şu ana kadar yazılanları ayrı bir içerik akışı olarak dosyaya yaz
+
+        Sayfa, akışların birleşimi olarak çizilir (grafik durumu akışlar
+        arasında sürer); tek sayfalık büyük çizimler böylece parça parça
+        yazılır ve bellekte sadece son parçanın operatörleri tutulur.
+        """
+        self._flush_page_ops()
+
+    def draw_compressed(self, data):
+        """Başka süreçte üretilmiş, sıkıştırılmış içerik akışı parçasını sayfaya ekle"""
+        self._flush_page_ops()
+        self._page_contents.append(self._add_object(
+            b'<< /Filter /FlateDecode /Length %d >>\nstream\n' % len(data) + data + b'\nendstream'))
+
+    # Metin
+    def setFont(self, name, size):
+        if name not in self._fonts:
+            self._fonts[name] = f"F{len(self._fonts) + 1}"
+        self._font = (self._fonts[name], size)
+
+    def drawString(self, x, y, text):
+        font, size = self._font
+        self._ops.append(f"BT /{font} {_number(size)} Tf {_numbers(x, y)} Td (".encode('latin-1') +
+                         _encode_text(text) + b") Tj ET\n")
+
+    # Formlar (Form XObject)
+    def beginForm(self, name, lowerx=0, lowery=0, upperx=None, uppery=None):
+        if upperx is None:
+            upperx, uppery = self.pagesize
+        self._form = (name, (lowerx, lowery, upperx, uppery))
+        self._ops = []
+
+    def endForm(self):
+        name, bbox = self._form
+        box = _numbers(*bbox).encode('latin-1')
+        object_id = self._add_stream(b'/Type /XObject /Subtype /Form /BBox [' + box + b'] ', b''.join(self._ops))
+        self._forms[name] = (f"X{len(self._forms) + 1}", object_id)
+        self._form = None
+        self._ops = self._page_ops
+
+    def doForm(self, name):
+        self._write(f"/{self._forms[name][0]} Do")
+
+    # Sayfalar
+    def _flush_page_ops(self):
+        if self._page_ops:
+            self._page_contents.append(self._add_stream(b'', b''.join(self._page_ops)))
+            self._page_ops.clear()
+
+    def showPage(self):
+        """Sayfayı bitir, içerik akışını sıkıştırıp sayfa nesnesiyle dosyaya yaz"""
+        self._flush_page_ops()
+        if not self._page_contents:
+            self._page_contents.append(self._add_stream(b'', b''))
+        if len(self._page_contents) == 1:
+            contents = f"{self._page_contents[0]} 0 R"
+        else:
+            contents = '[' + ' '.join(f"{object_id} 0 R" for object_id in self._page_contents) + ']'
+        width, height = self.pagesize
+        self._page_ids.append(self._add_object(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_numbers(width, height)}] "
+            f"/Resources 3 0 R /Contents {contents} >>".encode('latin-1')))
+        self._page_contents.clear()
+        self._font = None
+
+    def save(self):
+        """Kalan sayfayı bitir, ortak nesneleri ve xref tablosunu yazıp PDF'i tamamla"""
+        if self._page_ops or self._page_contents or not self._page_ids:
+            self.showPage()
+
+        differences = ' '.join(f"{code} /{glyph}" for code, glyph in sorted(_EXTRA_GLYPHS.values()))
+        self._write_object(4, (f"<< /Type /Encoding /BaseEncoding /WinAnsiEncoding "
+                               f"/Differences [{differences}] >>").encode('latin-1'))
+        fonts = ' '.join(f"/{resource} {self._add_object(self._font_object(name))} 0 R"
+                         for name, resource in self._fonts.items())
+        forms = ' '.join(f"/{resource} {object_id} 0 R" for resource, object_id in self._forms.values())
+        self._write_object(3, f"<< /Font << {fonts} >> /XObject << {forms} >> >>".encode('latin-1'))
+        kids = ' '.join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode('latin-1'))
+        self._write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+
+        f = self._file
+        xref_offset = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(self._offsets) + 1))
+        f.write(b''.join(b'%010d 00000 n \n' % offset for offset in self._offsets))
+        f.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' %
+                (len(self._offsets) + 1, xref_offset))
+        f.close()
+        os.replace(self.filename + PART_SUFFIX, self.filename)
+
+    @staticmethod
+    def _font_object(name):
+        return f"<< /Type /Font /Subtype /Type1 /BaseFont /{name} /Encoding 4 0 R >>".encode('latin-1')
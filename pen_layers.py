@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Kalem (SP) stilleri ve kalem başına ayrı çıktı (--split-pens)
+Her kalem PDF'te kendi rengiyle çizilir; istenirse her kalemin geometrisi
+aynı çizimden (tekrar ayrıştırmadan) ayrı bir PDF'e de yazılır, böylece
+kesim ve işaretleme çizgileri ayrı yazdırılabilir/işlenebilir
+"""
+
+import os
+import re
+import copy
+
+from profiling import ConversionStats
+from segment_store import DEFAULT_PEN
+
+
+# Kalem renkleri (RGB, 0-1): kalem 1 siyah, 2 kırmızı, 3 yeşil, 4 mavi, ...
+# Listeden büyük numaralı kalemler renkleri sırayla tekrar kullanır
+PEN_COLORS = [
+    (0, 0, 0),
+    (0.9, 0, 0),
+    (0, 0.6, 0),
+    (0, 0, 0.9),
+    (0.8, 0, 0.8),
+    (0, 0.6, 0.7),
+    (1, 0.5, 0),
+    (0.5, 0.5, 0.5),
+]
+
+# Tüm kalemlerin çizgi kalınlığı (pt)
+PEN_WIDTH = 0.5
+
+# Kalem başına PDF'lerin adı: <çıktı adı>_pen<kalem>.pdf
+PEN_FILE_SUFFIX = '_pen{pen}.pdf'
+
+
+def pen_style(pen):
+    """Kalemin (renk, çizgi kalınlığı) çifti; kalem 0 (SP0) varsayılan kalem gibi çizilir"""
+    if pen <= 0:
+        pen = DEFAULT_PEN
+    return PEN_COLORS[(pen - 1) % len(PEN_COLORS)], PEN_WIDTH
+
+
+def pen_file(pdf_file, pen):
+    """Çıktı PDF'ine karşılık gelen kalem PDF'inin yolu"""
+    return os.path.splitext(pdf_file)[0] + PEN_FILE_SUFFIX.format(pen=pen)
+
+
+def existing_pen_files(pdf_file):
+    """Çıktı PDF'i için daha önce yazılmış kalem PDF'leri
+
+    Sadece tam olarak <çıktı adı>_pen<N>.pdf adlı dosyalar döner; başka
+    girdilerin çıktıları (ör. foo.pdf için foo_pen2_A4.pdf) eşleşmez.
+    """
+    directory, filename = os.path.split(pdf_file)
+    # PEN_FILE_SUFFIX biçimi: <çıktı adı>_pen<kalem>.pdf
+    pattern = re.escape(os.path.splitext(filename)[0]) + r'_pen\d+\.pdf'
+    try:
+        names = os.listdir(directory or '.')
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in sorted(names) if re.fullmatch(pattern, name)]
+
+
+def write_pen_files(converter, drawing):
+    """Çizimin her kalemini, dönüştürücünün düzeniyle ayrı bir PDF'e yaz
+
+    Dönüştürücü kopyalanıp sadece çıktı adı değiştirilir; sayfa düzeni
+    ve çizim boyutu tüm çizimle aynı kalır, böylece kalem PDF'leri üst
+    üste çakışır. Önceki çalıştırmadan kalan kalem PDF'leri silinir;
+    çizimde tek kalem varsa ana PDF'in aynısı olacağından yazılmaz.
+    Kopyalar kendi ölçümlerini tutar, dönüştürücünün ölçümüne toplam
+    süre 'split_pens' aşaması, yazılan dosya ve sayfalar sayaç olarak
+    eklenir. Hepsi yazılabildiyse True döner.
+    """
+    for path in existing_pen_files(converter.pdf_file):
+        os.remove(path)
+
+    pens = drawing.pens()
+    if len(pens) <= 1:
+        print("Çizimde tek kalem var, kalem PDF'leri yazılmadı")
+        return True
+
+    print(f"{len(pens)} kalem ayrı PDF'lere yazılıyor: {', '.join(map(str, pens))}")
+    stats = converter.stats
+    success = True
+    for pen in pens:
+        pen_converter = copy.copy(converter)
+        pen_converter.pdf_file = pen_file(converter.pdf_file, pen)
+        pen_converter.split_pens = False
+        pen_converter.stats = ConversionStats()
+        success = bool(pen_converter.render(drawing.pen_subset(pen))) and success
+        stats.count('pen_files')
+        stats.count('pen_pages', len(pen_converter.stats.page_segments))
+    stats.lap('split_pens')
+    return success
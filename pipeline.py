@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tek süreçte boru hattı (pipeline) ile dosya yükleme
+Dosyalar sırayla dönüştürülürken aşamalar birbirini beklemez: bir iş
+parçacığı sıradaki dosyaları diskten okuyup SHA-256 özetini çıkarır, bir
+iş parçacığı okunmuş baytlardan geometriyi hazırlar (ayrıştırma,
+normalize, temizleme), ana iş parçacığı PDF'leri yazar. Aşamalar arasında
+sınırlı kuyruklar vardır; bellekte en fazla birkaç dosyanın içeriği ve
+çizimi bekler. Okuma, özet, NumPy ve zlib işlemleri GIL'i bıraktığı için
+aşamalar gerçekten örtüşür. Yükleme mesajları dosya başına ayrı bir
+akışa yazılır ve dosyanın PDF'i yazılırken sırayla gösterilir.
+"""
+
+import io
+import os
+import time
+import queue
+import threading
+from collections import namedtuple
+
+from drawing import UNIT_TO_MM, load_drawing
+from geometry_cache import data_digest, file_digest
+from profiling import ConversionStats
+
+
+# Aşamalar arası kuyrukların boyu (önden hazırlanan en fazla dosya sayısı)
+PIPELINE_DEPTH = 2
+
+# Bu boyuttan büyük dosyalar önden belleğe okunmaz, sadece özetleri çıkarılır
+# (dosya işletim sisteminin önbelleğine alınır, yükleyici mmap ile okur)
+PREFETCH_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+# Kuyruk beklemelerinde durdurma isteğinin kontrol aralığı (sn)
+_POLL_INTERVAL = 0.1
+
+# Bir yüklenmiş dosya: çizim yüklenemediyse drawing None, error varsa hata metni
+# output: yükleme sırasında yazılanlar, elapsed: okuma/özet + yükleme süresi (sn)
+LoadedDrawing = namedtuple('LoadedDrawing', 'plt_file digest drawing output stats error elapsed')
+
+_DONE = object()
+
+
+def _put(target, item, stop):
+    """Kuyruk doluysa yer açılmasını bekle; durdurulduysa False döner"""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _prefetch(plt_files, prefetched, stop):
+    """Dosyaları sırayla okuyup özetlerini çıkar; küçük dosyaların içeriği de yükleyiciye verilir"""
+    try:
+        for plt_file in plt_files:
+            start = time.perf_counter()
+            data = digest = None
+            try:
+                if os.path.getsize(plt_file) <= PREFETCH_MAX_BYTES:
+                    with open(plt_file, 'rb') as f:
+                        data = f.read()
+                    digest = data_digest(data)
+                else:
+                    digest = file_digest(plt_file)
+            except OSError:
+                # Okuma hatası yükleme aşamasında raporlanır
+                data = digest = None
+            if not _put(prefetched, (plt_file, data, digest, time.perf_counter() - start), stop):
+                return
+    finally:
+        # Beklenmedik bir hatada da yükleyici beklemede kalmaz
+        _put(prefetched, _DONE, stop)
+
+
+def _load(prefetched, loaded, load_options, stop):
+    """Okunmuş dosyaların çizimlerini sırayla yükle"""
+    try:
+        while not stop.is_set():
+            try:
+                item = prefetched.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+
+            plt_file, data, digest, elapsed = item
+            log = io.StringIO()
+            stats = ConversionStats()
+            stats.add_stage('prefetch', elapsed)
+            start = time.perf_counter()
+            drawing = None
+            error = None
+            try:
+                drawing = load_drawing(plt_file, UNIT_TO_MM, digest=digest, data=data, stats=stats, log=log,
+                                       **load_options)
+            except Exception as e:
+                error = str(e)
+            # İçerik artık gerekmez, sonuç kuyrukta beklerken bellekte tutulmaz
+            del item, data
+            result = LoadedDrawing(plt_file, digest, drawing, log.getvalue(), stats, error,
+                                   elapsed + time.perf_counter() - start)
+            if not _put(loaded, result, stop):
+                return
+    finally:
+        # Tüketici, yükleyici beklenmedik şekilde dursa da sonsuza kadar beklemez
+        _put(loaded, _DONE, stop)
+
+
+def _get(source, worker):
+    """Kuyruktan sıradaki öğeyi al; üretici iş parçacığı bitmiş ve kuyruk boşsa _DONE döner"""
+    while True:
+        try:
+            return source.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            if worker.is_alive():
+                continue
+        # Üretici bittikten sonra kuyruğa son kalan öğe
+        try:
+            return source.get_nowait()
+        except queue.Empty:
+            return _DONE
+
+
+def iter_loaded_drawings(plt_files, use_cache=True, cleanup_grid=None, simplify_tolerance=None,
+                         depth=PIPELINE_DEPTH):
+    """Dosyaları arka planda önden okuyup yükleyerek sırayla LoadedDrawing olarak üret
+
+    Tüketici bir dosyanın PDF'ini yazarken sonraki dosyalar okunur ve
+    yüklenir; yükleme mesajları sys.stdout'a değil LoadedDrawing.output'a
+    yazılır. Yükleyici tüm dosyaları üretmeden durursa RuntimeError
+    verilir. Üretici bitince veya kapatılınca iş parçacıkları durdurulur.
+    """
+    plt_files = list(plt_files)
+    if not plt_files:
+        return
+    load_options = {'use_cache': use_cache, 'cleanup_grid': cleanup_grid,
+                    'simplify_tolerance': simplify_tolerance}
+    prefetched = queue.Queue(maxsize=depth)
+    loaded = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    loader = threading.Thread(target=_load, args=(prefetched, loaded, load_options, stop), daemon=True)
+    threads = [threading.Thread(target=_prefetch, args=(plt_files, prefetched, stop), daemon=True), loader]
+    for thread in threads:
+        thread.start()
+    try:
+        for index in range(len(plt_files)):
+            item = _get(loaded, loader)
+            if item is _DONE:
+                raise RuntimeError(f"Önden yükleme erken durdu: {index}/{len(plt_files)} dosya yüklendi")
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
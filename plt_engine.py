@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+PLT dosyalarını tek ayrıştırmayla birden fazla düzende PDF'e çevirme programı
+Her dosya bir kez okunup normalize edilir; seçilen tüm modlar (tek sayfa,
+A4, A4 overlap, A4 overlay) aynı çizimden yazılır
+
+Kullanım: python plt_engine.py --modes all
+          python plt_engine.py --modes single,overlay -j 4
+"""
+
+import sys
+import os
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor
+
+from geometry_cache import clear_cache
+from drawing import UNIT_TO_MM, load_drawing
+from batch import (ConversionResult, build_parser, check_args, convert_file, init_worker, output_settings,
+                   pdf_name, report_result, write_profile)
+from manifest import BuildManifest
+from pipeline import iter_loaded_drawings
+from profiling import ConversionStats, format_stats
+import plt_to_pdf
+import plt_to_pdf_a4
+import plt_to_pdf_a4_overlap
+import plt_to_pdf_a4_overlay
+
+
+# Mod adı -> (dönüştürücü sınıfı, PDF soneki, A4'e bölen mod mu)
+MODES = {
+    'single': (plt_to_pdf.PLTtoPDFConverter, '.pdf', False),
+    'a4': (plt_to_pdf_a4.PLTtoPDFA4Converter, '_A4.pdf', True),
+    'overlap': (plt_to_pdf_a4_overlap.PLTtoPDFA4OverlapConverter, '_A4_overlap.pdf', True),
+    'overlay': (plt_to_pdf_a4_overlay.PLTtoPDFA4OverlayConverter, '_A4_overlay.pdf', True),
+}
+
+
+def parse_modes(value):
+    """'all' veya virgülle ayrılmış mod adlarını listeye çevir"""
+    if value == 'all':
+        return list(MODES)
+    modes = [mode.strip() for mode in value.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown or not modes:
+        raise ValueError(f"Bilinmeyen mod: {', '.join(unknown)} (seçenekler: all, {', '.join(MODES)})")
+    return modes
+
+
+def mode_options(mode, args):
+    """Modun kendi programıyla aynı dönüştürücü seçenekleri (manifest ayarları da aynı olur)"""
+    options = {'use_cache': not args.no_cache, 'simplify_tolerance': args.simplify,
+               'cleanup_grid': args.cleanup, 'fast_pdf': args.fast_pdf, 'split_pens': args.split_pens}
+    if MODES[mode][2]:
+        options['use_form'] = args.form
+        options['tile_jobs'] = args.tile_jobs
+    else:
+        options['stream'] = False
+    return options
+
+
+def main():
+    parser = build_parser(__doc__, tiled=True)
+    parser.add_argument('--modes', default='all',
+                        help=f"Yazılacak düzenler: all veya virgülle ayrılmış {', '.join(MODES)}")
+    args = check_args(parser, parser.parse_args())
+
+    try:
+        modes = parse_modes(args.modes)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.watch:
+        parser.error("--watch bu programda desteklenmiyor; tek modlu programları kullanın")
+
+    # Çalışma dizinini al
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    input_dir = os.path.join(script_dir, 'input_plt')
+    output_dir = os.path.join(script_dir, 'output_pdf')
+
+    # Klasörlerin varlığını kontrol et
+    if not os.path.exists(input_dir):
+        os.makedirs(input_dir)
+        print(f"'{input_dir}' klasörü oluşturuldu.")
+        print("Lütfen PLT dosyalarınızı bu klasöre koyun.")
+        sys.exit(0)
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"'{output_dir}' klasörü oluşturuldu.")
+
+    if args.clear_cache:
+        clear_cache()
+
+    # input_plt klasöründeki tüm PLT dosyalarını bul
+    plt_files = glob(os.path.join(input_dir, '*.plt')) + glob(os.path.join(input_dir, '*.PLT'))
+
+    if not plt_files:
+        print(f"'{input_dir}' klasöründe PLT dosyası bulunamadı!")
+        print("Lütfen .plt uzantılı dosyalarınızı bu klasöre koyun.")
+        sys.exit(1)
+
+    print(f"\n{len(plt_files)} adet PLT dosyası bulundu. Modlar: {', '.join(modes)}\n")
+    print("=" * 60)
+
+    options = {mode: mode_options(mode, args) for mode in modes}
+    manifests = {mode: BuildManifest(output_dir, MODES[mode][1], output_settings(options[mode]))
+                 for mode in modes}
+    for manifest in manifests.values():
+        for pdf_filename in manifest.remove_orphans(plt_files):
+            print(f"Kaynağı silinmiş çıktı kaldırıldı: {pdf_filename}")
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = min(jobs, len(modes))
+    executor = None
+    if jobs > 1:
+        print(f"Modlar {jobs} paralel süreçte yazılıyor")
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker)
+
+    success_count = 0
+    fail_count = 0
+    skipped_count = 0
+    profiles = {}
+
+    # Sadece güncel olmayan çıktılar yazılır; hepsi güncelse dosya okunmaz bile
+    pending_modes = []
+    for plt_file in plt_files:
+        pending = []
+        for mode in modes:
+            pdf_filename = pdf_name(plt_file, MODES[mode][1])
+            if args.force or not manifests[mode].is_current(plt_file, pdf_filename):
+                pending.append((mode, pdf_filename, os.path.join(output_dir, pdf_filename)))
+        pending_modes.append(pending)
+
+    # Sonraki dosyalar, modlar yazılırken arka planda okunup yüklenir
+    load_files = [plt_file for plt_file, pending in zip(plt_files, pending_modes) if pending]
+    loaded = None
+    if not args.no_pipeline and len(load_files) > 1:
+        loaded = iter_loaded_drawings(load_files, not args.no_cache, args.cleanup, args.simplify)
+
+    try:
+        for index, (plt_file, pending) in enumerate(zip(plt_files, pending_modes), 1):
+            filename = os.path.basename(plt_file)
+            print(f"\n[{index}/{len(plt_files)}] İşleniyor: {filename}")
+            print("-" * 60)
+
+            skipped_count += len(modes) - len(pending)
+            if not pending:
+                print("Tüm çıktılar güncel, atlanıyor")
+                continue
+
+            # Tek ayrıştırma: tüm modlar bu çizimi kullanır
+            if loaded is not None:
+                item = next(loaded)
+                if item.digest is not None:
+                    for mode, _, _ in pending:
+                        manifests[mode].remember_digest(plt_file, item.digest)
+                print(item.output, end='')
+                drawing, error, load_stats = item.drawing, item.error, item.stats
+            else:
+                load_stats = ConversionStats()
+                error = None
+                try:
+                    drawing = load_drawing(plt_file, UNIT_TO_MM, not args.no_cache, args.cleanup,
+                                           args.simplify, load_stats)
+                except Exception as e:
+                    drawing = None
+                    error = str(e)
+            if args.profile:
+                profiles[f"{filename} [load]"] = load_stats.to_dict()
+
+            if drawing is None:
+                for mode, pdf_filename, _ in pending:
+                    report_result(ConversionResult(False, error, '', 0.0), filename, pdf_filename,
+                                  manifests[mode], plt_file)
+                    fail_count += 1
+                continue
+
+            if executor is not None:
+                futures = [executor.submit(convert_file, MODES[mode][0], plt_file, pdf_file, options[mode],
+                                           True, args.profile_hook, drawing)
+                           for mode, _, pdf_file in pending]
+
+            for task_index, (mode, pdf_filename, pdf_file) in enumerate(pending):
+                print(f"\n[{mode}]")
+                if executor is None:
+                    result = convert_file(MODES[mode][0], plt_file, pdf_file, options[mode],
+                                          capture_output=False, profile_hook=args.profile_hook, drawing=drawing)
+                else:
+                    try:
+                        result = futures[task_index].result()
+                    except Exception as e:
+                        # İşçi süreç çöktüyse (ör. bellek yetersiz) mod başarısız sayılır
+                        result = ConversionResult(False, str(e), '', 0.0)
+                    print(result.output, end='')
+
+                if report_result(result, filename, pdf_filename, manifests[mode], plt_file):
+                    success_count += 1
+                else:
+                    fail_count += 1
+
+                if args.profile and result.stats is not None:
+                    profiles[f"{filename} [{mode}]"] = result.stats
+                    print(format_stats(result.stats))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if loaded is not None:
+            loaded.close()
+        # Yarıda kesilse bile biten dosyalar kaydedilir
+        for manifest in manifests.values():
+            manifest.save()
+        if args.profile:
+            write_profile(args.profile, profiles)
+
+    # Özet
+    print("\n" + "=" * 60)
+    print(f"\nDÖNÜŞTÜRME ÖZETİ:")
+    print(f"  Toplam dosya: {len(plt_files)} ({len(modes)} mod)")
+    print(f"  Başarılı PDF: {success_count}")
+    print(f"  Başarısız PDF: {fail_count}")
+    print(f"  Değişmemiş (atlanan): {skipped_count}")
+    print(f"\nÇıktı klasörü: {output_dir}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test ve ölçüm için yapay PLT dosyası üretici
+Aynı şekil, segment sayısı ve tohum (seed) için her zaman aynı dosyayı üretir
+
+Şekiller:
+  nested    - iç içe geçmiş çokgen kalıplar (yoğun, kapalı çizgiler)
+  long      - sayfayı boydan boya geçen uzun çizgiler
+  curves    - çok küçük adımlarla çizilmiş küçük daireler/yaylar
+  relative  - PR (göreli) komutlarıyla çizilmiş rastgele yürüyüşler
+
+Kullanım: python plt_generator.py <şekil> <segment sayısı> <çıktı.plt> [--seed N]
+"""
+
+import argparse
+
+import numpy as np
+
+
+# Çizim alanı (HPGL birimi, 40000 ≈ 1 m)
+SHEET_SIZE = 40000
+
+# Bir seferde üretilen segment sayısı (bellek kullanımını sınırlar)
+BLOCK_SEGMENTS = 1 << 17
+
+SHAPES = ('nested', 'long', 'curves', 'relative')
+
+
+def _nested(rng, count):
+    """İç içe düzgün çokgen grupları: her grupta aynı merkezli, küçülen çokgenler"""
+    lengths, parts = [], []
+    total = 0
+    while total < count:
+        center = rng.uniform(2000, SHEET_SIZE - 2000, 2)
+        sides = int(rng.integers(4, 65))
+        rotation = rng.uniform(0, 2 * np.pi)
+        for radius in 1900 * 0.85 ** np.arange(int(rng.integers(3, 15))):
+            angles = rotation + np.linspace(0, 2 * np.pi, sides + 1)
+            angles[-1] = angles[0]  # Kapalı çokgen
+            parts.append(center + radius * np.stack((np.cos(angles), np.sin(angles)), axis=1))
+            lengths.append(sides)
+            total += sides
+    return lengths, parts
+
+
+def _long(rng, count):
+    """Rastgele uzun kenarlı, 1-4 segmentlik açık çizgiler"""
+    lengths = []
+    total = 0
+    while total < count:
+        lengths.append(int(rng.integers(1, 5)))
+        total += lengths[-1]
+    points = rng.uniform(0, SHEET_SIZE, (total + len(lengths), 2))
+    parts = np.split(points, np.cumsum([n + 1 for n in lengths])[:-1])
+    return lengths, parts
+
+
+def _curves(rng, count):
+    """Küçük daire ve yaylar (0.5-10 mm yarıçap), her biri 16-96 adımda"""
+    lengths, parts = [], []
+    total = 0
+    while total < count:
+        steps = int(rng.integers(16, 97))
+        center = rng.uniform(500, SHEET_SIZE - 500, 2)
+        radius = rng.uniform(20, 400)
+        start = rng.uniform(0, 2 * np.pi)
+        sweep = rng.choice((2 * np.pi, rng.uniform(0.5, 2 * np.pi)))
+        angles = start + np.linspace(0, sweep, steps + 1)
+        parts.append(center + radius * np.stack((np.cos(angles), np.sin(angles)), axis=1))
+        lengths.append(steps)
+        total += steps
+    return lengths, parts
+
+
+def _relative(rng, count):
+    """Küçük adımlı rastgele yürüyüşler (PR ile yazılır)"""
+    lengths, parts = [], []
+    total = 0
+    while total < count:
+        steps = int(rng.integers(50, 501))
+        start = rng.uniform(5000, SHEET_SIZE - 5000, 2)
+        moves = rng.integers(-40, 41, (steps, 2))
+        parts.append(np.concatenate((start[None, :], start + np.cumsum(moves, axis=0))))
+        lengths.append(steps)
+        total += steps
+    return lengths, parts
+
+
+_GENERATORS = {'nested': _nested, 'long': _long, 'curves': _curves, 'relative': _relative}
+
+
+def _format_block(shape, lengths, parts, remaining):
+    """Bir grup çoklu çizgiyi HPGL metnine çevir (en fazla remaining segment)"""
+    out = []
+    written = 0
+    for length, points in zip(lengths, parts):
+        length = min(length, remaining - written)
+        if length <= 0:
+            break
+        points = np.rint(points[:length + 1]).astype(np.int64)
+        x, y = points[0].tolist()
+        if shape == 'relative':
+            deltas = np.diff(points, axis=0).ravel().tolist()
+            out.append(f"PU{x},{y};PD;PR{','.join(map(str, deltas))};PA;PU;")
+        else:
+            coords = points[1:].ravel().tolist()
+            out.append(f"PU{x},{y};PD{','.join(map(str, coords))};PU;")
+        written += length
+    return ''.join(out), written
+
+
+def generate_plt(path, shape, segment_count, seed=0):
+    """Verilen şekilde tam segment_count segmentlik PLT dosyası yaz"""
+    if shape not in _GENERATORS:
+        raise ValueError(f"Bilinmeyen şekil: {shape} (seçenekler: {', '.join(SHAPES)})")
+    rng = np.random.default_rng(seed)
+    written = 0
+    with open(path, 'w', encoding='ascii', newline='\n') as f:
+        f.write("IN;SP1;\n")
+        while written < segment_count:
+            block = min(BLOCK_SEGMENTS, segment_count - written)
+            lengths, parts = _GENERATORS[shape](rng, block)
+            text, block_written = _format_block(shape, lengths, parts, block)
+            f.write(text)
+            f.write("\n")
+            written += block_written
+        f.write("PU;SP0;\n")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('shape', choices=SHAPES)
+    parser.add_argument('segments', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    count = generate_plt(args.output, args.shape, args.segments, args.seed)
+    print(f"{args.output}: {count} segment ({args.shape})")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,166 +4,83 @@ PLT dosyasını gerçek ölçeğinde PDF'e çevirme programı
 input_plt klasöründen dosyaları okur, output_pdf klasörüne kaydeder
 """
 
-import re
-from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
 import sys
 import os
 from glob import glob
 
+from hpgl_parser import iter_commands
+from hpgl_interpreter import iter_file_geometry_batches
+from geometry_cache import clear_cache
+from drawing import load_drawing
+from batch import parse_args, run_batch
+from watch import watch_folder
+from pdf_render import draw_geometry, new_canvas
+from pen_layers import write_pen_files
+from segment_cleanup import CleanupStats, cleanup_segments
+from simplify import simplify_segments
+from profiling import NO_STATS, ConversionStats
+
 
 class PLTtoPDFConverter:
-    def __init__(self, plt_file, pdf_file):
+    def __init__(self, plt_file, pdf_file, use_cache=True, stream=False, simplify_tolerance=None, cleanup_grid=None,
+                 fast_pdf=False, split_pens=False):
         self.plt_file = plt_file
         self.pdf_file = pdf_file
-        self.commands = []
-        self.current_x = 0
-        self.current_y = 0
-        self.pen_down = False
+        self.use_cache = use_cache  # Ayrıştırılmış geometriyi diskte önbellekle
+        self.stream = stream  # Segmentleri bellekte tutmadan iki geçişte çiz
+        self.simplify_tolerance = simplify_tolerance  # Sadeleştirme toleransı (mm), None: kapalı
+        self.cleanup_grid = cleanup_grid  # Temizleme ızgarası (mm), None: kapalı
+        self.fast_pdf = fast_pdf  # reportlab yerine hızlı PDF yazıcıyı kullan
+        self.split_pens = split_pens  # Her kalemi ayrıca ayrı bir PDF'e yaz (akış modunda kullanılamaz)
+        self.stats = ConversionStats()  # Aşama süreleri ve sayaçlar
 
         # HPGL birimlerini mm'ye çevirme (1016 HPGL units per inch)
         self.unit_to_mm = 25.4 / 1016  # ≈ 0.025
 
     def parse_plt(self):
-        """PLT dosyasını oku ve komutları ayrıştır"""
-        with open(self.plt_file, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-
-        # Boşlukları ve satır sonlarını temizle
-        content = content.replace('\n', '').replace('\r', '').replace(' ', '')
-
-        # HPGL komutlarını bul - 2 harfli komut + parametreler
-        pattern = r'([A-Z]{2})([^A-Z]*)'
-        commands = re.findall(pattern, content)
-        return commands
+        """PLT dosyasını parça parça oku ve komutları sırayla üret"""
+        return iter_commands(self.plt_file)
 
-    def get_bounds(self, commands):
-        """Çizim sınırlarını bul"""
+    def stream_bounds(self):
+        """Dosyayı segmentleri saklamadan tarayıp (segment sayısı, yay sayısı, sınırlar) bul"""
+        count = 0
+        arc_count = 0
         min_x, min_y = float('inf'), float('inf')
         max_x, max_y = float('-inf'), float('-inf')
-        x, y = 0, 0
 
-        for cmd, params in commands:
-            if cmd in ['PA', 'PD', 'PU']:
-                coords = [int(p) for p in re.findall(r'-?\d+', params)]
-                for i in range(0, len(coords), 2):
-                    if i + 1 < len(coords):
-                        x, y = coords[i], coords[i + 1]
-                        min_x = min(min_x, x)
-                        min_y = min(min_y, y)
-                        max_x = max(max_x, x)
-                        max_y = max(max_y, y)
-
-        return min_x, min_y, max_x, max_y
+        # Okuma ve sayaçlar ikinci geçişte ölçülür; burada sayılırsa --profile her şeyi iki kez gösterir
+        for segments, arcs in iter_file_geometry_batches(self.plt_file, stats=NO_STATS):
+            count += len(segments)
+            arc_count += len(arcs)
+            for store in (segments, arcs):
+                if not store:
+                    continue
+                batch_min_x, batch_min_y, batch_max_x, batch_max_y = store.bounds()
+                min_x = min(min_x, batch_min_x)
+                min_y = min(min_y, batch_min_y)
+                max_x = max(max_x, batch_max_x)
+                max_y = max(max_y, batch_max_y)
+            self.stats.lap('bounds')
+
+        return count, arc_count, (min_x, min_y, max_x, max_y)
 
     def convert(self):
         """PLT'den PDF'e dönüştür"""
-        print(f"PLT dosyası okunuyor: {self.plt_file}")
-        commands = self.parse_plt()
+        if self.stream:
+            return self.convert_stream()
 
-        if not commands:
-            print("Hata: PLT dosyasında geçerli komut bulunamadı!")
-            return False
-
-        # İlk geçiş: Tüm çizgileri topla ve HPGL birimlerinde sakla
-        lines = []
-        x, y = 0, 0
-        pen_down = False
-
-        for cmd, params_str in commands:
-            # Parametreleri parse et
-            params_str = params_str.replace(';', '').strip()
-            params = []
-            if params_str:
-                param_parts = params_str.split(',')
-                for part in param_parts:
-                    part = part.strip()
-                    if part:
-                        try:
-                            params.append(float(part))
-                        except ValueError:
-                            pass
-
-            if cmd == 'PU':  # Pen Up
-                pen_down = False
-                if len(params) >= 2:
-                    x, y = params[0], params[1]
-
-            elif cmd == 'PD':  # Pen Down
-                pen_down = True  # ÖNCE kalemi indir
-                if len(params) >= 2:
-                    # İlk nokta - mevcut pozisyondan yeni pozisyona çiz
-                    new_x, new_y = params[0], params[1]
-                    lines.append(((x, y), (new_x, new_y)))
-                    x, y = new_x, new_y
-
-                    # Sonraki noktalar (PD komutunda birden fazla nokta olabilir)
-                    i = 2
-                    while i + 1 < len(params):
-                        new_x = params[i]
-                        new_y = params[i + 1]
-                        lines.append(((x, y), (new_x, new_y)))
-                        x, y = new_x, new_y
-                        i += 2
-
-            elif cmd == 'PA':  # Plot Absolute
-                # PA komutunda birden fazla nokta olabilir
-                for i in range(0, len(params), 2):
-                    if i + 1 < len(params):
-                        new_x, new_y = params[i], params[i + 1]
-                        if pen_down:
-                            lines.append(((x, y), (new_x, new_y)))
-                        x, y = new_x, new_y
-
-            elif cmd == 'PR':  # Plot Relative
-                for i in range(0, len(params), 2):
-                    if i + 1 < len(params):
-                        new_x, new_y = x + params[i], y + params[i + 1]
-                        if pen_down:
-                            lines.append(((x, y), (new_x, new_y)))
-                        x, y = new_x, new_y
-
-            elif cmd == 'IN':  # Initialize
-                x, y = 0, 0
-                pen_down = False
-
-        if not lines:
-            print("Hata: Çizim verisi bulunamadı!")
+        drawing = load_drawing(self.plt_file, self.unit_to_mm, self.use_cache,
+                               self.cleanup_grid, self.simplify_tolerance, self.stats)
+        if drawing is None:
             return False
+        return self.render(drawing)
 
-        print(f"{len(lines)} çizgi segmenti bulundu")
-
-        # Sınırları hesapla
-        all_x = []
-        all_y = []
-        for (x1, y1), (x2, y2) in lines:
-            all_x.extend([x1, x2])
-            all_y.extend([y1, y2])
-
-        min_x = min(all_x)
-        max_x = max(all_x)
-        min_y = min(all_y)
-        max_y = max(all_y)
-
-        width_hpgl = max_x - min_x
-        height_hpgl = max_y - min_y
-
-        # Normalize et (Y ekseni çevirme YOK - düz kullan)
-        normalized_lines = []
-        for (x1, y1), (x2, y2) in lines:
-            # X'i normalize et
-            nx1 = (x1 - min_x) * self.unit_to_mm
-            nx2 = (x2 - min_x) * self.unit_to_mm
-            # Y'yi normalize et (çevirmeden)
-            ny1 = (y1 - min_y) * self.unit_to_mm
-            ny2 = (y2 - min_y) * self.unit_to_mm
-            normalized_lines.append(((nx1, ny1), (nx2, ny2)))
-
-        width_mm = width_hpgl * self.unit_to_mm
-        height_mm = height_hpgl * self.unit_to_mm
-
-        print(f"Çizim boyutu: {width_mm:.1f} mm x {height_mm:.1f} mm")
+    def begin_page(self, width_mm, height_mm, fast_pdf=None):
+        """Çizim boyutuna 2 cm margin ekleyerek tek sayfalık PDF başlat
 
+        fast_pdf verilmezse dönüştürücünün seçeneği kullanılır.
+        """
         # 2 cm güvenli alan (margin) ekle
         margin_mm = 20  # 2 cm = 20 mm
         page_width_mm = width_mm + (2 * margin_mm)
@@ -172,29 +89,105 @@ class PLTtoPDFConverter:
         print(f"PDF boyutu (2cm margin ile): {page_width_mm:.1f} mm x {page_height_mm:.1f} mm")
 
         # PDF oluştur
-        c = canvas.Canvas(self.pdf_file, pagesize=(page_width_mm * mm, page_height_mm * mm))
+        if fast_pdf is None:
+            fast_pdf = self.fast_pdf
+        c = new_canvas(self.pdf_file, (page_width_mm * mm, page_height_mm * mm), fast_pdf)
 
         # Çizim parametreleri
         c.setStrokeColorRGB(0, 0, 0)  # Siyah
         c.setLineWidth(0.5)
         c.setLineCap(1)  # Round cap
         c.setLineJoin(1)  # Round join
+        self.stats.lap('setup')
+        return c, margin_mm
 
-        # Tüm çizgileri çiz
-        for (x1, y1), (x2, y2) in normalized_lines:
-            # Margin ekle
-            px1 = (x1 + margin_mm) * mm
-            py1 = (y1 + margin_mm) * mm
-            px2 = (x2 + margin_mm) * mm
-            py2 = (y2 + margin_mm) * mm
-            c.line(px1, py1, px2, py2)
+    def render(self, drawing):
+        """Ayrıştırılmış çizimi tek sayfa olarak PDF'e yaz"""
+        stats = self.stats
+        c, margin_mm = self.begin_page(drawing.width_mm, drawing.height_mm)
+
+        # Tüm çizgileri çiz (bağlı segmentler tek path halinde, margin eklenerek)
+        draw_geometry(c, drawing.segments, drawing.arcs, margin_mm, margin_mm)
+        stats.lap('draw')
+        stats.add_page(len(drawing.segments) + len(drawing.arcs))
 
         c.save()
+        stats.lap('save')
+        print(f"PDF başarıyla oluşturuldu: {self.pdf_file}")
+        if self.split_pens:
+            # Her kalem aynı çizimden ayrı bir PDF'e yazılır (tekrar ayrıştırılmaz)
+            return write_pen_files(self, drawing)
+        return True
+
+    def convert_stream(self):
+        """Segmentleri bellekte toplamadan iki geçişte dönüştür
+
+        Her zaman hızlı PDF yazıcı kullanılır: her grubun çizimi ayrı bir
+        içerik akışı olarak hemen dosyaya yazılır, bellek kullanımı dosya
+        boyutundan bağımsız kalır (reportlab sayfanın tamamını save()'e
+        kadar bellekte tutar).
+        """
+        stats = self.stats
+        print(f"PLT dosyası okunuyor: {self.plt_file}")
+        if next(self.parse_plt(), None) is None:
+            print("Hata: PLT dosyasında geçerli komut bulunamadı!")
+            return False
+        stats.lap('probe')
+
+        # İlk geçiş: sadece sınırlar hesaplanır, segmentler saklanmaz
+        line_count, arc_count, (min_x, min_y, max_x, max_y) = self.stream_bounds()
+
+        if not line_count and not arc_count:
+            print("Hata: Çizim verisi bulunamadı!")
+            return False
+
+        print(f"{line_count} çizgi segmenti bulundu")
+        if arc_count:
+            print(f"{arc_count} yay/daire bulundu")
+
+        width_mm = (max_x - min_x) * self.unit_to_mm
+        height_mm = (max_y - min_y) * self.unit_to_mm
+
+        print(f"Çizim boyutu: {width_mm:.1f} mm x {height_mm:.1f} mm")
+
+        c, margin_mm = self.begin_page(width_mm, height_mm, fast_pdf=True)
+
+        # İkinci geçiş: dosya tekrar okunur, her grup normalize edilip hemen çizilir
+        drawn_count = 0
+        cleanup_stats = CleanupStats(0, 0, 0)
+        for segments, arcs in iter_file_geometry_batches(self.plt_file, stats=stats):
+            segments = segments.normalized(min_x, min_y, self.unit_to_mm)
+            arcs = arcs.normalized(min_x, min_y, self.unit_to_mm)
+            stats.lap('normalize')
+            if self.cleanup_grid:
+                # Tekrar eden segmentler sadece aynı grup içinde aranır
+                segments, batch_stats = cleanup_segments(segments, self.cleanup_grid)
+                cleanup_stats = CleanupStats(*map(sum, zip(cleanup_stats, batch_stats)))
+                stats.lap('cleanup')
+            if self.simplify_tolerance:
+                segments = simplify_segments(segments, self.simplify_tolerance)
+                stats.lap('simplify')
+            drawn_count += len(segments)
+            draw_geometry(c, segments, arcs, margin_mm, margin_mm)
+            c.flush_content()
+            stats.lap('draw')
+        stats.add_page(drawn_count + arc_count)
+        if self.cleanup_grid:
+            print(f"Temizleme ({self.cleanup_grid} mm ızgara): {cleanup_stats.zero_length} sıfır uzunluklu, "
+                  f"{cleanup_stats.duplicates} tekrar eden segment atıldı, {cleanup_stats.merged} segment birleştirildi")
+        if self.simplify_tolerance:
+            print(f"Sadeleştirme ({self.simplify_tolerance} mm): "
+                  f"{line_count - sum(cleanup_stats) - drawn_count} segment kaldırıldı, {drawn_count} kaldı")
+
+        c.save()
+        stats.lap('save')
         print(f"PDF başarıyla oluşturuldu: {self.pdf_file}")
         return True
 
 
 def main():
+    args = parse_args(__doc__, streamable=True)
+
     # Çalışma dizinini al
     script_dir = os.path.dirname(os.path.abspath(__file__))
     input_dir = os.path.join(script_dir, 'input_plt')
@@ -211,6 +204,16 @@ def main():
         os.makedirs(output_dir)
         print(f"'{output_dir}' klasörü oluşturuldu.")
 
+    if args.clear_cache:
+        clear_cache()
+
+    options = {'use_cache': not args.no_cache, 'stream': args.stream,
+               'simplify_tolerance': args.simplify, 'cleanup_grid': args.cleanup,
+               'fast_pdf': args.fast_pdf, 'split_pens': args.split_pens}
+    if args.watch:
+        watch_folder(PLTtoPDFConverter, input_dir, output_dir, '.pdf', args.jobs, options)
+        return
+
     # input_plt klasöründeki tüm PLT dosyalarını bul
     plt_files = glob(os.path.join(input_dir, '*.plt')) + glob(os.path.join(input_dir, '*.PLT'))
 
@@ -223,31 +226,10 @@ def main():
     print("=" * 60)
 
     # Her dosyayı dönüştür
-    success_count = 0
-    fail_count = 0
-
-    for plt_file in plt_files:
-        # Sadece dosya adını al
-        filename = os.path.basename(plt_file)
-        pdf_filename = os.path.splitext(filename)[0] + '.pdf'
-        pdf_file = os.path.join(output_dir, pdf_filename)
-
-        print(f"\n[{plt_files.index(plt_file) + 1}/{len(plt_files)}] İşleniyor: {filename}")
-        print("-" * 60)
-
-        # Dönüştürme işlemini başlat
-        converter = PLTtoPDFConverter(plt_file, pdf_file)
-
-        try:
-            if converter.convert():
-                print(f"✓ Başarılı: {pdf_filename}")
-                success_count += 1
-            else:
-                print(f"✗ Başarısız: {filename}")
-                fail_count += 1
-        except Exception as e:
-            print(f"✗ Hata: {filename} - {str(e)}")
-            fail_count += 1
+    success_count, fail_count, skipped_count = run_batch(PLTtoPDFConverter, plt_files, output_dir, '.pdf',
+                                                         args.jobs, options, args.force,
+                                                         args.profile, args.profile_hook,
+                                                         not args.no_pipeline)
 
     # Özet
     print("\n" + "=" * 60)
@@ -255,6 +237,7 @@ def main():
     print(f"  Toplam dosya: {len(plt_files)}")
     print(f"  Başarılı: {success_count}")
     print(f"  Başarısız: {fail_count}")
+    print(f"  Değişmemiş (atlanan): {skipped_count}")
     print(f"\nÇıktı klasörü: {output_dir}")
     print("=" * 60)
 
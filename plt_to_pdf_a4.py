@@ -3,219 +3,59 @@
 PLT dosyasını A4 sayfalarına bölerek PDF'e çevirme programı
 """
 
-import re
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import mm
-from reportlab.lib.pagesizes import A4
 import sys
 import os
 from glob import glob
 
+from hpgl_parser import iter_commands
+from geometry_cache import clear_cache
+from drawing import load_drawing
+from batch import parse_args, run_batch
+from watch import watch_folder
+from page_tiles import A4Layout, render_pages
+from profiling import ConversionStats
+
 
 class PLTtoPDFA4Converter:
-    def __init__(self, plt_file, pdf_file):
+    def __init__(self, plt_file, pdf_file, use_form=False, use_cache=True, simplify_tolerance=None, cleanup_grid=None,
+                 fast_pdf=False, tile_jobs=1, split_pens=False):
         self.plt_file = plt_file
         self.pdf_file = pdf_file
+        self.use_form = use_form  # Çizimi tek bir PDF formu olarak yaz
+        self.use_cache = use_cache  # Ayrıştırılmış geometriyi diskte önbellekle
+        self.simplify_tolerance = simplify_tolerance  # Sadeleştirme toleransı (mm), None: kapalı
+        self.cleanup_grid = cleanup_grid  # Temizleme ızgarası (mm), None: kapalı
+        self.fast_pdf = fast_pdf  # reportlab yerine hızlı PDF yazıcıyı kullan
+        self.tile_jobs = tile_jobs  # Sayfaları paralel çizecek süreç sayısı (sadece fast_pdf)
+        self.split_pens = split_pens  # Her kalemi ayrıca ayrı bir PDF'e yaz
+        self.stats = ConversionStats()  # Aşama süreleri ve sayaçlar
 
         # HPGL birimlerini mm'ye çevirme (1016 HPGL units per inch)
         self.unit_to_mm = 25.4 / 1016  # ≈ 0.025
 
-        # A4 boyutları
-        self.a4_width = 210  # mm
-        self.a4_height = 297  # mm
-        self.margin = 20  # 2 cm margin
+        # Sayfa düzeni (A4 boyutları, margin/overlap, sayfa süslemeleri)
+        self.layout = A4Layout()
 
     def parse_plt(self):
-        """PLT dosyasını oku ve komutları ayrıştır"""
-        with open(self.plt_file, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-
-        # Boşlukları ve satır sonlarını temizle
-        content = content.replace('\n', '').replace('\r', '').replace(' ', '')
-
-        # HPGL komutlarını bul - 2 harfli komut + parametreler
-        pattern = r'([A-Z]{2})([^A-Z]*)'
-        commands = re.findall(pattern, content)
-        return commands
+        """PLT dosyasını parça parça oku ve komutları sırayla üret"""
+        return iter_commands(self.plt_file)
 
     def convert(self):
         """PLT'den A4 PDF'lere dönüştür"""
-        print(f"PLT dosyası okunuyor: {self.plt_file}")
-        commands = self.parse_plt()
-
-        if not commands:
-            print("Hata: PLT dosyasında geçerli komut bulunamadı!")
+        drawing = load_drawing(self.plt_file, self.unit_to_mm, self.use_cache,
+                               self.cleanup_grid, self.simplify_tolerance, self.stats)
+        if drawing is None:
             return False
+        return self.render(drawing)
 
-        # Tüm çizgileri topla
-        lines = []
-        x, y = 0, 0
-        pen_down = False
-
-        for cmd, params_str in commands:
-            # Parametreleri parse et
-            params_str = params_str.replace(';', '').strip()
-            params = []
-            if params_str:
-                param_parts = params_str.split(',')
-                for part in param_parts:
-                    part = part.strip()
-                    if part:
-                        try:
-                            params.append(float(part))
-                        except ValueError:
-                            pass
-
-            if cmd == 'PU':  # Pen Up
-                pen_down = False
-                if len(params) >= 2:
-                    x, y = params[0], params[1]
-
-            elif cmd == 'PD':  # Pen Down
-                pen_down = True
-                if len(params) >= 2:
-                    new_x, new_y = params[0], params[1]
-                    lines.append(((x, y), (new_x, new_y)))
-                    x, y = new_x, new_y
-
-                    i = 2
-                    while i + 1 < len(params):
-                        new_x = params[i]
-                        new_y = params[i + 1]
-                        lines.append(((x, y), (new_x, new_y)))
-                        x, y = new_x, new_y
-                        i += 2
-
-            elif cmd == 'PA':  # Plot Absolute
-                for i in range(0, len(params), 2):
-                    if i + 1 < len(params):
-                        new_x, new_y = params[i], params[i + 1]
-                        if pen_down:
-                            lines.append(((x, y), (new_x, new_y)))
-                        x, y = new_x, new_y
-
-            elif cmd == 'PR':  # Plot Relative
-                for i in range(0, len(params), 2):
-                    if i + 1 < len(params):
-                        new_x, new_y = x + params[i], y + params[i + 1]
-                        if pen_down:
-                            lines.append(((x, y), (new_x, new_y)))
-                        x, y = new_x, new_y
-
-            elif cmd == 'IN':  # Initialize
-                x, y = 0, 0
-                pen_down = False
-
-        if not lines:
-            print("Hata: Çizim verisi bulunamadı!")
-            return False
-
-        print(f"{len(lines)} çizgi segmenti bulundu")
-
-        # Sınırları hesapla
-        all_x = []
-        all_y = []
-        for (x1, y1), (x2, y2) in lines:
-            all_x.extend([x1, x2])
-            all_y.extend([y1, y2])
-
-        min_x = min(all_x)
-        max_x = max(all_x)
-        min_y = min(all_y)
-        max_y = max(all_y)
-
-        width_hpgl = max_x - min_x
-        height_hpgl = max_y - min_y
-
-        # Normalize et (Y ekseni çevirmeden)
-        normalized_lines = []
-        for (x1, y1), (x2, y2) in lines:
-            nx1 = (x1 - min_x) * self.unit_to_mm
-            nx2 = (x2 - min_x) * self.unit_to_mm
-            ny1 = (y1 - min_y) * self.unit_to_mm
-            ny2 = (y2 - min_y) * self.unit_to_mm
-            normalized_lines.append(((nx1, ny1), (nx2, ny2)))
-
-        width_mm = width_hpgl * self.unit_to_mm
-        height_mm = height_hpgl * self.unit_to_mm
-
-        print(f"Çizim boyutu: {width_mm:.1f} mm x {height_mm:.1f} mm")
-
-        # A4'lere bölme hesabı
-        # Margin sadece dış kenarlarda, ortada değil - bu yüzden tam A4 kullan
-        printable_width = self.a4_width  # 210 mm (tam sayfa)
-        printable_height = self.a4_height  # 297 mm (tam sayfa)
-
-        cols = int((width_mm + printable_width - 1) / printable_width)
-        rows = int((height_mm + printable_height - 1) / printable_height)
-
-        print(f"A4 grid: {rows} satır x {cols} sütun = {rows * cols} sayfa")
-
-        # PDF oluştur
-        c = canvas.Canvas(self.pdf_file, pagesize=A4)
-        page_count = 0
-
-        for row in range(rows):
-            for col in range(cols):
-                # Bu sayfada gösterilecek alan
-                page_start_x = col * printable_width
-                page_start_y = row * printable_height
-                page_end_x = page_start_x + printable_width
-                page_end_y = page_start_y + printable_height
-
-                # Bu sayfadaki çizgileri filtrele
-                page_lines = []
-                for (x1, y1), (x2, y2) in normalized_lines:
-                    # Çizgi bu sayfa alanında mı?
-                    if (min(x1, x2) < page_end_x and max(x1, x2) > page_start_x and
-                        min(y1, y2) < page_end_y and max(y1, y2) > page_start_y):
-                        page_lines.append(((x1, y1), (x2, y2)))
-
-                # Boş sayfa atlama
-                if not page_lines:
-                    continue
-
-                page_count += 1
-
-                # Çizgileri çiz
-                c.setStrokeColorRGB(0, 0, 0)
-                c.setLineWidth(0.5)
-                c.setLineCap(1)
-                c.setLineJoin(1)
-
-                # Margin hesapla (sadece dış kenarlarda)
-                left_margin = self.margin if col == 0 else 0
-                right_margin = self.margin if col == cols - 1 else 0
-                top_margin = self.margin if row == 0 else 0
-                bottom_margin = self.margin if row == rows - 1 else 0
-
-                for (x1, y1), (x2, y2) in page_lines:
-                    # Sayfa koordinatlarına çevir
-                    px1 = (x1 - page_start_x + left_margin) * mm
-                    py1 = (y1 - page_start_y + bottom_margin) * mm
-                    px2 = (x2 - page_start_x + left_margin) * mm
-                    py2 = (y2 - page_start_y + bottom_margin) * mm
-                    c.line(px1, py1, px2, py2)
-
-                # Sayfa etiketi (A1, A2, B1, B2 şeklinde)
-                c.setFillColorRGB(0, 0, 0)
-                c.setFont("Helvetica-Bold", 12)
-                page_label = f"{chr(65 + row)}{col + 1}"
-                c.drawString(10 * mm, (self.a4_height - 10) * mm, page_label)
-
-                # Bilgi metni
-                c.setFont("Helvetica", 8)
-                info = f"Sayfa {page_count} | Çizim: {width_mm:.0f}x{height_mm:.0f}mm | Grid: {row+1}/{rows}, {col+1}/{cols}"
-                c.drawString(10 * mm, 10 * mm, info)
-
-                c.showPage()
-
-        c.save()
-        print(f"{page_count} sayfalık PDF başarıyla oluşturuldu: {self.pdf_file}")
-        return True
+    def render(self, drawing):
+        """Ayrıştırılmış çizimi A4 sayfalarına bölerek PDF'e yaz"""
+        return render_pages(self, drawing, self.layout)
 
 
 def main():
+    args = parse_args(__doc__, tiled=True)
+
     # Çalışma dizinini al
     script_dir = os.path.dirname(os.path.abspath(__file__))
     input_dir = os.path.join(script_dir, 'input_plt')
@@ -231,6 +71,17 @@ def main():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    if args.clear_cache:
+        clear_cache()
+
+    options = {'use_form': args.form, 'use_cache': not args.no_cache,
+               'simplify_tolerance': args.simplify, 'cleanup_grid': args.cleanup,
+               'fast_pdf': args.fast_pdf, 'tile_jobs': args.tile_jobs,
+               'split_pens': args.split_pens}
+    if args.watch:
+        watch_folder(PLTtoPDFA4Converter, input_dir, output_dir, '_A4.pdf', args.jobs, options)
+        return
+
     # input_plt klasöründeki tüm PLT dosyalarını bul
     plt_files = glob(os.path.join(input_dir, '*.plt')) + glob(os.path.join(input_dir, '*.PLT'))
 
@@ -242,29 +93,10 @@ def main():
     print("=" * 60)
 
     # Her dosyayı dönüştür
-    success_count = 0
-    fail_count = 0
-
-    for plt_file in plt_files:
-        filename = os.path.basename(plt_file)
-        pdf_filename = os.path.splitext(filename)[0] + '_A4.pdf'
-        pdf_file = os.path.join(output_dir, pdf_filename)
-
-        print(f"\n[{plt_files.index(plt_file) + 1}/{len(plt_files)}] İşleniyor: {filename}")
-        print("-" * 60)
-
-        converter = PLTtoPDFA4Converter(plt_file, pdf_file)
-
-        try:
-            if converter.convert():
-                print(f"✓ Başarılı: {pdf_filename}")
-                success_count += 1
-            else:
-                print(f"✗ Başarısız: {filename}")
-                fail_count += 1
-        except Exception as e:
-            print(f"✗ Hata: {filename} - {str(e)}")
-            fail_count += 1
+    success_count, fail_count, skipped_count = run_batch(PLTtoPDFA4Converter, plt_files, output_dir, '_A4.pdf',
+                                                         args.jobs, options, args.force,
+                                                         args.profile, args.profile_hook,
+                                                         not args.no_pipeline)
 
     # Özet
     print("\n" + "=" * 60)
@@ -272,6 +104,7 @@ def main():
     print(f"  Toplam dosya: {len(plt_files)}")
     print(f"  Başarılı: {success_count}")
     print(f"  Başarısız: {fail_count}")
+    print(f"  Değişmemiş (atlanan): {skipped_count}")
     print(f"\nÇıktı klasörü: {output_dir}")
     print("=" * 60)
 
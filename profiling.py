@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Dönüştürme aşamalarının süre ve sayaç ölçümleri
+Her dönüştürücü bir ConversionStats tutar; aşamalar bitince lap() ile
+geçen süre o aşamaya yazılır. --profile ile sonuçlar JSON olarak
+kaydedilir, --profile-hook ile cProfile/tracemalloc eklenebilir
+"""
+
+import time
+import cProfile
+import contextlib
+import tracemalloc
+
+
+# Desteklenen ayrıntılı profil araçları
+PROFILE_HOOKS = ('cprofile', 'tracemalloc')
+
+# tracemalloc raporunda gösterilecek satır sayısı
+TRACEMALLOC_TOP = 10
+
+
+class ConversionStats:
+    """Aşama süreleri (sn), sayaçlar ve sayfa başına çizilen segmentler
+
+    lap(aşama) bir önceki lap'ten (veya oluşturulmadan) bu yana geçen
+    süreyi aşamaya ekler; aynı aşama birden fazla kez ölçülebilir.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self.page_segments = []
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def count(self, counter, amount=1):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def add_page(self, segment_count):
+        """Bir sayfaya çizilen segment sayısını kaydet"""
+        self.page_segments.append(int(segment_count))
+
+    def add_stage(self, stage, seconds):
+        """Başka yerde ölçülmüş süreyi aşamaya ve toplam süreye ekle"""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self._start -= seconds
+
+    def merge(self, other):
+        """Başka bir ölçümün (ör. ayrı iş parçacığındaki yükleme) aşamalarını ve sayaçlarını ekle"""
+        for stage, seconds in other.stages.items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        for counter, amount in other.counters.items():
+            self.count(counter, amount)
+        self.page_segments.extend(other.page_segments)
+        self._start -= other.total
+
+    @property
+    def total(self):
+        """Oluşturulmadan son lap'e kadar geçen süre"""
+        return self._last - self._start
+
+    def to_dict(self):
+        return {
+            'total_s': round(self.total, 6),
+            'stages': {stage: round(seconds, 6) for stage, seconds in self.stages.items()},
+            'counters': dict(self.counters),
+            'page_segments': list(self.page_segments),
+        }
+
+
+class _NoStats:
+    """Ölçüm istenmediğinde kullanılan, hiçbir şey yapmayan nesne"""
+
+    def lap(self, stage):
+        pass
+
+    def count(self, counter, amount=1):
+        pass
+
+    def add_page(self, segment_count):
+        pass
+
+
+NO_STATS = _NoStats()
+
+
+def format_stats(stats):
+    """to_dict() çıktısını tek satırlık özet metne çevir"""
+    stages = ', '.join(f"{stage} {seconds:.3f}" for stage, seconds in stats['stages'].items())
+    counters = ', '.join(f"{name}={value}" for name, value in stats['counters'].items())
+    return f"Aşamalar (sn): {stages}\nSayaçlar: {counters}"
+
+
+@contextlib.contextmanager
+def deep_profile(hook, output_base):
+    """cProfile veya tracemalloc altında çalıştır, sonuçları sözlüğe yaz
+
+    cProfile sonuçları output_base + '.prof' dosyasına (pstats ile
+    okunabilir) kaydedilir; tracemalloc için en yüksek bellek ve
+    dönüştürme sonunda hâlâ ayrılmış en büyük satırlar sözlüğe eklenir.
+    """
+    report = {}
+    if hook is None:
+        yield report
+    elif hook == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            report['cprofile'] = output_base + '.prof'
+            profiler.dump_stats(report['cprofile'])
+    elif hook == 'tracemalloc':
+        tracemalloc.start()
+        try:
+            yield report
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:TRACEMALLOC_TOP]
+            tracemalloc.stop()
+            report['tracemalloc'] = {'peak_bytes': peak, 'retained': [str(stat) for stat in top]}
+    else:
+        raise ValueError(f"Bilinmeyen profil aracı: {hook}")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Segment temizleme
+Koordinatlar bir ızgaraya (mm) yuvarlanır; sıfır uzunluklu segmentler,
+aynı veya ters yönde tekrar eden segmentler atılır ve aynı doğru üzerinde
+art arda gelen segmentler tek segmentte birleştirilir. Farklı kalemlerin
+(SP) segmentleri birbirinin tekrarı sayılmaz ve birleştirilmez
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from segment_store import SegmentStore
+
+
+# Varsayılan yuvarlama ızgarası (mm)
+DEFAULT_GRID_MM = 0.01
+
+# Aşama başına kaldırılan segment sayıları
+CleanupStats = namedtuple('CleanupStats', 'zero_length duplicates merged')
+
+
+def _drop_duplicates(q, pens):
+    """Aynı kalemle aynı iki uç noktayı (yönden bağımsız) birleştiren segmentlerin ilkini tut"""
+    # Yön farkını yok etmek için uç noktalar sıralanır: küçük nokta önce
+    swap = (q[:, 0] > q[:, 2]) | ((q[:, 0] == q[:, 2]) & (q[:, 1] > q[:, 3]))
+    keys = np.column_stack((np.where(swap[:, None], q[:, [2, 3, 0, 1]], q), pens))
+    keys = np.ascontiguousarray(keys).view(np.dtype((np.void, keys.dtype.itemsize * 5))).ravel()
+    _, first = np.unique(keys, return_index=True)
+    first.sort()
+    return q[first], pens[first]
+
+
+def _merge_collinear(q, pens):
+    """Bağlı, aynı kalemli ve aynı yönde devam eden segment dizilerini tek segmente çevir"""
+    if len(q) < 2:
+        return q, pens
+    dx = q[:, 2] - q[:, 0]
+    dy = q[:, 3] - q[:, 1]
+    joined = (q[1:, 0] == q[:-1, 2]) & (q[1:, 1] == q[:-1, 3]) & (pens[1:] == pens[:-1])
+    # Tamsayı ızgarada tam hesap: çapraz çarpım sıfır, iç çarpım pozitif
+    collinear = (joined & (dx[:-1] * dy[1:] == dy[:-1] * dx[1:]) &
+                 (dx[:-1] * dx[1:] + dy[:-1] * dy[1:] > 0))
+
+    run_start = np.ones(len(q), dtype=bool)
+    run_start[1:] = ~collinear
+    starts = np.flatnonzero(run_start)
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:] - 1
+    ends[-1] = len(q) - 1
+
+    merged = np.empty((len(starts), 4), dtype=q.dtype)
+    merged[:, :2] = q[starts, :2]
+    merged[:, 2:] = q[ends, 2:]
+    return merged, pens[starts]
+
+
+def cleanup_segments(segments, grid=DEFAULT_GRID_MM):
+    """Segmentleri ızgaraya yuvarlayıp temizle, (SegmentStore, CleanupStats) döndür
+
+    Segmentlerin sırası korunur; tekrar edenlerden ilk görülen kalır.
+    """
+    if not len(segments):
+        return segments, CleanupStats(0, 0, 0)
+
+    q = np.rint(segments.data / grid).astype(np.int64)
+
+    nonzero = (q[:, 0] != q[:, 2]) | (q[:, 1] != q[:, 3])
+    q = q[nonzero]
+    pens = segments.pens[nonzero]
+    zero_length = len(segments) - len(q)
+
+    count = len(q)
+    q, pens = _drop_duplicates(q, pens)
+    duplicates = count - len(q)
+
+    count = len(q)
+    q, pens = _merge_collinear(q, pens)
+    merged = count - len(q)
+
+    return SegmentStore(q * grid, pens=pens), CleanupStats(zero_length, duplicates, merged)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Çizgi segmentlerini kompakt NumPy dizilerinde tutan yapı
+Her segment bir satır: x1, y1, x2, y2 (float64); ayrıca her segmentin
+çizildiği kalem numarası (SP) ayrı bir dizide tutulur
+"""
+
+import numpy as np
+
+
+# SP komutu görülmeden çizilen geometrinin kalemi
+DEFAULT_PEN = 1
+
+# Kalem numaralarının dizi tipi
+PEN_DTYPE = np.int16
+
+
+def pen_array(pens, count):
+    """Kalem dizisini doğrula; None ise count uzunlukta varsayılan kalem dizisi"""
+    if pens is None:
+        return np.full(count, DEFAULT_PEN, dtype=PEN_DTYPE)
+    return np.asarray(pens, dtype=PEN_DTYPE).reshape(count)
+
+
+class SegmentStore:
+    """(N, 4) float64 dizisi ve (N,) kalem dizisi üzerinde segment kümesi"""
+
+    def __init__(self, data=None, bounds=None, pens=None):
+        if data is None:
+            data = np.empty((0, 4), dtype=np.float64)
+        self.data = np.asarray(data, dtype=np.float64).reshape(-1, 4)
+        self.pens = pen_array(pens, len(self.data))
+        self._bounds = bounds  # Önceden bilinen sınırlar (ör. önbellekten)
+
+    @classmethod
+    def concatenate(cls, stores):
+        """Segment kümelerini sırayla tek kümede birleştir"""
+        stores = list(stores)
+        if not stores:
+            return cls()
+        return cls(np.concatenate([store.data for store in stores]),
+                   pens=np.concatenate([store.pens for store in stores]))
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __iter__(self):
+        """Segmentleri (x1, y1, x2, y2) Python float'ları olarak sırayla üret"""
+        block = 65536
+        for start in range(0, len(self), block):
+            yield from map(tuple, self.data[start:start + block].tolist())
+
+    @property
+    def x1(self):
+        return self.data[:, 0]
+
+    @property
+    def y1(self):
+        return self.data[:, 1]
+
+    @property
+    def x2(self):
+        return self.data[:, 2]
+
+    @property
+    def y2(self):
+        return self.data[:, 3]
+
+    def bounds(self):
+        """Çizim sınırlarını bul: (min_x, min_y, max_x, max_y)"""
+        if self._bounds is not None:
+            return self._bounds
+        xs = self.data[:, 0::2]
+        ys = self.data[:, 1::2]
+        return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+
+    def normalized(self, min_x, min_y, scale):
+        """Koordinatları (min_x, min_y) başlangıcına taşı ve scale ile çarp"""
+        data = np.empty_like(self.data)
+        np.multiply(self.data[:, 0::2] - min_x, scale, out=data[:, 0::2])
+        np.multiply(self.data[:, 1::2] - min_y, scale, out=data[:, 1::2])
+        return SegmentStore(data, pens=self.pens)
+
+    def intersecting(self, start_x, start_y, end_x, end_y):
+        """Sınır kutusu verilen dikdörtgenle kesişen segmentleri seç"""
+        x1, y1, x2, y2 = self.x1, self.y1, self.x2, self.y2
+        mask = ((np.minimum(x1, x2) < end_x) & (np.maximum(x1, x2) > start_x) &
+                (np.minimum(y1, y2) < end_y) & (np.maximum(y1, y2) > start_y))
+        return self.select(mask)
+
+    def clipped(self, min_x, min_y, max_x, max_y):
+        """Segmentleri dikdörtgene kırp (Liang-Barsky), dışarıda kalanları at
+
+        Tamamen içerideki segmentlerin uç noktaları aynen korunur, böylece
+        ardışık segmentlerin bağlantısı bozulmaz.
+        """
+        x1, y1, x2, y2 = self.x1, self.y1, self.x2, self.y2
+        dx = x2 - x1
+        dy = y2 - y1
+
+        t0 = np.zeros(len(self))
+        t1 = np.ones(len(self))
+        rejected = np.zeros(len(self), dtype=bool)
+        for p, q in ((-dx, x1 - min_x), (dx, max_x - x1), (-dy, y1 - min_y), (dy, max_y - y1)):
+            # Kenara paralel segment: dışarıdaysa tamamen at
+            rejected |= (p == 0) & (q < 0)
+            r = q / np.where(p == 0, 1, p)
+            np.maximum(t0, np.where(p < 0, r, 0), out=t0)
+            np.minimum(t1, np.where(p > 0, r, 1), out=t1)
+
+        # Sıfır uzunluklu segmentler içerideyse t0=0, t1=1 kalır ve korunur
+        keep = ~rejected & (t0 < t1)
+
+        data = self.data.copy()
+        starts = t0 > 0
+        ends = t1 < 1
+        data[starts, 0] = x1[starts] + t0[starts] * dx[starts]
+        data[starts, 1] = y1[starts] + t0[starts] * dy[starts]
+        data[ends, 2] = x1[ends] + t1[ends] * dx[ends]
+        data[ends, 3] = y1[ends] + t1[ends] * dy[ends]
+        return SegmentStore(data[keep], pens=self.pens[keep])
+
+    def select(self, selector):
+        """Maske veya indeks dizisiyle alt küme al"""
+        return SegmentStore(self.data[selector], pens=self.pens[selector])
+
+    def unique_pens(self):
+        """Kullanılan kalem numaraları (sıralı)"""
+        return np.unique(self.pens)
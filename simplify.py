@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Çoklu çizgi sadeleştirme (Douglas-Peucker)
+Yazıcı çözünürlüğünün çok altındaki küçük PD adımları, çizim verilen
+toleranstan (mm) fazla sapmayacak şekilde atılır; tüm çoklu çizgiler
+aynı anda, dizi işlemleriyle sadeleştirilir
+"""
+
+import numpy as np
+
+from pdf_render import polyline_points
+from segment_store import SegmentStore
+
+
+# Varsayılan sadeleştirme toleransı (mm)
+DEFAULT_TOLERANCE_MM = 0.05
+
+
+def _farthest_points(points, starts, ends):
+    """Her (başlangıç, bitiş) aralığında kirişe en uzak iç noktayı bul
+
+    Uzaklık, nokta ile kiriş doğru parçası arasındadır; kapalı çizgilerde
+    (başlangıç = bitiş) noktaya olan uzaklık kullanılır. (nokta indeksleri,
+    uzaklık kareleri) döner.
+    """
+    counts = ends - starts - 1
+    offsets = np.zeros(len(starts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=offsets[1:])
+    interval = np.repeat(np.arange(len(starts)), counts)
+    index = np.arange(len(interval)) - offsets[interval] + starts[interval] + 1
+
+    a = points[starts][interval]
+    ab = points[ends][interval] - a
+    ap = points[index] - a
+    length_sq = np.einsum('ij,ij->i', ab, ab)
+    t = np.einsum('ij,ij->i', ap, ab) / np.where(length_sq > 0, length_sq, 1)
+    np.clip(t, 0, 1, out=t)
+    offset = ap - ab * t[:, None]
+    dist_sq = np.einsum('ij,ij->i', offset, offset)
+
+    max_sq = np.maximum.reduceat(dist_sq, offsets)
+    # Her aralıkta en büyük uzaklığın ilk görüldüğü nokta
+    candidates = np.flatnonzero(dist_sq == max_sq[interval])
+    first = np.ones(len(candidates), dtype=bool)
+    first[1:] = interval[candidates[1:]] != interval[candidates[:-1]]
+    return index[candidates[first]], max_sq
+
+
+def simplify_segments(segments, tolerance=DEFAULT_TOLERANCE_MM):
+    """Bağlı segmentleri sadeleştir, yeni SegmentStore döndür
+
+    Her çoklu çizginin ilk ve son noktası aynen korunur; atılan her nokta,
+    kalan çizgiye en fazla tolerance kadar uzaktır. Çoklu çizgiler kalem
+    değişiminde bölündüğü için segmentler kalemlerini korur.
+    """
+    point_starts, points = polyline_points(segments)
+    if not len(points):
+        return segments
+
+    point_ends = np.empty_like(point_starts)
+    point_ends[:-1] = point_starts[1:] - 1
+    point_ends[-1] = len(points) - 1
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[point_starts] = True
+    keep[point_ends] = True
+
+    # Douglas-Peucker: tüm açık aralıklar her adımda birlikte bölünür
+    open_intervals = point_ends - point_starts > 1
+    starts, ends = point_starts[open_intervals], point_ends[open_intervals]
+    tolerance_sq = tolerance * tolerance
+    while len(starts):
+        farthest, max_sq = _farthest_points(points, starts, ends)
+        split = max_sq > tolerance_sq
+        starts, ends, farthest = starts[split], ends[split], farthest[split]
+        keep[farthest] = True
+
+        starts = np.concatenate([starts, farthest])
+        ends = np.concatenate([farthest, ends])
+        open_intervals = ends - starts > 1
+        starts, ends = starts[open_intervals], ends[open_intervals]
+
+    # Kalan ardışık noktalar, aynı çoklu çizgideyse bir segment oluşturur
+    is_start = np.zeros(len(points), dtype=bool)
+    is_start[point_starts] = True
+    kept = np.flatnonzero(keep)
+    joined = ~is_start[kept[1:]]
+    data = np.empty((int(joined.sum()), 4))
+    data[:, :2] = points[kept[:-1][joined]]
+    data[:, 2:] = points[kept[1:][joined]]
+
+    # Çoklu çizginin kalemi ilk segmentinin kalemidir (k. çizginin ilk segmenti: başlangıç - k)
+    polyline_pens = segments.pens[point_starts - np.arange(len(point_starts))]
+    polyline_of_point = np.cumsum(is_start) - 1
+    return SegmentStore(data, pens=polyline_pens[polyline_of_point[kept[1:][joined]]])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Segmentler için düzgün ızgara (uniform grid) uzamsal indeksi
+Çizim bir kez hücrelere bölünür, her sayfa sadece kendi hücrelerindeki
+segmentlere bakar (tüm segment listesini her sayfada taramak yerine)
+"""
+
+import os
+
+import numpy as np
+
+from segment_store import SegmentStore
+
+
+# Bir segmentin en fazla kaç hücreye yazılacağı; daha uzun segmentler
+# ayrı bir listede tutulur ve her sorguda doğrudan test edilir
+MAX_CELLS_PER_SEGMENT = 4
+
+# save()/load() ile diske yazılan diziler
+_SAVED_ARRAYS = ('cell_segments', 'cell_offsets', 'large_segments')
+
+
+class SegmentGrid:
+    """Segmentleri sınır kutularına göre hücrelere dağıtan indeks
+
+    Hücre içerikleri CSR biçiminde tutulur: cell_offsets[k]:cell_offsets[k+1]
+    aralığı k. hücredeki segment indeksleridir.
+    """
+
+    def __init__(self, segments, cell_width, cell_height):
+        self.segments = segments
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+
+        data = segments.data
+        col_start = self._cell_index(np.minimum(data[:, 0], data[:, 2]), cell_width)
+        col_end = self._cell_index(np.maximum(data[:, 0], data[:, 2]), cell_width)
+        row_start = self._cell_index(np.minimum(data[:, 1], data[:, 3]), cell_height)
+        row_end = self._cell_index(np.maximum(data[:, 1], data[:, 3]), cell_height)
+
+        self.cols = int(col_end.max()) + 1 if len(data) else 0
+        self.rows = int(row_end.max()) + 1 if len(data) else 0
+
+        # Çok hücreye yayılan segmentler ızgaraya girmez
+        span_cols = col_end - col_start + 1
+        counts = span_cols * (row_end - row_start + 1)
+        is_large = counts > MAX_CELLS_PER_SEGMENT
+        self.large_segments = np.flatnonzero(is_large)
+        counts[is_large] = 0
+
+        # Her segment sınır kutusunun kapladığı tüm hücrelere yazılır
+        segment_ids = np.repeat(np.arange(len(data)), counts)
+        first_entry = np.cumsum(counts) - counts
+        local = np.arange(len(segment_ids)) - first_entry[segment_ids]
+        entry_cols = col_start[segment_ids] + local % span_cols[segment_ids]
+        entry_rows = row_start[segment_ids] + local // span_cols[segment_ids]
+        cells = entry_rows * self.cols + entry_cols
+
+        order = np.argsort(cells, kind='stable')
+        self.cell_segments = segment_ids[order]
+        cell_counts = np.bincount(cells, minlength=self.rows * self.cols)
+        self.cell_offsets = np.concatenate(([0], np.cumsum(cell_counts)))
+
+    def save(self, directory):
+        """Segmentleri (kalemleriyle) ve indeks dizilerini klasöre .npy olarak yaz"""
+        np.save(os.path.join(directory, 'segments.npy'), self.segments.data)
+        np.save(os.path.join(directory, 'segment_pens.npy'), self.segments.pens)
+        for name in _SAVED_ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        np.save(os.path.join(directory, 'shape.npy'),
+                np.array([self.cell_width, self.cell_height, self.cols, self.rows], dtype=np.float64))
+
+    @classmethod
+    def load(cls, directory):
+        """save() ile yazılmış indeksi yeniden hesaplamadan, bellek eşlemeli (mmap) aç
+
+        Aynı klasörü açan süreçler dizileri işletim sisteminin sayfa
+        önbelleği üzerinden paylaşır, kopyalamaz.
+        """
+        grid = cls.__new__(cls)
+        grid.segments = SegmentStore(np.load(os.path.join(directory, 'segments.npy'), mmap_mode='r'),
+                                     pens=np.load(os.path.join(directory, 'segment_pens.npy'), mmap_mode='r'))
+        for name in _SAVED_ARRAYS:
+            setattr(grid, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r'))
+        cell_width, cell_height, cols, rows = np.load(os.path.join(directory, 'shape.npy')).tolist()
+        grid.cell_width, grid.cell_height = cell_width, cell_height
+        grid.cols, grid.rows = int(cols), int(rows)
+        return grid
+
+    @staticmethod
+    def _cell_index(values, cell_size):
+        return np.maximum(np.floor(values / cell_size), 0).astype(np.int64)
+
+    def candidates(self, start_x, start_y, end_x, end_y):
+        """Dikdörtgenin kapladığı hücrelerdeki segment indeksleri (sıralı, tekrarsız)"""
+        if not self.cols:
+            return np.empty(0, dtype=np.int64)
+
+        # Negatif koordinatlar ilk hücreye yazıldığı için aralık ızgara içine sıkıştırılır
+        col_start, col_end = (min(max(int(np.floor(value / self.cell_width)), 0), self.cols - 1)
+                              for value in (start_x, end_x))
+        row_start, row_end = (min(max(int(np.floor(value / self.cell_height)), 0), self.rows - 1)
+                              for value in (start_y, end_y))
+
+        # Bir satırdaki ardışık hücreler CSR'de tek dilimdir; komşu hücrelerde
+        # tekrar eden segmentler np.unique ile birleştirilir (maliyet bulunan
+        # segment sayısıyla orantılı, toplam segment sayısıyla değil)
+        offsets = self.cell_offsets
+        parts = [self.large_segments]
+        for row in range(row_start, row_end + 1):
+            first = row * self.cols
+            parts.append(self.cell_segments[offsets[first + col_start]:offsets[first + col_end + 1]])
+        return np.unique(np.concatenate(parts)).astype(np.int64, copy=False)
+
+    def intersecting(self, start_x, start_y, end_x, end_y):
+        """SegmentStore.intersecting ile aynı sonucu indeks üzerinden bul"""
+        ids = self.candidates(start_x, start_y, end_x, end_y)
+        return self.segments.select(ids).intersecting(start_x, start_y, end_x, end_y)
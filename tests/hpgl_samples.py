@@ -0,0 +1,117 @@
+"""Testlerde kullanılan rastgele HPGL metni üretici ve ilk sürümdeki referans döngü"""
+
+import re
+
+import numpy as np
+
+
+def random_number(rng, fractions=True):
+    """Tamsayı, kesirli veya işaretli bir sayı metni"""
+    value = int(rng.integers(-40000, 40000))
+    kind = rng.integers(0, 6) if fractions else 0
+    if kind == 1:
+        return f"{value / 8}"
+    if kind == 2:
+        return f"{rng.uniform(-100, 100):.3f}"
+    if kind == 3:
+        return f"+{abs(value)}"
+    if kind == 4:
+        return f"{value}."
+    return str(value)
+
+
+def random_program(rng, command_count, fractions=True, junk=False, commands=('PU', 'PD', 'PA', 'PR', 'IN')):
+    """Rastgele kalem komutları; boşluk, satır sonu, boş parametre ve (junk) bozuk parçalar içerir"""
+    parts = []
+    for _ in range(command_count):
+        cmd = commands[int(rng.integers(0, len(commands)))]
+        if cmd == 'IN':
+            params = []
+        else:
+            params = [random_number(rng, fractions) for _ in range(int(rng.integers(0, 8)))]
+        if junk and rng.random() < 0.1:
+            params.insert(int(rng.integers(0, len(params) + 1)), ['', '1.2.3', '-', '5-4', 'x7', '--2'][int(rng.integers(0, 6))])
+        text = cmd + ','.join(params)
+        if rng.random() < 0.7:
+            text += ';'
+        if rng.random() < 0.2:
+            text += ' \r\n'[int(rng.integers(0, 3))]
+        parts.append(text)
+    return ''.join(parts)
+
+
+
+
+def random_walk_program(rng, polyline_count, step_count, step=4, fractions=False):
+    """Küçük PR adımlarıyla ilerleyen çoklu çizgiler; adımların çoğu bir önceki adımla aynı yönde
+
+    Tamsayı adımların bir kısmı sıfır uzunlukludur (temizleme testleri için);
+    fractions ile adımlar kesirli olur, noktalar arasında eşit uzaklıklar
+    (sadeleştirmede bölme noktası seçiminde eşitlik) pek oluşmaz.
+    """
+    parts = ['IN;']
+    for _ in range(polyline_count):
+        parts.append(f"PU{int(rng.integers(-5000, 5000))},{int(rng.integers(-5000, 5000))};PD;PR")
+        moves = []
+        for index in range(step_count):
+            if index == 0 or rng.random() < 0.3:
+                if fractions:
+                    direction = f"{rng.uniform(-step, step):.3f},{rng.uniform(-step, step):.3f}"
+                else:
+                    direction = f"{int(rng.integers(-step, step + 1))},{int(rng.integers(-step, step + 1))}"
+            moves.append(direction)
+        parts.append(','.join(moves) + ';')
+    return ''.join(parts)
+
+
+def write_drawing(path, seed=0, command_count=300, extra=''):
+    """Rastgele tamsayı koordinatlı çizim içeren PLT dosyası yaz; dosya yolunu metin olarak döndür
+
+    extra programın sonuna eklenir (ör. yay veya kalem komutları).
+    """
+    path.write_text('IN;' + random_program(np.random.default_rng(seed), command_count, fractions=False) + extra)
+    return str(path)
+
+
+def reference_segments(text):
+    """İlk sürümdeki (komut başına Python döngüsü) yorumlama; (N, 4) dizi"""
+    content = text.replace('\n', '').replace('\r', '').replace(' ', '')
+    lines = []
+    x, y = 0, 0
+    pen_down = False
+    for cmd, params_str in re.findall(r'([A-Z]{2})([^A-Z]*)', content):
+        params_str = params_str.replace(';', '').strip()
+        params = []
+        if params_str:
+            for part in params_str.split(','):
+                part = part.strip()
+                if part:
+                    try:
+                        params.append(float(part))
+                    except ValueError:
+                        pass
+
+        if cmd == 'PU':
+            pen_down = False
+            if len(params) >= 2:
+                x, y = params[0], params[1]
+        elif cmd == 'PD':
+            pen_down = True
+            for i in range(0, len(params) - 1, 2):
+                lines.append((x, y, params[i], params[i + 1]))
+                x, y = params[i], params[i + 1]
+        elif cmd == 'PA':
+            for i in range(0, len(params) - 1, 2):
+                if pen_down:
+                    lines.append((x, y, params[i], params[i + 1]))
+                x, y = params[i], params[i + 1]
+        elif cmd == 'PR':
+            for i in range(0, len(params) - 1, 2):
+                new_x, new_y = x + params[i], y + params[i + 1]
+                if pen_down:
+                    lines.append((x, y, new_x, new_y))
+                x, y = new_x, new_y
+        elif cmd == 'IN':
+            x, y = 0, 0
+            pen_down = False
+    return np.array(lines, dtype=np.float64).reshape(-1, 4)
@@ -0,0 +1,149 @@
+"""Yay komutlarının (AA/AR/AT/RT/CI) ve ArcStore işlemlerinin analitik sonuçlarla aynı olduğunu doğrular"""
+
+import math
+
+import numpy as np
+import pytest
+
+from arc_store import ArcStore
+from hpgl_interpreter import HPGLInterpreter
+
+
+def _sampled_points(arc, count=4001):
+    """Yay üzerinde eşit aralıklı noktalar: (x, y) dizileri"""
+    angles = arc[3] + np.linspace(0, arc[4], count)
+    return arc[0] + arc[2] * np.cos(angles), arc[1] + arc[2] * np.sin(angles)
+
+
+def _assert_arcs(arcs, expected):
+    """Yayları karşılaştır; başlangıç açıları 2π farkıyla eşit sayılır"""
+    expected = np.array(expected, dtype=np.float64).reshape(-1, 5)
+    assert arcs.data.shape == expected.shape
+    turns = np.round((arcs.data[:, 3] - expected[:, 3]) / (2 * math.pi))
+    expected[:, 3] += turns * 2 * math.pi
+    assert arcs.data == pytest.approx(expected)
+
+
+def _random_arcs(rng, count):
+    arcs = np.empty((count, 5))
+    arcs[:, :2] = rng.uniform(-100, 100, (count, 2))
+    arcs[:, 2] = rng.uniform(0.5, 50, count)
+    arcs[:, 3] = rng.uniform(-2 * math.pi, 2 * math.pi, count)
+    arcs[:, 4] = rng.uniform(-2 * math.pi, 2 * math.pi, count)
+    arcs[:4, 4] = [2 * math.pi, -2 * math.pi, math.pi / 2, -1e-3]
+    return arcs
+
+
+def test_aa_ar_arcs_start_at_pen():
+    interpreter = HPGLInterpreter()
+    segments, arcs = interpreter.feed_buffer(b'IN;PU10,0;PD;AA0,0,90;AR0,-10,-180;PR5,0;')
+    _assert_arcs(arcs.select([0]), [0, 0, 10, 0, math.pi / 2])
+    _assert_arcs(arcs.select([1]), [0, 0, 10, math.pi / 2, -math.pi])
+    # Yaydan sonraki hareket yayın bitiş noktasından başlar
+    assert segments.data == pytest.approx(np.array([[0, -10, 5, -10]]))
+    assert (interpreter.x, interpreter.y) == pytest.approx((5, -10))
+
+
+def test_three_point_arcs_follow_point_order():
+    # Saat yönünde sıralı noktalar negatif, tersine sıralı noktalar pozitif tarama verir
+    _, arcs = HPGLInterpreter().feed_buffer(b'PU0,0;PD;AT10,10,20,0;AT10,-10,0,0;')
+    _assert_arcs(arcs.select([0]), [10, 0, 10, math.pi, -math.pi])
+    _assert_arcs(arcs.select([1]), [10, 0, 10, 0, -math.pi])
+
+    _, arcs = HPGLInterpreter().feed_buffer(b'PU0,0;PD;RT10,-10,20,0;')
+    _assert_arcs(arcs.select([0]), [10, 0, 10, math.pi, math.pi])
+
+
+def test_three_point_degenerate_cases():
+    interpreter = HPGLInterpreter()
+    # Bitiş = başlangıç: başlangıç ile ara nokta çap olan tam daire; aynı doğru: düz çizgi
+    segments, arcs = interpreter.feed_buffer(b'PU0,0;PD;AT20,0,0,0;AT5,0,10,0;')
+    _assert_arcs(arcs, [[10, 0, 10, math.pi, 2 * math.pi]])
+    assert segments.data.tolist() == [[0, 0, 10, 0]]
+
+
+def test_pen_up_arcs_only_move():
+    interpreter = HPGLInterpreter()
+    segments, arcs = interpreter.feed_buffer(b'PU10,0;AA0,0,90;AT10,10,20,0;PD25,0;')
+    assert not len(arcs)
+    assert segments.data == pytest.approx(np.array([[20, 0, 25, 0]]))
+
+
+def test_circles_are_centered_on_pen_and_do_not_move_it():
+    interpreter = HPGLInterpreter()
+    segments, arcs = interpreter.feed_buffer(b'SP2;PU5,5;CI3;PD8,5;CI-2;CI0;PU;CI1;')
+    _assert_arcs(arcs, [[5, 5, 3, 0, 2 * math.pi], [8, 5, 2, 0, 2 * math.pi],
+                        [8, 5, 1, 0, 2 * math.pi]])
+    assert arcs.pens.tolist() == [2, 2, 2]
+    assert segments.data.tolist() == [[5, 5, 8, 5]]
+
+
+def test_boxes_match_sampled_points():
+    arcs = ArcStore(_random_arcs(np.random.default_rng(0), 200))
+    boxes = arcs.boxes()
+    for arc, box in zip(arcs.data, boxes):
+        xs, ys = _sampled_points(arc)
+        tolerance = 1e-6 * arc[2] + 1e-9
+        # Kutu tüm noktaları kapsar ve her kenarı yaya değer
+        assert box[0] <= xs.min() + tolerance and box[2] >= xs.max() - tolerance
+        assert box[1] <= ys.min() + tolerance and box[3] >= ys.max() - tolerance
+        assert box == pytest.approx([xs.min(), ys.min(), xs.max(), ys.max()], abs=1e-5 * arc[2])
+
+
+@pytest.mark.parametrize('sweep', [2 * math.pi, -2 * math.pi])
+@pytest.mark.parametrize('window', [(-20, -20, 5, 20), (-5, -20, 20, 20), (-20, 5, 20, 20),
+                                    (0, 0, 20, 20), (-6, -8, 6, 8)])
+def test_clipped_circle_covers_in_window_angles(sweep, window):
+    circle = ArcStore([[0, 0, 10, 0.5, sweep]])
+    pieces = circle.clipped(*window)
+    angles = np.linspace(0, 2 * math.pi, 3601)[:-1] + 1e-4
+    xs, ys = 10 * np.cos(angles), 10 * np.sin(angles)
+    in_window = (xs >= window[0]) & (xs <= window[2]) & (ys >= window[1]) & (ys <= window[3])
+
+    covered = np.zeros(len(angles), dtype=int)
+    for x, y, radius, start, piece_sweep in pieces.data:
+        assert (x, y, radius) == (0, 0, 10)
+        offsets = np.mod((angles - start) * math.copysign(1, piece_sweep), 2 * math.pi)
+        covered += offsets < abs(piece_sweep)
+    assert np.array_equal(covered, in_window.astype(int))
+
+    # Parça uçları pencere kenarında veya içinde
+    for arc in pieces.data:
+        xs, ys = _sampled_points(arc, 3)
+        assert (xs >= window[0] - 1e-9).all() and (xs <= window[2] + 1e-9).all()
+        assert (ys >= window[1] - 1e-9).all() and (ys <= window[3] + 1e-9).all()
+
+
+def test_clipped_keeps_inside_and_drops_outside_arcs():
+    arcs = ArcStore([[0, 0, 1, 0, math.pi], [50, 50, 1, 0, 2 * math.pi]], pens=[3, 4])
+    clipped = arcs.clipped(-10, -10, 10, 10)
+    assert clipped.data.tolist() == [[0, 0, 1, 0, math.pi]]
+    assert clipped.pens.tolist() == [3]
+
+
+def test_bezier_curves_stay_on_arc():
+    arcs = ArcStore(_random_arcs(np.random.default_rng(1), 100))
+    piece_counts, starts, controls = arcs.bezier_curves()
+    assert np.all(np.abs(arcs.data[:, 4]) / piece_counts <= math.pi / 2 + 1e-9)
+
+    arc_of_piece = np.repeat(np.arange(len(arcs)), piece_counts)
+    first_piece = np.cumsum(piece_counts) - piece_counts
+    begins = np.empty((len(controls), 2))
+    begins[first_piece] = starts
+    later = np.setdiff1d(np.arange(len(controls)), first_piece)
+    begins[later] = controls[later - 1, 4:6]
+    centers, radius = arcs.data[arc_of_piece, :2], arcs.data[arc_of_piece, 2]
+
+    # Son parça yayın bitiş noktasında biter
+    last_piece = first_piece + piece_counts - 1
+    end_angles = arcs.end_angles()
+    assert controls[last_piece, 4] == pytest.approx(arcs.data[:, 0] + arcs.data[:, 2] * np.cos(end_angles))
+    assert controls[last_piece, 5] == pytest.approx(arcs.data[:, 1] + arcs.data[:, 2] * np.sin(end_angles))
+
+    # Eğri noktalarının merkeze uzaklığı yarıçaptan en fazla ~%0.03 sapar
+    for t in np.linspace(0, 1, 9):
+        weights = [(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3]
+        point = (weights[0] * begins + weights[1] * controls[:, 0:2] +
+                 weights[2] * controls[:, 2:4] + weights[3] * controls[:, 4:6])
+        distance = np.hypot(*(point - centers).T)
+        assert np.all(np.abs(distance - radius) <= 3e-4 * radius)
@@ -0,0 +1,97 @@
+"""Toplu dönüştürme seçeneklerinin denetimini, paralel dönüştürmenin ve paralel sayfa çiziminin sonucunu doğrular"""
+
+import contextlib
+import io
+import re
+
+import pytest
+
+from batch import build_parser, check_args, run_batch
+from hpgl_samples import write_drawing
+from plt_to_pdf import PLTtoPDFConverter
+from plt_to_pdf_a4 import PLTtoPDFA4Converter
+from plt_to_pdf_a4_overlap import PLTtoPDFA4OverlapConverter
+from plt_to_pdf_a4_overlay import PLTtoPDFA4OverlayConverter
+
+
+def _check(argv, tiled=True, streamable=False):
+    parser = build_parser('test', tiled, streamable)
+    return check_args(parser, parser.parse_args(argv))
+
+
+@pytest.mark.parametrize('argv, streamable, message', [
+    (['--tile-jobs', '2'], False, 'sadece --fast-pdf'),
+    (['--tile-jobs', '0'], False, 'sadece --fast-pdf'),
+    (['--tile-jobs', '2', '--fast-pdf', '--form'], False, '--form ile kullanılamaz'),
+    (['--tile-jobs', '0', '--fast-pdf', '--form'], False, '--form ile kullanılamaz'),
+    (['--tile-jobs', '2', '--fast-pdf', '--jobs', '2'], False, '--jobs ile birlikte'),  # 2 x 2 süreç
+    (['--tile-jobs', '2', '--fast-pdf', '--jobs', '0'], False, '--jobs ile birlikte'),
+    (['--stream'], True, 'sadece --fast-pdf'),
+    (['--stream', '--fast-pdf', '--split-pens'], True, '--stream ile kullanılamaz'),
+])
+def test_conflicting_options_are_rejected(capsys, argv, streamable, message):
+    with pytest.raises(SystemExit) as error:
+        _check(argv, streamable=streamable)
+    assert error.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_tile_jobs_zero_shares_cpus_between_files(monkeypatch):
+    monkeypatch.setattr('os.cpu_count', lambda: 8)
+    assert _check(['--tile-jobs', '0', '--fast-pdf', '--jobs', '2']).tile_jobs == 4
+    assert _check(['--tile-jobs', '0', '--fast-pdf', '--jobs', '0']).tile_jobs == 1
+    assert _check(['--tile-jobs', '0', '--fast-pdf']).tile_jobs == 8
+    assert _check(['--tile-jobs', '3', '--fast-pdf']).tile_jobs == 3
+    assert _check(['--form', '--jobs', '4']).tile_jobs == 1
+
+
+@pytest.mark.parametrize('converter_class', [PLTtoPDFA4Converter, PLTtoPDFA4OverlapConverter,
+                                             PLTtoPDFA4OverlayConverter])
+def test_tile_jobs_match_serial_fast_pdf(tmp_path, converter_class):
+    pypdf = pytest.importorskip('pypdf')
+    plt_file = write_drawing(tmp_path / 'drawing.plt', command_count=80, extra='SP2;PD;CI300;AA0,0,90;')
+    pages = []
+    for tile_jobs in (1, 2):
+        pdf_file = tmp_path / f'drawing_{tile_jobs}.pdf'
+        converter = converter_class(plt_file, str(pdf_file), use_cache=False, fast_pdf=True, tile_jobs=tile_jobs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert converter.convert()
+        reader = pypdf.PdfReader(pdf_file, strict=True)
+        # İşçiler sayfa içeriğini ayrı akışlara yazabilir; birleştirilmiş komutlar aynı olmalı
+        pages.append([(page.mediabox, page.get_contents().get_data().split()) for page in reader.pages])
+    assert len(pages[0]) > 1
+    assert pages[1] == pages[0]
+
+
+def _run(tmp_path, plt_files, jobs):
+    output_dir = tmp_path / f'output_{jobs}'
+    output_dir.mkdir()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        counts = run_batch(PLTtoPDFConverter, plt_files, str(output_dir), '.pdf', jobs=jobs,
+                           options={'use_cache': False, 'fast_pdf': True})
+    # Süreler ve çıktı klasörü modlar arasında farklıdır
+    text = re.sub(r' \(\d+\.\d sn\)', '', output.getvalue()).replace(str(output_dir), '<output>')
+    return counts, text.replace(f"{jobs} paralel süreç kullanılıyor\n", '')
+
+
+def test_jobs_report_in_file_order(tmp_path):
+    # İlk dosya en büyüğüdür, paralel modda en son biter; çıktı yine de dosya sırasıyla yazılır
+    plt_files = [write_drawing(tmp_path / 'a.plt', seed=0, command_count=3000),
+                 str(tmp_path / 'b.plt'),
+                 write_drawing(tmp_path / 'c.plt', seed=1, command_count=20),
+                 str(tmp_path / 'missing.plt'),
+                 write_drawing(tmp_path / 'e.plt', seed=2, command_count=20)]
+    (tmp_path / 'b.plt').write_text('')
+
+    serial_counts, serial_output = _run(tmp_path, plt_files, 1)
+    parallel_counts, parallel_output = _run(tmp_path, plt_files, 3)
+    assert serial_counts == parallel_counts == (3, 2, 0)
+    assert parallel_output == serial_output
+
+    names = re.findall(r'\[(\d)/5\] İşleniyor: (\S+)', parallel_output)
+    assert names == [('1', 'a.plt'), ('2', 'b.plt'), ('3', 'c.plt'), ('4', 'missing.plt'), ('5', 'e.plt')]
+    # Geçerli komut içermeyen dosya başarısız, okunamayan dosya hata mesajıyla raporlanır
+    assert '✗ Başarısız: b.plt' in parallel_output
+    assert re.search(r'✗ Hata: missing\.plt - .*No such file', parallel_output)
+    assert sorted(path.name for path in (tmp_path / 'output_3').glob('*.pdf')) == ['a.pdf', 'c.pdf', 'e.pdf']
@@ -0,0 +1,84 @@
+"""Geometri önbelleğinin isabet, geçersiz kılma ve LRU silme davranışını doğrular"""
+
+import os
+
+import geometry_cache
+from geometry_cache import cache_path, evict, file_digest, load_geometry
+from hpgl_samples import write_drawing
+from profiling import ConversionStats
+
+
+def _load(plt_file, cache_dir):
+    stats = ConversionStats()
+    segments, arcs = load_geometry(plt_file, cache_dir=str(cache_dir), stats=stats)
+    return segments, arcs, stats.counters
+
+
+def _fail_interpret(*args, **kwargs):
+    raise AssertionError("önbellekteki dosya tekrar ayrıştırıldı")
+
+
+def test_second_load_is_a_cache_hit(tmp_path, monkeypatch):
+    plt_file = write_drawing(tmp_path / 'drawing.plt', extra='SP2;PD;CI50;')
+    segments, arcs, counters = _load(plt_file, tmp_path / 'cache')
+    assert 'cache_hits' not in counters and counters['segments'] == len(segments)
+
+    monkeypatch.setattr(geometry_cache, 'interpret_file', _fail_interpret)
+    cached_segments, cached_arcs, counters = _load(plt_file, tmp_path / 'cache')
+    assert counters == {'cache_hits': 1}
+    assert cached_segments.data.tolist() == segments.data.tolist()
+    assert cached_segments.pens.tolist() == segments.pens.tolist()
+    assert cached_segments.bounds() == segments.bounds()
+    assert cached_arcs.data.tolist() == arcs.data.tolist()
+
+
+def test_changed_content_or_interpreter_version_misses(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    plt_file = write_drawing(tmp_path / 'drawing.plt')
+    _load(plt_file, cache_dir)
+    old_entry = cache_path(file_digest(plt_file), str(cache_dir))
+
+    # Yorumlayıcı sürümü değişince eski kayıt kullanılmaz
+    monkeypatch.setattr(geometry_cache, 'INTERPRETER_VERSION', geometry_cache.INTERPRETER_VERSION + 1)
+    assert 'cache_hits' not in _load(plt_file, cache_dir)[2]
+    assert cache_path(file_digest(plt_file), str(cache_dir)) != old_entry
+    assert _load(plt_file, cache_dir)[2] == {'cache_hits': 1}
+
+    # İçerik değişince özet de değişir
+    write_drawing(tmp_path / 'drawing.plt', seed=1)
+    segments, _, counters = _load(plt_file, cache_dir)
+    assert 'cache_hits' not in counters and counters['segments'] == len(segments)
+
+
+def test_corrupt_entry_is_replaced(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    plt_file = write_drawing(tmp_path / 'drawing.plt')
+    segments = _load(plt_file, cache_dir)[0]
+    entry = cache_path(file_digest(plt_file), str(cache_dir))
+    with open(entry, 'wb') as f:
+        f.write(b'PK\x03\x04')  # yarım kalmış kayıt
+
+    reparsed, _, counters = _load(plt_file, cache_dir)
+    assert 'cache_hits' not in counters
+    assert reparsed.data.tolist() == segments.data.tolist()
+    assert _load(plt_file, cache_dir)[2] == {'cache_hits': 1}
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    plt_files = [write_drawing(tmp_path / f'{name}.plt', seed=seed) for seed, name in enumerate('abc')]
+    entries = []
+    for age, plt_file in zip((300, 200, 100), plt_files):
+        _load(plt_file, cache_dir)
+        entry = cache_path(file_digest(plt_file), str(cache_dir))
+        os.utime(entry, (os.path.getmtime(entry) - age,) * 2)
+        entries.append(entry)
+
+    # En eski kayıt okununca en yeni kullanılan olur; sınır aşılınca sıradaki en eski silinir
+    assert _load(plt_files[0], cache_dir)[2] == {'cache_hits': 1}
+    sizes = [os.path.getsize(entry) for entry in entries]
+    evict(str(cache_dir), sum(sizes) - 1)
+    assert [os.path.exists(entry) for entry in entries] == [True, False, True]
+
+    evict(str(cache_dir), sizes[0])
+    assert [os.path.exists(entry) for entry in entries] == [True, False, False]
@@ -0,0 +1,67 @@
+"""Toplu yorumlayıcının ilk sürümdeki komut döngüsüyle birebir aynı segmentleri ürettiğini doğrular"""
+
+import numpy as np
+import pytest
+
+from hpgl_interpreter import HPGLInterpreter, interpret, interpret_file
+from hpgl_parser import COMMAND_PATTERN, iter_commands
+from hpgl_samples import random_program, reference_segments
+
+
+CASES = [
+    # (tohum, komut sayısı, kesirli sayılar, bozuk parçalar)
+    (0, 300, False, False),
+    (1, 300, True, False),
+    (2, 300, True, True),
+    (3, 2000, False, False),
+    (4, 2000, True, True),
+]
+
+
+def _commands(text):
+    return COMMAND_PATTERN.findall(text.replace('\n', '').replace('\r', '').replace(' ', ''))
+
+
+@pytest.mark.parametrize('seed, count, fractions, junk', CASES)
+@pytest.mark.parametrize('batch_size', [1, 7, 256])
+def test_text_path_matches_reference(seed, count, fractions, junk, batch_size):
+    text = random_program(np.random.default_rng(seed), count, fractions, junk)
+    segments, arcs = interpret(_commands(text), batch_size)
+    assert np.array_equal(segments.data, reference_segments(text))
+    assert not len(arcs)
+
+
+@pytest.mark.parametrize('seed, count, fractions, junk', CASES)
+@pytest.mark.parametrize('chunk_size', [5, 64, 4096, 1 << 20])
+def test_bytes_path_matches_reference(tmp_path, seed, count, fractions, junk, chunk_size):
+    text = random_program(np.random.default_rng(seed), count, fractions, junk)
+    path = tmp_path / 'sample.plt'
+    path.write_bytes(text.encode('ascii'))
+    segments, _ = interpret_file(str(path), chunk_size)
+    assert np.array_equal(segments.data, reference_segments(text))
+
+    # Ayrıştırıcıdan geçen metin yolu da aynı sonucu verir
+    segments, _ = interpret(iter_commands(str(path), chunk_size))
+    assert np.array_equal(segments.data, reference_segments(text))
+
+
+def test_relative_sums_are_exact():
+    # Kesirli göreli adımlar Python'daki x + dx sırasıyla toplanır
+    text = 'PU0.1,0.2;PD;' + 'PR0.1,0.7,' * 500 + '0.3,0.3;PA5,5;PR1e3,2;PR1,1;'
+    segments, _ = interpret(_commands(text))
+    assert np.array_equal(segments.data, reference_segments(text))
+
+
+def test_state_carries_between_buffers():
+    interpreter = HPGLInterpreter()
+    first, _ = interpreter.feed_buffer(b'IN;PU10,10;PD20,20;')
+    second, _ = interpreter.feed_buffer(b'PR5,5;PU;PA0,0;PD1,1;')
+    assert first.data.tolist() == [[10, 10, 20, 20]]
+    assert second.data.tolist() == [[20, 20, 25, 25], [0, 0, 1, 1]]
+
+
+def test_number_forms():
+    text = 'PU.5,-0;PD+0.25,007,5.,-.75,123456789012345,-1;PD-2.50,3;'
+    buffer = text.encode('ascii')
+    segments, _ = HPGLInterpreter().feed_buffer(buffer)
+    assert np.array_equal(segments.data, reference_segments(text))
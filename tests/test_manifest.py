@@ -0,0 +1,96 @@
+"""Manifeste göre değişmemiş dosyaların atlandığını ve kaynağı silinmiş çıktıların kaldırıldığını doğrular"""
+
+import contextlib
+import io
+import json
+import os
+
+from batch import run_batch
+from hpgl_samples import write_drawing
+from manifest import MANIFEST_FILE
+from plt_to_pdf import PLTtoPDFConverter
+
+
+OPTIONS = {'use_cache': False, 'fast_pdf': True}
+
+
+def _run(plt_files, output_dir, options=OPTIONS):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        counts = run_batch(PLTtoPDFConverter, [str(path) for path in plt_files], str(output_dir), '.pdf',
+                           options=options)
+    return counts, output.getvalue()
+
+
+def _entries(output_dir):
+    with open(output_dir / MANIFEST_FILE, encoding='utf-8') as f:
+        return json.load(f)['.pdf']
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    plt_files = [tmp_path / 'a.plt', tmp_path / 'b.plt']
+    write_drawing(plt_files[0], seed=0)
+    write_drawing(plt_files[1], seed=1)
+    assert _run(plt_files, output_dir)[0] == (2, 0, 0)
+    written = os.stat(output_dir / 'a.pdf').st_mtime_ns
+
+    counts, output = _run(plt_files, output_dir)
+    assert counts == (0, 0, 2)
+    assert '2 dosya değişmemiş' in output
+    assert os.stat(output_dir / 'a.pdf').st_mtime_ns == written
+
+    # Çıktıyı etkileyen bir ayar değişirse dosyalar tekrar dönüştürülür
+    assert _run(plt_files, output_dir, dict(OPTIONS, simplify_tolerance=0.1))[0] == (2, 0, 0)
+    assert _run(plt_files, output_dir, dict(OPTIONS, simplify_tolerance=0.1))[0] == (0, 0, 2)
+
+
+def test_touched_but_unchanged_file_is_skipped(tmp_path):
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    plt_file = tmp_path / 'a.plt'
+    write_drawing(plt_file)
+    assert _run([plt_file], output_dir)[0] == (1, 0, 0)
+
+    # Zamanı değişen ama içeriği aynı dosya özetle karşılaştırılır; yeni zaman kaydedilir
+    stat = os.stat(plt_file)
+    os.utime(plt_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert _run([plt_file], output_dir)[0] == (0, 0, 1)
+    assert _entries(output_dir)['a.pdf']['mtime_ns'] == stat.st_mtime_ns + 10 ** 9
+
+    # Aynı boyutta farklı içerik tekrar dönüştürülür
+    text = plt_file.read_text()
+    plt_file.write_text(text.replace('PD', 'PU', 1))
+    assert os.stat(plt_file).st_size == stat.st_size
+    assert _run([plt_file], output_dir)[0] == (1, 0, 0)
+
+
+def test_failed_conversion_is_retried(tmp_path):
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    plt_file = tmp_path / 'a.plt'
+    plt_file.write_text('')
+    assert _run([plt_file], output_dir)[0] == (0, 1, 0)
+    assert _entries(output_dir) == {}
+    assert _run([plt_file], output_dir)[0] == (0, 1, 0)
+
+
+def test_orphan_outputs_are_removed(tmp_path):
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    plt_files = [tmp_path / 'a.plt', tmp_path / 'b.plt']
+    write_drawing(plt_files[0], seed=0)
+    write_drawing(plt_files[1], seed=1)
+    assert _run(plt_files, output_dir)[0] == (2, 0, 0)
+    # Silinen kaynağın kalem PDF'i de kaldırılır; başka çıktılar ve manifestte olmayan dosyalar korunur
+    (output_dir / 'a_pen2.pdf').write_bytes(b'%PDF')
+    (output_dir / 'a_pen2_A4.pdf').write_bytes(b'%PDF')
+    (output_dir / 'notes.pdf').write_bytes(b'%PDF')
+
+    os.remove(plt_files[0])
+    counts, output = _run(plt_files[1:], output_dir)
+    assert counts == (0, 0, 1)
+    assert 'Kaynağı silinmiş çıktı kaldırıldı: a.pdf' in output
+    assert sorted(os.listdir(output_dir)) == [MANIFEST_FILE, 'a_pen2_A4.pdf', 'b.pdf', 'notes.pdf']
+    assert list(_entries(output_dir)) == ['b.pdf']
@@ -0,0 +1,114 @@
+"""Ortak sayfa döngüsündeki düzenlerin eski betik döngüleriyle aynı sayfaları ürettiğini doğrular"""
+
+import re
+
+import numpy as np
+import pytest
+
+from drawing import load_drawing
+from hpgl_samples import random_program
+from page_tiles import A4Layout, A4OverlapLayout, A4OverlayLayout, grid_size
+from plt_to_pdf_a4 import PLTtoPDFA4Converter
+from plt_to_pdf_a4_overlap import PLTtoPDFA4OverlapConverter
+from plt_to_pdf_a4_overlay import PLTtoPDFA4OverlayConverter
+
+
+def _old_a4_tiles(width_mm, height_mm):
+    """plt_to_pdf_a4.py'deki eski döngü: (satır, sütun, pencere, form kırpma alanı)"""
+    page_width, page_height, margin = 210, 297, 20
+    cols = int((width_mm + page_width - 1) / page_width)
+    rows = int((height_mm + page_height - 1) / page_height)
+    for row in range(rows):
+        for col in range(cols):
+            page_start_x = col * page_width
+            page_start_y = row * page_height
+            left_margin = margin if col == 0 else 0
+            bottom_margin = margin if row == rows - 1 else 0
+            offset_x = left_margin - page_start_x
+            offset_y = bottom_margin - page_start_y
+            window = (page_start_x, page_start_y, page_start_x + page_width, page_start_y + page_height,
+                      offset_x, offset_y)
+            yield rows, cols, window, (offset_x + page_start_x, offset_y + page_start_y, page_width, page_height)
+
+
+def _old_overlap_tiles(width_mm, height_mm):
+    """plt_to_pdf_a4_overlap.py'deki eski döngü"""
+    page_width, page_height, overlap = 210, 297, 20
+    step_width, step_height = page_width - overlap, page_height - overlap
+    cols = int((width_mm + step_width - 1) / step_width)
+    rows = int((height_mm + step_height - 1) / step_height)
+    for row in range(rows):
+        for col in range(cols):
+            page_start_x = col * step_width
+            page_start_y = row * step_height
+            window = (page_start_x, page_start_y, page_start_x + page_width, page_start_y + page_height,
+                      -page_start_x, -page_start_y)
+            yield rows, cols, window, (0, 0, page_width, page_height)
+
+
+def _old_overlay_tiles(width_mm, height_mm):
+    """plt_to_pdf_a4_overlay.py'deki eski döngü"""
+    page_width, page_height, margin, overlap = 210, 297, 20, 20
+    printable_width, printable_height = page_width - 2 * margin, page_height - 2 * margin
+    effective_width, effective_height = printable_width - overlap, printable_height - overlap
+    cols = int((width_mm + effective_width - 1) / effective_width)
+    rows = int((height_mm + effective_height - 1) / effective_height)
+    for row in range(rows):
+        for col in range(cols):
+            page_start_x = col * effective_width
+            page_start_y = row * effective_height
+            window = (page_start_x, page_start_y, page_start_x + printable_width, page_start_y + printable_height,
+                      margin - page_start_x, margin - page_start_y)
+            yield rows, cols, window, (margin, margin, printable_width, printable_height)
+
+
+LAYOUTS = [
+    (A4Layout, _old_a4_tiles, PLTtoPDFA4Converter),
+    (A4OverlapLayout, _old_overlap_tiles, PLTtoPDFA4OverlapConverter),
+    (A4OverlayLayout, _old_overlay_tiles, PLTtoPDFA4OverlayConverter),
+]
+
+# Sayfa kenarlarına denk gelen, hemen aşan ve kesirli çizim boyutları (mm)
+SIZES = [(0.5, 0.5), (150, 237), (150.5, 237.5), (190, 277), (210, 297), (211, 298),
+         (420.2, 100), (1000.3, 1999.9), (2000, 3.25)]
+
+
+@pytest.mark.parametrize('layout_class, old_tiles, _', LAYOUTS)
+@pytest.mark.parametrize('width, height', SIZES)
+def test_layout_matches_old_loop(layout_class, old_tiles, _, width, height):
+    layout = layout_class()
+    expected = list(old_tiles(width, height))
+    rows, cols = grid_size(layout, width, height)
+    assert rows * cols == len(expected)
+
+    for index, (old_rows, old_cols, old_window, old_clip) in enumerate(expected):
+        row, col = divmod(index, cols)
+        assert (rows, cols) == (old_rows, old_cols)
+        window = layout.tile_window(row, col, rows, cols)
+        assert window == old_window
+        assert layout.form_clip(window) == old_clip
+
+
+def _pdf_page_count(path):
+    return len(re.findall(rb'/Type\s*/Page\b', path.read_bytes()))
+
+
+@pytest.mark.parametrize('layout_class, old_tiles, converter_class', LAYOUTS)
+@pytest.mark.parametrize('options', [{}, {'fast_pdf': True}, {'use_form': True},
+                                     {'fast_pdf': True, 'tile_jobs': 2}])
+def test_converter_pages_match_old_loop(tmp_path, layout_class, old_tiles, converter_class, options):
+    plt_file = tmp_path / 'drawing.plt'
+    plt_file.write_text('IN;' + random_program(np.random.default_rng(3), 60, fractions=False))
+    drawing = load_drawing(str(plt_file), use_cache=False)
+
+    # Eski döngüde boş sayfalar atlanır: pencereyle kesişen geometri yoksa sayfa yok
+    expected = 0
+    for _, _, window, _ in old_tiles(drawing.width_mm, drawing.height_mm):
+        if len(drawing.segments.intersecting(*window[:4])) or len(drawing.arcs.intersecting(*window[:4])):
+            expected += 1
+    assert expected > 1
+
+    pdf_file = tmp_path / 'drawing.pdf'
+    converter = converter_class(str(plt_file), str(pdf_file), use_cache=False, **options)
+    assert converter.convert()
+    assert _pdf_page_count(pdf_file) == expected
@@ -0,0 +1,100 @@
+"""Parça parça okuyan ayrıştırıcının tüm dosyada tek seferlik findall ile aynı komutları ürettiğini doğrular"""
+
+import re
+
+import numpy as np
+import pytest
+
+from hpgl_parser import iter_commands, iter_file_chunks, tokenize_chunks
+from hpgl_samples import random_program
+
+
+# İlk sürümdeki tüm dosya üzerinde çalışan kalıp
+_REFERENCE_PATTERN = re.compile(r'([A-Z]{2})([^A-Z]*)')
+
+# PE parametreleri (büyük harfler dahil) ';' karakterine kadar sürer
+_PE_REFERENCE = re.compile(r'(PE)([^;]*;?)|([A-Z]{2})([^A-Z]*)')
+
+
+def _strip(text):
+    return text.replace('\n', '').replace('\r', '').replace(' ', '')
+
+
+def reference_commands(text):
+    """Tüm metin üzerinde tek findall (PE'siz dosyalarda _REFERENCE_PATTERN ile aynı)"""
+    return [(pe, pe_params) if pe else (cmd, params)
+            for pe, pe_params, cmd, params in _PE_REFERENCE.findall(_strip(text))]
+
+
+def _write(tmp_path, text):
+    path = tmp_path / 'sample.plt'
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+
+@pytest.mark.parametrize('seed, count, junk', [(0, 300, False), (1, 300, True), (2, 3000, True)])
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 1 << 20])
+def test_iter_commands_matches_findall(tmp_path, seed, count, junk, chunk_size):
+    text = random_program(np.random.default_rng(seed), count, True, junk,
+                          commands=('PU', 'PD', 'PA', 'PR', 'IN', 'SP', 'CI', 'AA'))
+    path = _write(tmp_path, text)
+    assert list(iter_commands(path, chunk_size)) == _REFERENCE_PATTERN.findall(_strip(text))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1 << 20])
+def test_command_letters_split_across_chunks(tmp_path, chunk_size):
+    # Komutun iki harfi veya parametreleri ayrı parçalara düşebilir
+    text = 'IN;P\nU10,10;PD\r\n20,20;PDPU;PA 5 , 5'
+    path = _write(tmp_path, text)
+    assert list(iter_commands(path, chunk_size)) == [('IN', ';'), ('PU', '10,10;'), ('PD', '20,20;'),
+                                                     ('PD', ''), ('PU', ';'), ('PA', '5,5')]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 64, 1 << 20])
+def test_polyline_encoded_parameters_stay_whole(tmp_path, chunk_size):
+    # PE parametreleri büyük harf ve boşluk içerebilir, parça sınırında bölünmez
+    text = 'IN;PU0,0;PE:?A<=B\r\nCDEFG>?z;PD10,10;PEabc;\nPE7OPQR;PA5,5PE?AB'
+    path = _write(tmp_path, text)
+    assert list(iter_commands(path, chunk_size)) == reference_commands(text)
+
+
+def test_tokenize_chunks_single_letter_carry():
+    # Komutun iki harfi ayrı parçalara düşebilir
+    chunks = ['IN;P', 'U10,10;P', 'D', '20,20', ';']
+    assert list(tokenize_chunks(chunks)) == [('IN', ';'), ('PU', '10,10;'), ('PD', '20,20;')]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1 << 20])
+def test_multibyte_characters_across_chunks(tmp_path, chunk_size):
+    # Çok baytlı UTF-8 karakterleri parça sınırında bölünse de kaybolmaz
+    text = 'IN;PU1,1;LBÇizim ğüşİ;PD2,2;PA3,3;'
+    path = _write(tmp_path, text)
+    assert list(iter_commands(path, chunk_size)) == _REFERENCE_PATTERN.findall(_strip(text))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1 << 20])
+def test_invalid_utf8_is_ignored_like_text_mode(tmp_path, chunk_size):
+    data = b'IN;PU1,1;LB\xff\xfe\xc3;PD2,\x802;PA3,3;'
+    path = tmp_path / 'sample.plt'
+    path.write_bytes(data)
+    expected = _REFERENCE_PATTERN.findall(_strip(data.decode('utf-8', errors='ignore')))
+    assert list(iter_commands(str(path), chunk_size)) == expected
+
+
+@pytest.mark.parametrize('size', [0, 1, 100, 4097])
+def test_file_chunks_cover_the_file(tmp_path, size):
+    data = bytes(np.random.default_rng(size).integers(0, 256, size, dtype=np.uint8))
+    path = tmp_path / 'sample.plt'
+    path.write_bytes(data)
+    chunks = list(iter_file_chunks(str(path), 1024))
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert b''.join(chunks) == data
+
+
+def test_pre_read_data_matches_file(tmp_path):
+    # Önceden okunmuş içerik verilirse dosya tekrar okunmaz, sonuç aynı kalır
+    text = random_program(np.random.default_rng(5), 500, True, True)
+    path = _write(tmp_path, text)
+    data = text.encode('utf-8')
+    assert b''.join(iter_file_chunks(path, 64, data)) == data
+    assert list(iter_commands(path, 64, data=data)) == list(iter_commands(path, 64))
@@ -0,0 +1,66 @@
+"""Bağlı segmentlerin çoklu çizgilere birleştirilip tek path olarak çizildiğini doğrular"""
+
+import re
+
+import numpy as np
+import pytest
+from reportlab.pdfgen import canvas
+
+from hpgl_samples import random_program, reference_segments
+from pdf_render import draw_polylines, polyline_points
+from pdf_writer import PDFWriter
+from segment_store import SegmentStore
+
+
+def _reference_polylines(data):
+    """Segment segment ilerleyen döngü: bitişe bağlı olmayan her segment yeni çoklu çizgi başlatır"""
+    polylines = []
+    for x1, y1, x2, y2 in data.tolist():
+        if not polylines or polylines[-1][-1] != [x1, y1]:
+            polylines.append([[x1, y1]])
+        polylines[-1].append([x2, y2])
+    return polylines
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_polyline_points_match_reference(seed):
+    segments = SegmentStore(reference_segments(random_program(np.random.default_rng(seed), 300, fractions=False)))
+    expected = _reference_polylines(segments.data)
+    point_starts, points = polyline_points(segments)
+    bounds = point_starts.tolist() + [len(points)]
+    assert [points[start:end].tolist() for start, end in zip(bounds[:-1], bounds[1:])] == expected
+    # Her segment bir nokta ekler, her çoklu çizgi bir başlangıç noktası
+    assert len(points) == len(segments) + len(expected)
+
+
+def test_pen_change_starts_new_polyline():
+    segments = SegmentStore(np.array([[0, 0, 1, 0], [1, 0, 2, 0], [2, 0, 3, 0]]), pens=[1, 1, 2])
+    point_starts, points = polyline_points(segments)
+    assert point_starts.tolist() == [0, 3]
+    assert points.tolist() == [[0, 0], [1, 0], [2, 0], [2, 0], [3, 0]]
+
+
+def _reportlab_content(tmp_path, segments):
+    path = tmp_path / 'polylines.pdf'
+    c = canvas.Canvas(str(path), pageCompression=0)
+    draw_polylines(c, segments, 10, 10)
+    c.showPage()
+    c.save()
+    return re.search(rb'stream\n(.*?)endstream', path.read_bytes(), re.S).group(1)
+
+
+def _writer_content(tmp_path, segments):
+    c = PDFWriter(None, (500, 500))
+    draw_polylines(c, segments, 10, 10)
+    return c.page_content()
+
+
+@pytest.mark.parametrize('content', [_reportlab_content, _writer_content])
+def test_polylines_are_one_stroked_path(tmp_path, content):
+    segments = SegmentStore(reference_segments(random_program(np.random.default_rng(7), 300, fractions=False)))
+    polyline_count = len(_reference_polylines(segments.data))
+    operators = content(tmp_path, segments).split()
+    # Çoklu çizgi başına bir moveto, segment başına bir lineto ve tüm path için tek stroke
+    assert operators.count(b'm') == polyline_count
+    assert operators.count(b'l') == len(segments)
+    assert operators.count(b'S') == 1
@@ -0,0 +1,116 @@
+"""Hızlı PDF yazıcının ürettiği dosyanın geçerli bir PDF olarak okunduğunu doğrular"""
+
+import os
+import re
+import zlib
+
+import numpy as np
+import pytest
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+
+from arc_store import ArcStore
+from pdf_render import arc_curves, define_drawing_form, draw_form_tile, draw_geometry
+from pdf_writer import PART_SUFFIX, PDFWriter, curve_content
+from segment_store import SegmentStore
+
+
+def sample_geometry(rng, count):
+    points = rng.uniform(0, 200, (count + 1, 2))
+    segments = SegmentStore(np.hstack([points[:-1], points[1:]]), pens=rng.integers(1, 4, count))
+    # Başlangıç ve tarama açıları radyan: 270° saat yönünün tersine, 180° saat yönünde
+    arcs = ArcStore(np.array([[50.0, 50.0, 20.0, 0.0, 1.5 * np.pi], [120.0, 80.0, 10.0, np.pi / 2, -np.pi]]))
+    return segments, arcs
+
+
+def write_sample(path):
+    """Formlu, çok akışlı, metinli ve başka süreçte sıkıştırılmış içerikli üç sayfa"""
+    segments, arcs = sample_geometry(np.random.default_rng(0), 500)
+    c = PDFWriter(path, A4)
+    define_drawing_form(c, segments, arcs, 200, 200)
+
+    c.setStrokeColorRGB(0, 0, 0)
+    c.setLineWidth(0.5)
+    draw_geometry(c, segments, arcs, 5, 5)
+    c.flush_content()
+    draw_geometry(c, segments, arcs, 10, 10)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(10 * mm, 287 * mm, "A1 (Çizim: ğüşİ)")
+    c.showPage()
+
+    draw_form_tile(c, -20, -30, 0, 0, 210, 297)
+    c.setDash([3, 3])
+    c.line(0, 20 * mm, 210 * mm, 20 * mm)
+    c.setDash()
+    c.showPage()
+
+    worker = PDFWriter(None, A4)
+    draw_geometry(worker, segments, arcs)
+    c.draw_compressed(zlib.compress(worker.page_content()))
+    c.setFont("Helvetica", 8)
+    c.drawString(10 * mm, 10 * mm, "Sayfa 3")
+    c.save()
+
+
+def test_arc_curves_follow_arc_geometry():
+    _, arcs = sample_geometry(np.random.default_rng(0), 1)
+    content = curve_content(*arc_curves(arcs, 5, 5)).decode('ascii')
+    number = r'(-?[\d.]+)'
+    moves = np.array(re.findall(rf'{number} {number} m\n', content), dtype=np.float64)
+    ends = np.array(re.findall(rf'(?:-?[\d.]+ ){{4}}{number} {number} c\n', content), dtype=np.float64)
+    # 270° üç, 180° iki 90°'lik Bézier parçası; uçlar yayların başlangıç ve bitiş noktaları (pt)
+    assert len(moves) == 2 and len(ends) == 5
+    assert moves == pytest.approx(np.array([[75, 55], [125, 95]]) * mm, abs=0.01)
+    assert ends[[2, 4]] == pytest.approx(np.array([[55, 35], [125, 75]]) * mm, abs=0.01)
+
+
+def test_xref_offsets_point_at_objects(tmp_path):
+    path = str(tmp_path / 'out.pdf')
+    write_sample(path)
+    assert not os.path.exists(path + PART_SUFFIX)
+    data = open(path, 'rb').read()
+    assert data.startswith(b'%PDF-1.4') and data.rstrip().endswith(b'%%EOF')
+
+    xref_offset = int(re.search(rb'startxref\n(\d+)\n%%EOF', data).group(1))
+    assert data[xref_offset:].startswith(b'xref\n')
+    header = re.match(rb'xref\n0 (\d+)\n', data[xref_offset:])
+    size = int(header.group(1))
+    table = data[xref_offset + header.end():].split(b'\n')[:size]
+    assert table[0] == b'0000000000 65535 f '
+    for object_id, entry in enumerate(table[1:], 1):
+        offset = int(entry[:10])
+        assert data[offset:].startswith(b'%d 0 obj\n' % object_id)
+    assert b'/Size %d ' % size in data
+
+    # Tüm akışların uzunlukları doğru ve içerikleri açılabilir
+    for match in re.finditer(rb'/Length (\d+) >>\nstream\n', data):
+        length = int(match.group(1))
+        assert data[match.end() + length:].startswith(b'\nendstream')
+        zlib.decompress(data[match.end():match.end() + length])
+
+
+def test_parses_with_pypdf(tmp_path):
+    pypdf = pytest.importorskip('pypdf')
+    path = str(tmp_path / 'out.pdf')
+    write_sample(path)
+    reader = pypdf.PdfReader(path, strict=True)
+    assert len(reader.pages) == 3
+    first = reader.pages[0]
+    # İlk sayfa flush_content ile iki içerik akışından oluşur
+    assert len(first['/Contents']) == 2
+    assert b' l' in first.get_contents().get_data()
+    # Sıkıştırılmış içerik ve metin ayrı akışlardır
+    assert len(reader.pages[2]['/Contents']) == 2
+    assert 'Sayfa 3' in reader.pages[2].extract_text()
+    assert '/X1' in reader.pages[1]['/Resources']['/XObject']
+
+
+def test_unsaved_writer_removes_partial_file(tmp_path):
+    path = str(tmp_path / 'out.pdf')
+    c = PDFWriter(path, A4)
+    c.line(0, 0, 10, 10)
+    c.showPage()
+    assert os.path.exists(path + PART_SUFFIX)
+    del c
+    assert not os.path.exists(path + PART_SUFFIX)
+    assert not os.path.exists(path)
@@ -0,0 +1,114 @@
+"""Kalem (SP) başına gruplamayı, kalem stillerini ve --split-pens dosya adlarını doğrular"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from arc_store import ArcStore
+from hpgl_interpreter import HPGLInterpreter
+from hpgl_samples import random_program
+from pdf_render import draw_geometry, pen_groups
+from pdf_writer import PDFWriter
+from pen_layers import existing_pen_files, pen_file, pen_style
+from plt_to_pdf import PLTtoPDFConverter
+from plt_to_pdf_a4 import PLTtoPDFA4Converter
+from segment_store import SegmentStore
+
+
+def _pen_program(rng, pens):
+    """Her kalem için SP ile başlayan rastgele bir çizim parçası ve birer daire"""
+    return 'IN;' + ''.join(f"SP{pen};{random_program(rng, 40, fractions=False)}PD;CI{20 * pen};" for pen in pens)
+
+
+def test_interpreter_tracks_selected_pen():
+    segments, arcs = HPGLInterpreter().feed_buffer(b'PU0,0;PD1,0;SP3;PD2,0;CI1;SP;PD3,0;SP0;PD4,0;SP2;PD0,5;')
+    # Seçim yapılmadan çizilenler varsayılan kalemle; parametresiz SP kalemi bırakır (kalem 0)
+    assert segments.pens.tolist() == [1, 3, 0, 0, 2]
+    assert arcs.pens.tolist() == [3]
+
+
+def test_pen_groups_keep_drawing_order_within_pen():
+    rng = np.random.default_rng(0)
+    pens = rng.integers(1, 4, 200)
+    segments = SegmentStore(rng.uniform(0, 100, (200, 4)), pens=pens)
+    arcs = ArcStore([[0, 0, 1, 0, 1], [5, 5, 1, 0, 1]], pens=[4, 2])
+    groups = pen_groups(segments, arcs)
+    assert [pen for pen, _, _ in groups] == [1, 2, 3, 4]
+    for pen, pen_segments, pen_arcs in groups:
+        assert pen_segments.data.tolist() == segments.data[pens == pen].tolist()
+        assert pen_arcs.data.tolist() == arcs.data[arcs.pens == pen].tolist()
+
+    # Tek kalemde kümeler kopyalanmaz
+    single = SegmentStore(segments.data, pens=np.full(200, 2))
+    [(pen, pen_segments, pen_arcs)] = pen_groups(single, ArcStore())
+    assert pen == 2 and pen_segments is single
+
+
+def _strokes_by_color(content):
+    """Her stroke'un rengi ve lineto/eğri sayısı: [(renk, çizgi, eğri), ...]"""
+    strokes, numbers, color, lines, curves = [], [], None, 0, 0
+    for token in content.split():
+        if token == b'RG':
+            color = tuple(numbers[-3:])
+        elif token == b'l':
+            lines += 1
+        elif token == b'c':
+            curves += 1
+        elif token == b'S':
+            strokes.append((color, lines, curves))
+            lines = curves = 0
+        try:
+            numbers.append(float(token))
+        except ValueError:
+            numbers = []
+    return strokes
+
+
+def test_one_styled_path_per_pen():
+    segments, arcs = HPGLInterpreter().feed_buffer(_pen_program(np.random.default_rng(1), [3, 1, 2]).encode())
+    c = PDFWriter(None, (1000, 1000))
+    c.setStrokeColorRGB(0, 0, 0)
+    draw_geometry(c, segments, arcs)
+    strokes = _strokes_by_color(c.page_content())
+
+    # Kalem başına segmentler ve yaylar (sırasıyla) birer path; renkler kalem stilinden
+    expected = []
+    for pen in (1, 2, 3):
+        color = tuple(pytest.approx(value, abs=0.005) for value in pen_style(pen)[0])
+        expected.append((color, int((segments.pens == pen).sum()), 0))
+        expected.append((color, 0, 4))
+    assert strokes == expected
+    # Çizimden sonra varsayılan kalemin stiline dönülür
+    assert c.page_content().split()[-6:] == [b'0', b'0', b'0', b'RG', b'0.5', b'w']
+
+
+@pytest.mark.parametrize('converter_class, suffix', [(PLTtoPDFConverter, '.pdf'), (PLTtoPDFA4Converter, '_A4.pdf')])
+def test_split_pens_file_names(tmp_path, converter_class, suffix):
+    plt_file = tmp_path / 'drawing.plt'
+    plt_file.write_text(_pen_program(np.random.default_rng(2), [1, 3]))
+    pdf_file = str(tmp_path / f'drawing{suffix}')
+    # Önceki çalıştırmadan kalan kalem PDF'i silinir, başka çıktıların kalem PDF'lerine dokunulmaz
+    (tmp_path / f'drawing{suffix[:-4]}_pen7.pdf').write_bytes(b'%PDF')
+    (tmp_path / 'drawing_pen2_A4.pdf').write_bytes(b'%PDF')
+    (tmp_path / 'drawing2_pen1.pdf').write_bytes(b'%PDF')
+
+    converter = converter_class(str(plt_file), pdf_file, use_cache=False, fast_pdf=True, split_pens=True)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert converter.convert()
+    assert "2 kalem ayrı PDF'lere yazılıyor: 1, 3" in output.getvalue()
+    assert existing_pen_files(pdf_file) == [pen_file(pdf_file, 1), pen_file(pdf_file, 3)]
+    assert pen_file(pdf_file, 3) == str(tmp_path / f'drawing{suffix[:-4]}_pen3.pdf')
+    assert (tmp_path / 'drawing_pen2_A4.pdf').exists() and (tmp_path / 'drawing2_pen1.pdf').exists()
+    assert converter.stats.counters['pen_files'] == 2
+    assert 'split_pens' in converter.stats.stages
+
+    # Tek kalemli çizimde kalem PDF'i yazılmaz, eskileri kaldırılır
+    plt_file.write_text(_pen_program(np.random.default_rng(3), [3]))
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert converter_class(str(plt_file), pdf_file, use_cache=False, fast_pdf=True, split_pens=True).convert()
+    assert "tek kalem var" in output.getvalue()
+    assert existing_pen_files(pdf_file) == []
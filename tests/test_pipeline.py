@@ -0,0 +1,90 @@
+"""Boru hattının dosyaları sırayla yüklediğini ve hataları tüketiciye ilettiğini doğrular"""
+
+import contextlib
+import io
+import re
+import threading
+
+import pytest
+
+import pipeline
+from batch import run_batch
+from drawing import load_drawing
+from geometry_cache import file_digest
+from hpgl_samples import write_drawing
+from pipeline import iter_loaded_drawings
+from plt_to_pdf import PLTtoPDFConverter
+
+
+def _files(tmp_path):
+    """Büyük çizimli, çizimsiz, eksik ve küçük çizimli dosyalar"""
+    plt_files = [write_drawing(tmp_path / 'a.plt', seed=0, command_count=2000),
+                 str(tmp_path / 'b.plt'),
+                 str(tmp_path / 'missing.plt'),
+                 write_drawing(tmp_path / 'd.plt', seed=1, command_count=20)]
+    (tmp_path / 'b.plt').write_text('IN;')
+    return plt_files
+
+
+def test_drawings_arrive_in_order_with_errors(tmp_path):
+    plt_files = _files(tmp_path)
+    items = list(iter_loaded_drawings(plt_files, use_cache=False, depth=1))
+    assert [item.plt_file for item in items] == plt_files
+
+    for index in (0, 3):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            expected = load_drawing(plt_files[index], use_cache=False)
+        assert items[index].error is None
+        assert items[index].digest == file_digest(plt_files[index])
+        assert items[index].drawing.segments.data.tolist() == expected.segments.data.tolist()
+        # Yükleme mesajları tüketicinin çıktısına değil dosyanın kendi akışına yazılır
+        assert items[index].output == output.getvalue()
+        assert 'prefetch' in items[index].stats.stages
+
+    # Çizimsiz dosya hata mesajıyla, okunamayan dosya hata metniyle döner
+    assert items[1].drawing is None and items[1].error is None
+    assert 'Hata' in items[1].output
+    assert items[2].drawing is None and 'No such file' in items[2].error
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_stopped_loader_raises_instead_of_blocking(tmp_path, monkeypatch):
+    plt_files = _files(tmp_path)
+    real_load = pipeline.load_drawing
+
+    def load_once(plt_file, *args, **kwargs):
+        if plt_file != plt_files[0]:
+            # Exception dışındaki hatalar yükleyici iş parçacığını durdurur
+            raise SystemExit
+        return real_load(plt_file, *args, **kwargs)
+
+    monkeypatch.setattr(pipeline, 'load_drawing', load_once)
+    loaded = iter_loaded_drawings(plt_files, use_cache=False)
+    assert next(loaded).plt_file == plt_files[0]
+    with pytest.raises(RuntimeError, match=r'erken durdu: 1/4'):
+        next(loaded)
+
+
+def test_closing_early_stops_threads(tmp_path):
+    before = threading.active_count()
+    loaded = iter_loaded_drawings(_files(tmp_path) * 3, use_cache=False, depth=1)
+    next(loaded)
+    loaded.close()
+    assert threading.active_count() == before
+
+
+def _run(tmp_path, plt_files, use_pipeline):
+    output_dir = tmp_path / f'output_{use_pipeline}'
+    output_dir.mkdir()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        counts = run_batch(PLTtoPDFConverter, plt_files, str(output_dir), '.pdf',
+                           options={'use_cache': False, 'fast_pdf': True}, pipeline=use_pipeline)
+    text = re.sub(r' \(\d+\.\d sn\)', '', output.getvalue()).replace(str(output_dir), '<output>')
+    pdfs = {path.name: path.read_bytes() for path in output_dir.glob('*.pdf')}
+    return counts, text, pdfs
+
+
+def test_batch_output_matches_without_pipeline(tmp_path):
+    plt_files = _files(tmp_path)
+    assert _run(tmp_path, plt_files, True) == _run(tmp_path, plt_files, False)
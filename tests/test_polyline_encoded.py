@@ -0,0 +1,137 @@
+"""PE (Polyline Encoded) çözümünün basit bir Python kodlayıcı/çözücüyle aynı sonucu verdiğini doğrular"""
+
+import numpy as np
+import pytest
+
+from hpgl_interpreter import interpret_file
+from hpgl_parser import decode_polyline_encoded
+
+
+def encode_number(value, seven_bit=False):
+    """Tamsayıyı PE basamaklarına çevir: en düşük basamak önce, en düşük bit işaret"""
+    bits, last_base = (5, 95) if seven_bit else (6, 191)
+    number = (abs(value) << 1) | (value < 0)
+    out = []
+    while True:
+        digit = number & ((1 << bits) - 1)
+        number >>= bits
+        if not number:
+            out.append(last_base + digit)
+            return bytes(out)
+        out.append(63 + digit)
+
+
+def random_blocks(rng, block_count):
+    """Rastgele PE blokları ve beklenen çözüm: (bayt, noktalar, kalkık, mutlak, blok başına nokta, seçimler)"""
+    data = []
+    points, pen_up, absolute, pair_counts = [], [], [], []
+    selects = ([], [], [])
+    for block in range(block_count):
+        seven_bit = False
+        fraction = 0
+        block_points = 0
+        pending_selects = []
+        for _ in range(int(rng.integers(0, 12))):
+            up = is_absolute = False
+            if rng.random() < 0.1 and not seven_bit:
+                data.append(b'7')
+                seven_bit = True
+            if rng.random() < 0.2:
+                pen = int(rng.integers(0, 9))
+                data.append(b':' + encode_number(pen, seven_bit))
+                pending_selects.append(pen)
+            if rng.random() < 0.15:
+                fraction = int(rng.integers(0, 6))
+                data.append(b'>' + encode_number(fraction, seven_bit))
+            if rng.random() < 0.3:
+                data.append(b'<')
+                up = True
+            if rng.random() < 0.2:
+                data.append(b'=')
+                is_absolute = True
+            x, y = (int(v) for v in rng.integers(-100000, 100000, 2))
+            data.append(encode_number(x, seven_bit) + encode_number(y, seven_bit))
+            # Kalem seçimi bir sonraki noktadan itibaren geçerlidir
+            for pen in pending_selects:
+                selects[0].append(pen)
+                selects[1].append(block)
+                selects[2].append(len(points))
+            pending_selects = []
+            points.append((x / 2 ** fraction, y / 2 ** fraction))
+            pen_up.append(up)
+            absolute.append(is_absolute)
+            block_points += 1
+        if rng.random() < 0.3:
+            # Son noktadan sonraki seçim blok sonunda geçerlidir
+            pen = int(rng.integers(0, 9))
+            data.append(b':' + encode_number(pen, seven_bit))
+            pending_selects.append(pen)
+        for pen in pending_selects:
+            selects[0].append(pen)
+            selects[1].append(block)
+            selects[2].append(len(points))
+        if rng.random() < 0.3:
+            # Eşi olmayan son koordinat atılır
+            data.append(encode_number(int(rng.integers(-500, 500)), seven_bit))
+        data.append(b';')
+        pair_counts.append(block_points)
+    return b''.join(data), points, pen_up, absolute, pair_counts, selects
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_decode_matches_reference(seed):
+    data, points, pen_up, absolute, pair_counts, selects = random_blocks(np.random.default_rng(seed), 40)
+    decoded_points, decoded_up, decoded_absolute, decoded_counts, decoded_selects = decode_polyline_encoded(data)
+    assert decoded_points.reshape(-1, 2).tolist() == [list(point) for point in points]
+    assert decoded_up.tolist() == pen_up
+    assert decoded_absolute.tolist() == absolute
+    assert decoded_counts.tolist() == pair_counts
+    assert [values.tolist() for values in decoded_selects] == [selects[0], selects[1], selects[2]]
+
+
+@pytest.mark.parametrize('value', [0, 1, -1, 31, -32, 63, 64, 1000, -123456, 2 ** 40])
+@pytest.mark.parametrize('seven_bit', [False, True])
+def test_number_round_trip(value, seven_bit):
+    prefix = b'7' if seven_bit else b''
+    data = prefix + encode_number(value, seven_bit) + encode_number(-value, seven_bit) + b';'
+    points = decode_polyline_encoded(data)[0]
+    assert points.tolist() == [[value, -value]]
+
+
+def test_incomplete_numbers_are_dropped():
+    # Son basamağı gelmeyen sayılar ve yalnız devam basamaklarından oluşan bloklar nokta üretmez
+    points, _, _, pair_counts, _ = decode_polyline_encoded(b'=BB??;' + encode_number(5) + encode_number(6) + b'?;')
+    assert points.tolist() == [[5, 6]]
+    assert pair_counts.tolist() == [0, 1]
+
+    # Hiç tamamlanmış sayı içermeyen veri de boş sonuç verir
+    points, _, _, pair_counts, _ = decode_polyline_encoded(b'=BB??;')
+    assert points.size == 0
+    assert pair_counts.tolist() == [0]
+
+
+def test_pen_select_and_pen_up_in_interpreter(tmp_path):
+    # ':' kalem seçimi sonraki noktalara uygulanır, '<' kalem kalkık hareket, '=' mutlak konum
+    encoded = (b':' + encode_number(2) + b'=' + encode_number(100) + encode_number(200) +
+               encode_number(50) + encode_number(0) + b'<' + encode_number(10) + encode_number(10) +
+               encode_number(-20) + encode_number(5) + b';')
+    path = tmp_path / 'pe.plt'
+    path.write_bytes(b'IN;SP1;PU0,0;PD5,0;PE' + encoded + b'SP3;PR1,1;')
+    segments, _ = interpret_file(str(path))
+    assert segments.data.tolist() == [[0, 0, 5, 0], [5, 0, 100, 200], [100, 200, 150, 200],
+                                      [160, 210, 140, 215], [140, 215, 141, 216]]
+    assert segments.pens.tolist() == [1, 2, 2, 2, 3]
+
+
+def test_long_command_fallback_keeps_8bit_blocks(tmp_path):
+    # Çok uzun bir komut küçük parçalarda metin yoluna düşürür; 8 bitlik PE basamakları kaybolmamalı
+    long_command = b'PD' + b','.join(b'%d,%d' % (i, i % 7) for i in range(1, 20001)) + b';'
+    rng = np.random.default_rng(0)
+    moves = [(int(x), int(y)) for x, y in rng.integers(-100000, 100000, (50, 2))]
+    encoded = b''.join(encode_number(x) + encode_number(y) for x, y in moves)
+    path = tmp_path / 'long.plt'
+    path.write_bytes(b'IN;PU0,0;' + long_command + b'PE' + encoded[:30] + b'\n' + encoded[30:] + b';PU;')
+    full, _ = interpret_file(str(path), chunk_size=1 << 22)
+    fallback, _ = interpret_file(str(path), chunk_size=1024)
+    assert len(full) == 20050
+    assert fallback.data.tolist() == full.data.tolist()
@@ -0,0 +1,90 @@
+"""Segment temizlemenin aşama sayaçlarını ve sonucunu segment segment ilerleyen referansla doğrular"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from drawing import load_drawing
+from hpgl_interpreter import HPGLInterpreter
+from hpgl_samples import random_walk_program
+from segment_cleanup import CleanupStats, cleanup_segments
+from segment_store import SegmentStore
+
+
+def _reference_cleanup(data, pens, grid):
+    """Yuvarla, sıfır uzunluklu ve tekrar eden segmentleri at, aynı doğrudaki bağlı segmentleri birleştir"""
+    rounded = [(tuple(int(v) for v in np.rint(np.array(row) / grid)), pen) for row, pen in zip(data, pens)]
+    nonzero = [(q, pen) for q, pen in rounded if q[:2] != q[2:]]
+
+    seen, unique = set(), []
+    for q, pen in nonzero:
+        key = (min(q[:2], q[2:]), max(q[:2], q[2:]), pen)
+        if key not in seen:
+            seen.add(key)
+            unique.append((q, pen))
+
+    merged = []
+    for q, pen in unique:
+        if merged:
+            last, last_pen = merged[-1]
+            dx1, dy1 = last[2] - last[0], last[3] - last[1]
+            dx2, dy2 = q[2] - q[0], q[3] - q[1]
+            if (last[2:] == q[:2] and last_pen == pen and dx1 * dy2 == dy1 * dx2
+                    and dx1 * dx2 + dy1 * dy2 > 0):
+                merged[-1] = (last[:2] + q[2:], pen)
+                continue
+        merged.append((q, pen))
+
+    stats = CleanupStats(len(rounded) - len(nonzero), len(nonzero) - len(unique), len(unique) - len(merged))
+    return [list(q) for q, _ in merged], [pen for _, pen in merged], stats
+
+
+def test_stage_counts_on_known_segments():
+    segments = SegmentStore(np.array([
+        [0, 0, 1, 0], [1, 0, 2, 0], [2, 0, 3, 0],  # aynı doğruda: tek segment
+        [3, 0, 3.004, 0],                          # yuvarlanınca sıfır uzunluklu
+        [3, 0, 2, 0],                              # ters yönde tekrar
+        [2, 0, 1, 0],                              # ters yönde tekrar
+        [0, 0, 1, 0],                              # farklı kalemle aynı segment: korunur
+        [5, 5, 6, 6], [6, 6, 5, 5],                # geri dönüş: tekrar sayılır
+        [7, 7, 8, 8], [8, 8, 7, 7.5],              # bağlı ama farklı yön: birleşmez
+    ]), pens=[1, 1, 1, 1, 1, 1, 2, 1, 1, 1, 1])
+    cleaned, stats = cleanup_segments(segments, 0.01)
+    assert stats == CleanupStats(zero_length=1, duplicates=3, merged=2)
+    assert cleaned.data == pytest.approx(np.array([[0, 0, 3, 0], [0, 0, 1, 0], [5, 5, 6, 6],
+                                                   [7, 7, 8, 8], [8, 8, 7, 7.5]]))
+    assert cleaned.pens.tolist() == [1, 2, 1, 1, 1]
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('grid', [1, 3])
+def test_cleanup_matches_reference(seed, grid):
+    rng = np.random.default_rng(seed)
+    segments, _ = HPGLInterpreter().feed_buffer(random_walk_program(rng, 10, 80).encode('ascii'))
+    # Rastgele seçilen segmentlerin ters yönlü kopyaları sonda tekrar çizilir
+    copies = rng.choice(len(segments), len(segments) // 4, replace=False)
+    data = np.vstack([segments.data, segments.data[copies][:, [2, 3, 0, 1]]])
+    pens = np.concatenate([segments.pens, rng.integers(1, 3, len(copies))])
+
+    cleaned, stats = cleanup_segments(SegmentStore(data, pens=pens), grid)
+    expected, expected_pens, expected_stats = _reference_cleanup(data.tolist(), pens.tolist(), grid)
+    assert stats == expected_stats
+    assert all(stats)
+    assert (cleaned.data / grid).round().tolist() == expected
+    assert cleaned.pens.tolist() == expected_pens
+    assert len(cleaned) == len(data) - sum(stats)
+
+
+def test_load_drawing_reports_stage_counts(tmp_path):
+    plt_file = tmp_path / 'walk.plt'
+    plt_file.write_text(random_walk_program(np.random.default_rng(1), 10, 80))
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        full = load_drawing(str(plt_file), use_cache=False)
+        drawing = load_drawing(str(plt_file), use_cache=False, cleanup_grid=0.01)
+    _, stats = cleanup_segments(full.segments, 0.01)
+    assert len(drawing.segments) == len(full.segments) - sum(stats)
+    assert (f"Temizleme (0.01 mm ızgara): {stats.zero_length} sıfır uzunluklu, {stats.duplicates} tekrar eden "
+            f"segment atıldı, {stats.merged} segment birleştirildi") in output.getvalue()
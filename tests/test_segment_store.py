@@ -0,0 +1,67 @@
+"""SegmentStore.clipped'in (Liang-Barsky) segment başına kırpmayla aynı sonucu verdiğini doğrular"""
+
+import numpy as np
+import pytest
+
+from hpgl_samples import random_program, reference_segments
+from segment_store import SegmentStore
+
+
+def _reference_clip(segment, min_x, min_y, max_x, max_y):
+    """Tek segmenti parametrik olarak kırp; dışarıdaysa None"""
+    x1, y1, x2, y2 = segment
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - min_x), (dx, max_x - x1), (-dy, y1 - min_y), (dy, max_y - y1)):
+        if p == 0:
+            if q < 0:
+                return None
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    if t0 >= t1:
+        return None
+    return [x1 + t0 * dx, y1 + t0 * dy, x1 + t1 * dx, y1 + t1 * dy]
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_clipped_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    data = reference_segments(random_program(rng, 300, fractions=False))
+    segments = SegmentStore(data, pens=rng.integers(1, 5, len(data)))
+    min_x, min_y = rng.uniform(-30000, 10000, 2)
+    window = (min_x, min_y, min_x + rng.uniform(1000, 30000), min_y + rng.uniform(1000, 30000))
+
+    clipped = segments.clipped(*window)
+    expected = [(_reference_clip(segment, *window), pen) for segment, pen in zip(data.tolist(), segments.pens)]
+    expected = [(segment, pen) for segment, pen in expected if segment is not None]
+    assert 0 < len(clipped) < len(segments)
+    assert clipped.data == pytest.approx(np.array([segment for segment, _ in expected]).reshape(-1, 4))
+    assert clipped.pens.tolist() == [pen for _, pen in expected]
+
+    # Kırpılan uçlar pencere içinde (kenarda) kalır
+    xs, ys = clipped.data[:, 0::2], clipped.data[:, 1::2]
+    assert (xs >= window[0] - 1e-9).all() and (xs <= window[2] + 1e-9).all()
+    assert (ys >= window[1] - 1e-9).all() and (ys <= window[3] + 1e-9).all()
+
+
+def test_inside_endpoints_are_kept_exactly():
+    # Bağlı segmentlerin ortak ucu pencere içindeyse kırpmadan sonra da ortak kalır
+    segments = SegmentStore(np.array([[-5.0, 1 / 3, 2 / 3, 1 / 3], [2 / 3, 1 / 3, 2 / 7, 9.0],
+                                      [0.1, 0.2, 0.3, 0.4]]))
+    clipped = segments.clipped(0, 0, 1, 1)
+    assert clipped.data[0, 2:].tolist() == clipped.data[1, :2].tolist() == [2 / 3, 1 / 3]
+    assert clipped.data[2].tolist() == [0.1, 0.2, 0.3, 0.4]
+    assert clipped.data[0, 0] == 0 and clipped.data[1, 3] == 1
+
+
+def test_parallel_and_degenerate_segments():
+    segments = SegmentStore(np.array([[0.0, 2, 5, 2],    # yatay: alçak pencerenin dışında
+                                      [3.0, -1, 3, 9],   # dikey: iki kenardan kesilir
+                                      [4.0, 4, 4, 4],    # sıfır uzunluklu: sadece yüksek pencerede
+                                      [9.0, 9, 9, 9],    # sıfır uzunluklu: dışarıda
+                                      [-2.0, 0, 0, 0]]))  # kenara sadece değiyor
+    clipped = segments.clipped(0, 0, 5, 1)
+    assert clipped.data.tolist() == [[3, 0, 3, 1]]
+    assert segments.clipped(0, 0, 5, 5).data.tolist() == [[0, 2, 5, 2], [3, 0, 3, 5], [4, 4, 4, 4]]
@@ -0,0 +1,101 @@
+"""Toplu Douglas-Peucker sadeleştirmesinin özyinelemeli referansla aynı noktaları tuttuğunu doğrular"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from drawing import load_drawing
+from hpgl_interpreter import HPGLInterpreter
+from hpgl_samples import random_walk_program
+from pdf_render import polyline_points
+from segment_store import SegmentStore
+from simplify import simplify_segments
+
+
+def _reference_keep(points, tolerance):
+    """Klasik özyinelemeli Douglas-Peucker: tutulan nokta indeksleri"""
+    if len(points) <= 2:
+        return list(range(len(points)))
+    a, b = points[0], points[-1]
+    ab = b - a
+    length_sq = ab @ ab
+    best, best_sq = None, -1.0
+    for i in range(1, len(points) - 1):
+        ap = points[i] - a
+        t = min(max((ap @ ab) / (length_sq if length_sq > 0 else 1), 0), 1)
+        offset = ap - ab * t
+        if offset @ offset > best_sq:
+            best, best_sq = i, offset @ offset
+    if best_sq <= tolerance * tolerance:
+        return [0, len(points) - 1]
+    left = _reference_keep(points[:best + 1], tolerance)
+    right = _reference_keep(points[best:], tolerance)
+    return left + [best + i for i in right[1:]]
+
+
+def _polylines(segments):
+    point_starts, points = polyline_points(segments)
+    bounds = point_starts.tolist() + [len(points)]
+    return [points[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _walk(seed):
+    text = random_walk_program(np.random.default_rng(seed), 20, 60, fractions=True)
+    segments, _ = HPGLInterpreter().feed_buffer(text.encode('ascii'))
+    return segments
+
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('tolerance', [0.5, 3, 20])
+def test_simplify_matches_recursive_reference(seed, tolerance):
+    segments = _walk(seed)
+    simplified = simplify_segments(segments, tolerance)
+
+    expected = []
+    for points in _polylines(segments):
+        kept = points[_reference_keep(points, tolerance)]
+        expected.extend(np.hstack([kept[:-1], kept[1:]]).tolist())
+    assert simplified.data.tolist() == expected
+    assert 0 < len(simplified) < len(segments)
+
+
+def test_endpoints_are_kept_and_removed_points_stay_close():
+    segments = _walk(7)
+    tolerance = 3
+    original, simplified = _polylines(segments), _polylines(simplify_segments(segments, tolerance))
+    assert len(simplified) == len(original)
+    for points, kept in zip(original, simplified):
+        assert kept[0].tolist() == points[0].tolist() and kept[-1].tolist() == points[-1].tolist()
+        # Atılan her nokta kalan çoklu çizgiye tolerans kadar yakındır
+        a, b = kept[:-1], kept[1:]
+        ab = b - a
+        length_sq = np.maximum(np.einsum('ij,ij->i', ab, ab), 1e-12)
+        for point in points:
+            ap = point - a
+            t = np.clip(np.einsum('ij,ij->i', ap, ab) / length_sq, 0, 1)
+            nearest = a + ab * t[:, None]
+            assert np.hypot(*(nearest - point).T).min() <= tolerance + 1e-9
+
+
+def test_pens_and_straight_runs():
+    # Aynı doğrudaki küçük adımlar tek segmente iner; kalem değişimi çoklu çizgiyi böler
+    xs = np.arange(11, dtype=np.float64)
+    data = np.column_stack([xs[:-1], xs[:-1] * 0, xs[1:], xs[1:] * 0])
+    segments = SegmentStore(data, pens=[1] * 5 + [2] * 5)
+    simplified = simplify_segments(segments, 0.1)
+    assert simplified.data.tolist() == [[0, 0, 5, 0], [5, 0, 10, 0]]
+    assert simplified.pens.tolist() == [1, 2]
+
+
+def test_load_drawing_reports_removed_segments(tmp_path):
+    plt_file = tmp_path / 'walk.plt'
+    plt_file.write_text(random_walk_program(np.random.default_rng(3), 20, 60))
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        full = load_drawing(str(plt_file), use_cache=False)
+        drawing = load_drawing(str(plt_file), use_cache=False, simplify_tolerance=0.05)
+    removed = len(full.segments) - len(drawing.segments)
+    assert removed > 0
+    assert f"Sadeleştirme (0.05 mm): {removed} segment kaldırıldı, {len(drawing.segments)} kaldı" in output.getvalue()
@@ -0,0 +1,70 @@
+"""Izgara indeksinin sorgularının tüm segmentleri tarayan kaba kuvvet sonucuyla aynı olduğunu doğrular"""
+
+import numpy as np
+import pytest
+
+from segment_store import SegmentStore
+from spatial_index import SegmentGrid
+
+
+def random_segments(rng, count):
+    """Kısa segmentler ve birçok hücreye yayılan uzun segmentler karışık"""
+    starts = rng.uniform(0, 1000, (count, 2))
+    lengths = np.where(rng.random((count, 1)) < 0.05, 600.0, 15.0)
+    ends = starts + rng.uniform(-1, 1, (count, 2)) * lengths
+    return SegmentStore(np.hstack([starts, ends]), pens=rng.integers(1, 4, count))
+
+
+def brute_force_ids(segments, start_x, start_y, end_x, end_y):
+    data = segments.data
+    mask = ((np.minimum(data[:, 0], data[:, 2]) < end_x) & (np.maximum(data[:, 0], data[:, 2]) > start_x) &
+            (np.minimum(data[:, 1], data[:, 3]) < end_y) & (np.maximum(data[:, 1], data[:, 3]) > start_y))
+    return np.flatnonzero(mask)
+
+
+def random_windows(rng, count):
+    starts = rng.uniform(-300, 1200, (count, 2))
+    sizes = rng.uniform(1, 400, (count, 2))
+    return np.hstack([starts, starts + sizes]).tolist()
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('cell_size', [(37.0, 53.0), (210.0, 297.0), (5000.0, 5000.0)])
+def test_candidates_cover_brute_force(seed, cell_size):
+    rng = np.random.default_rng(seed)
+    segments = random_segments(rng, 3000)
+    grid = SegmentGrid(segments, *cell_size)
+    for window in random_windows(rng, 50):
+        candidates = grid.candidates(*window)
+        # Adaylar sıralı, tekrarsız ve kesişen her segmenti içerir
+        assert np.array_equal(candidates, np.unique(candidates))
+        assert np.isin(brute_force_ids(segments, *window), candidates).all()
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_intersecting_matches_segment_store(seed):
+    rng = np.random.default_rng(seed)
+    segments = random_segments(rng, 3000)
+    grid = SegmentGrid(segments, 190.0, 277.0)
+    for window in random_windows(rng, 50):
+        expected = segments.intersecting(*window)
+        found = grid.intersecting(*window)
+        assert np.array_equal(found.data, expected.data)
+        assert np.array_equal(found.pens, expected.pens)
+
+
+def test_saved_grid_answers_the_same(tmp_path):
+    rng = np.random.default_rng(7)
+    segments = random_segments(rng, 2000)
+    grid = SegmentGrid(segments, 150.0, 237.0)
+    grid.save(str(tmp_path))
+    loaded = SegmentGrid.load(str(tmp_path))
+    for window in random_windows(rng, 20):
+        assert np.array_equal(loaded.candidates(*window), grid.candidates(*window))
+        assert np.array_equal(loaded.intersecting(*window).data, grid.intersecting(*window).data)
+
+
+def test_empty_grid():
+    grid = SegmentGrid(SegmentStore(), 210.0, 297.0)
+    assert len(grid.candidates(0, 0, 100, 100)) == 0
+    assert len(grid.intersecting(0, 0, 100, 100)) == 0
@@ -0,0 +1,90 @@
+"""Akış modunun (--stream) tek geçişli dönüştürmeyle aynı sonucu verdiğini doğrular"""
+
+import contextlib
+import functools
+import io
+import json
+import re
+
+import pytest
+
+import plt_to_pdf
+from batch import run_batch
+from hpgl_interpreter import iter_file_geometry_batches
+from hpgl_samples import write_drawing
+from plt_to_pdf import PLTtoPDFConverter
+
+
+def _profile(tmp_path, plt_file, name, **options):
+    output_dir = tmp_path / name
+    output_dir.mkdir()
+    profile_file = tmp_path / f'{name}.json'
+    options = dict(use_cache=False, fast_pdf=True, **options)
+    assert run_batch(PLTtoPDFConverter, [plt_file], str(output_dir), '.pdf', options=options,
+                     profile_file=str(profile_file)) == (1, 0, 0)
+    return json.loads(profile_file.read_text())['files']['drawing.plt']
+
+
+def test_stream_profile_counts_file_once(tmp_path):
+    # İlk (sınır) geçişi okunan bayt, komut ve segment sayaçlarına eklenmez
+    plt_file = write_drawing(tmp_path / 'drawing.plt', extra='PD;CI50;AA0,0,90;')
+    loaded = _profile(tmp_path, plt_file, 'loaded')
+    streamed = _profile(tmp_path, plt_file, 'streamed', stream=True)
+    assert streamed['counters'] == loaded['counters']
+    assert streamed['counters']['bytes_read'] == (tmp_path / 'drawing.plt').stat().st_size
+    assert streamed['page_segments'] == loaded['page_segments']
+    assert 'bounds' in streamed['stages']
+
+
+def _drawn_geometry(pypdf, pdf_file):
+    """Sayfadaki çizgi segmentleri ve Bézier eğrileri (pt, yazıldığı hassasiyette)"""
+    reader = pypdf.PdfReader(pdf_file, strict=True)
+    assert len(reader.pages) == 1
+    page = reader.pages[0]
+    lines, curves, numbers, point = [], [], [], None
+    for token in page.get_contents().get_data().split():
+        if token in (b'm', b'l', b'c'):
+            if token == b'l':
+                lines.append(tuple(point + numbers))
+            elif token == b'c':
+                curves.append(tuple(point + numbers))
+            point, numbers = numbers[-2:], []
+        else:
+            try:
+                numbers.append(float(token))
+            except ValueError:
+                numbers = []
+    return [float(value) for value in page.mediabox], sorted(lines), sorted(curves)
+
+
+def test_stream_draws_same_geometry_in_batches(tmp_path, monkeypatch):
+    pypdf = pytest.importorskip('pypdf')
+    plt_file = write_drawing(tmp_path / 'drawing.plt', command_count=600, extra='SP2;PD;CI50;AA0,0,90;SP1;PD1,1;')
+    loaded_pdf, streamed_pdf = tmp_path / 'loaded.pdf', tmp_path / 'streamed.pdf'
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert PLTtoPDFConverter(plt_file, str(loaded_pdf), use_cache=False, fast_pdf=True).convert()
+
+    # Küçük parçalarla dosya birçok grupta okunur, her grup ayrı içerik akışı olur
+    monkeypatch.setattr(plt_to_pdf, 'iter_file_geometry_batches',
+                        functools.partial(iter_file_geometry_batches, chunk_size=512))
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert PLTtoPDFConverter(plt_file, str(streamed_pdf), use_cache=False, stream=True).convert()
+    assert re.search(rb'/Contents \[(\d+ 0 R ?){3,}\]', streamed_pdf.read_bytes())
+
+    loaded = _drawn_geometry(pypdf, loaded_pdf)
+    streamed = _drawn_geometry(pypdf, streamed_pdf)
+    assert len(loaded[1]) > 100 and len(loaded[2]) >= 4
+    assert streamed == loaded
+    assert f"{len(loaded[1])} çizgi segmenti bulundu" in output.getvalue()
+
+
+def test_stream_without_drawing_fails(tmp_path):
+    plt_file = tmp_path / 'empty.plt'
+    plt_file.write_text('IN;PU10,10;SP2;')
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        converter = PLTtoPDFConverter(str(plt_file), str(tmp_path / 'empty.pdf'), use_cache=False, stream=True)
+        assert not converter.convert()
+    assert "Çizim verisi bulunamadı" in output.getvalue()
+    assert not (tmp_path / 'empty.pdf').exists()
@@ -0,0 +1,71 @@
+"""İzleme modunun yazımı biten ve değişen dosyaları bir kez dönüştürdüğünü doğrular"""
+
+import contextlib
+import io
+
+import numpy as np
+
+import watch
+from hpgl_samples import random_program, write_drawing
+from manifest import MANIFEST_FILE
+from plt_to_pdf import PLTtoPDFConverter
+
+
+# Senaryo bu kadar taramada bitmezse izleme durdurulur ve test başarısız olur
+MAX_SCANS = 3000
+
+
+def test_watch_converts_finished_and_changed_files(tmp_path, monkeypatch):
+    input_dir = tmp_path / 'input'
+    output_dir = tmp_path / 'output'
+    input_dir.mkdir()
+    output_dir.mkdir()
+    write_drawing(input_dir / 'a.plt', seed=0, command_count=50)
+    output = io.StringIO()
+
+    def wait_for(text, count=1):
+        while output.getvalue().count(text) < count:
+            yield
+
+    def scenario():
+        yield from wait_for("✓ Başarılı: a.pdf")
+        # b.plt birkaç tarama boyunca yazılır; yazım bitmeden dönüştürülmemeli
+        rng = np.random.default_rng(1)
+        with open(input_dir / 'b.plt', 'w') as f:
+            f.write('IN;')
+            for _ in range(4):
+                f.write(random_program(rng, 20, fractions=False))
+                f.flush()
+                yield
+        (input_dir / 'notes.txt').write_text('PLT değil')
+        yield from wait_for("✓ Başarılı: b.pdf")
+        # Değişen dosya tekrar dönüştürülür
+        write_drawing(input_dir / 'a.plt', seed=5, command_count=50)
+        yield from wait_for("✓ Başarılı: a.pdf", 2)
+        # Birkaç tarama daha: değişmeyen dosyalar tekrar işlenmez
+        for _ in range(5):
+            yield
+
+    steps = scenario()
+    scans = []
+    real_scan = watch._scan
+
+    def scripted_scan(directory):
+        scans.append(directory)
+        if len(scans) > MAX_SCANS or next(steps, StopIteration) is StopIteration:
+            raise KeyboardInterrupt
+        return real_scan(directory)
+
+    monkeypatch.setattr(watch, '_scan', scripted_scan)
+    monkeypatch.setattr(watch, 'POLL_INTERVAL', 0.01)
+    with contextlib.redirect_stdout(output):
+        watch.watch_folder(PLTtoPDFConverter, str(input_dir), str(output_dir), '.pdf', 1,
+                           {'use_cache': False, 'fast_pdf': True})
+
+    text = output.getvalue()
+    assert len(scans) <= MAX_SCANS, text
+    assert text.count("İşlendi: a.plt") == 2
+    assert text.count("İşlendi: b.plt") == 1
+    assert "notes" not in text and "değişti" not in text
+    assert text.rstrip().endswith("İzleme durduruldu.")
+    assert sorted(path.name for path in output_dir.iterdir()) == [MANIFEST_FILE, 'a.pdf', 'b.pdf']
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+A4 sayfalarının çizim içeriğini süreç havuzunda paralel üretme (--tile-jobs)
+Segmentler, yaylar (kalemleriyle) ve ızgara indeksi geçici bir klasöre .npy olarak yazılır;
+işçiler bunları bellek eşlemeli (mmap) açar, böylece veri kopyalanmaz.
+Her işçi sayfa penceresini seri yolla aynı düzen nesnesinden (page_tiles) alır,
+kendi sayfasının segment ve yaylarını seçip kırpar ve sıkıştırılmış
+içerik akışını üretir; ana süreç sayfaları (satır, sütun) sırasıyla
+PDFWriter'a ekler. Sadece hızlı PDF yazıcıyla (--fast-pdf) kullanılır.
+"""
+
+import os
+import zlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from reportlab.lib.units import mm
+
+from arc_store import ArcStore
+from batch import init_worker
+from pdf_render import clip_to_page, draw_geometry
+from pdf_writer import PDFWriter
+from spatial_index import SegmentGrid
+
+
+# İşçi süreçte açılan indeks, yaylar ve sayfa düzeni (_init_tile_worker)
+_grid = None
+_arcs = None
+_layout = None
+_grid_size = None
+
+
+def select_tile(grid, arcs, window):
+    """Sayfa penceresiyle kesişen segmentler ve yaylar: (segmentler, yaylar)"""
+    start_x, start_y, end_x, end_y = window[:4]
+    return grid.intersecting(start_x, start_y, end_x, end_y), arcs.intersecting(start_x, start_y, end_x, end_y)
+
+
+def clip_tile(page_lines, page_arcs, window, page_width, page_height):
+    """Seçilen segment ve yayların sayfada görünen kısımları: (segmentler, yaylar)"""
+    offset_x, offset_y = window[4:]
+    return (clip_to_page(page_lines, offset_x, offset_y, page_width, page_height),
+            clip_to_page(page_arcs, offset_x, offset_y, page_width, page_height))
+
+
+def _init_tile_worker(directory, layout, rows, cols):
+    global _grid, _arcs, _layout, _grid_size
+    init_worker()
+    _grid = SegmentGrid.load(directory)
+    _arcs = ArcStore(np.load(os.path.join(directory, 'arcs.npy'), mmap_mode='r'),
+                     np.load(os.path.join(directory, 'arc_pens.npy'), mmap_mode='r'))
+    _layout = layout
+    _grid_size = rows, cols
+
+
+def _render_tile(page):
+    """Bir sayfanın çizim içeriği: (seçilen segment/yay, çizilen segment/yay, sıkıştırılmış akış)"""
+    row, col = page
+    window = _layout.tile_window(row, col, *_grid_size)
+    page_lines, page_arcs = select_tile(_grid, _arcs, window)
+    selected_count = len(page_lines) + len(page_arcs)
+    if not selected_count:
+        return 0, 0, None
+
+    # Sayfada görünmeyen kısımlar kırpılır (seri yoldaki gibi)
+    page_width, page_height = _layout.page_width, _layout.page_height
+    visible_lines, visible_arcs = clip_tile(page_lines, page_arcs, window, page_width, page_height)
+    if not len(visible_lines) and not len(visible_arcs):
+        return selected_count, 0, None
+    # Seri yoldaki çizimle aynı içerik (kalem grupları dahil) bellekteki yazıcıda üretilir
+    writer = PDFWriter(None, (page_width * mm, page_height * mm))
+    draw_geometry(writer, visible_lines, visible_arcs, *window[4:])
+    content = writer.page_content()
+    if not content:
+        return selected_count, 0, None
+    return selected_count, len(visible_lines) + len(visible_arcs), zlib.compress(content)
+
+
+def render_tiles(grid, arcs, layout, rows, cols, jobs):
+    """Sayfa içeriklerini işçi süreçlerde üret, sonuçları sayfa sırasıyla döndür
+
+    layout: sayfa düzeni (page_tiles); işçiler her sayfanın penceresini
+    seri yoldaki gibi layout.tile_window'dan alır. arcs: çizimin ArcStore'u.
+    Her sayfa için (seçilen segment/yay sayısı, çizilen segment/yay sayısı,
+    sıkıştırılmış içerik veya None) üretilir.
+    Havuz ve geçici klasör, üretici bitince veya kapatılınca silinir.
+    """
+    pages = [(row, col) for row in range(rows) for col in range(cols)]
+    with tempfile.TemporaryDirectory(prefix='plt_tiles_') as directory:
+        grid.save(directory)
+        np.save(os.path.join(directory, 'arcs.npy'), arcs.data)
+        np.save(os.path.join(directory, 'arc_pens.npy'), arcs.pens)
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pages)), initializer=_init_tile_worker,
+                                 initargs=(directory, layout, rows, cols)) as executor:
+            yield from executor.map(_render_tile, pages)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Sıcak klasör (hot folder) izleme modu
+input_plt klasörü sürekli taranır; yazımı tamamlanan yeni veya değişen
+PLT dosyaları, önceden başlatılmış süreç havuzunda hemen dönüştürülür
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from batch import ConversionResult, convert_file, init_worker, output_settings, pdf_name, report_result
+from manifest import BuildManifest
+
+
+# Klasör tarama aralığı (sn); bir dosya iki tarama arasında değişmediyse
+# yazımı bitmiş kabul edilir
+POLL_INTERVAL = 0.2
+
+
+def _scan(input_dir):
+    """Klasördeki PLT dosyalarının (boyut, değişim zamanı) imzaları"""
+    signatures = {}
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            if not (entry.name.endswith('.plt') or entry.name.endswith('.PLT')):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            signatures[entry.path] = (stat.st_size, stat.st_mtime_ns)
+    return signatures
+
+
+def _signature(plt_file):
+    try:
+        stat = os.stat(plt_file)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _warm_up(converter_class):
+    """İşçi sürecin dönüştürücü modülünü (reportlab, numpy) önceden yüklemesini sağla"""
+    return converter_class.__name__
+
+
+def watch_folder(converter_class, input_dir, output_dir, pdf_suffix, jobs=0, options=None):
+    """input_dir'i Ctrl+C'ye kadar izle ve dosyaları geldikçe dönüştür"""
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    manifest = BuildManifest(output_dir, pdf_suffix, output_settings(options))
+
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker)
+    # Tüm işçiler ilk dosya gelmeden başlatılıp ısıtılır
+    for future in [executor.submit(_warm_up, converter_class) for _ in range(jobs)]:
+        future.result()
+
+    print(f"'{input_dir}' izleniyor ({jobs} süreç). Durdurmak için Ctrl+C")
+
+    previous = {}  # Bir önceki taramadaki imzalar
+    handled = {}  # Dönüştürülmüş / güncel / başarısız dosyaların imzaları
+    running = {}  # future -> (plt_file, imza)
+
+    try:
+        while True:
+            current = _scan(input_dir)
+            in_progress = {plt_file for plt_file, _ in running.values()}
+
+            for plt_file, signature in current.items():
+                if handled.get(plt_file) == signature or plt_file in in_progress:
+                    continue
+                # Yazımı süren dosyalar bir sonraki taramayı bekler
+                if previous.get(plt_file) != signature:
+                    continue
+
+                pdf_filename = pdf_name(plt_file, pdf_suffix)
+                if manifest.is_current(plt_file, pdf_filename):
+                    handled[plt_file] = signature
+                    continue
+
+                pdf_file = os.path.join(output_dir, pdf_filename)
+                future = executor.submit(convert_file, converter_class, plt_file, pdf_file, options)
+                running[future] = (plt_file, signature)
+
+            previous = current
+
+            if not running:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            done, _ = wait(running, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            pool_broken = False
+            for future in done:
+                plt_file, signature = running.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    result = ConversionResult(False, str(e), '', 0.0)
+                    pool_broken = True
+                except Exception as e:
+                    result = ConversionResult(False, str(e), '', 0.0)
+
+                filename = os.path.basename(plt_file)
+                print(f"\n[{time.strftime('%H:%M:%S')}] İşlendi: {filename}")
+                print("-" * 60)
+                print(result.output, end='')
+
+                if _signature(plt_file) != signature:
+                    # Dönüştürme sırasında dosya değişti: sonraki taramada tekrar işlenir
+                    print(f"Dosya dönüştürülürken değişti, tekrar işlenecek: {filename}")
+                    manifest.forget(pdf_name(plt_file, pdf_suffix))
+                    continue
+
+                report_result(result, filename, pdf_name(plt_file, pdf_suffix), manifest, plt_file)
+                handled[plt_file] = signature
+                manifest.save()
+
+            if pool_broken:
+                # Bir işçi çöktüyse (ör. bellek yetersiz) havuz kullanılamaz hale gelir;
+                # yenisi başlatılır, izleme sürer
+                try:
+                    executor.submit(_warm_up, converter_class)
+                except BrokenProcessPool:
+                    executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker)
+    except KeyboardInterrupt:
+        print("\nİzleme durduruldu.")
+    finally:
+        executor.shutdown(cancel_futures=True)
+        manifest.save()